@@ -0,0 +1,162 @@
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.IO;
+using CSM.Configuration;
+using CSM.Core;
+using NUnit.Framework;
+
+namespace CSM.Tests
+{
+    /// <summary>
+    /// Checks preset values and the timeScale multiplier clamp against the golden vectors
+    /// generated by _agent/gen_test_vectors.py (CSM.Tests/TestData).
+    /// </summary>
+    [TestFixture]
+    public class PresetVectorTests
+    {
+        private const float Tolerance = 1e-5f;
+        private const int MaxReportedFailures = 20;
+
+        private string _chancePreset;
+        private string _cooldownPreset;
+        private string _durationPreset;
+        private bool _intensityScalingEnabled;
+        private float _intensityScalingMax;
+
+        [SetUp]
+        public void SaveSettings()
+        {
+            _chancePreset = CSMModOptions.ChancePresetSetting;
+            _cooldownPreset = CSMModOptions.CooldownPresetSetting;
+            _durationPreset = CSMModOptions.DurationPresetSetting;
+            _intensityScalingEnabled = CSMModOptions.IntensityScalingEnabled;
+            _intensityScalingMax = CSMModOptions.IntensityScalingMax;
+        }
+
+        [TearDown]
+        public void RestoreSettings()
+        {
+            CSMModOptions.ChancePresetSetting = _chancePreset;
+            CSMModOptions.CooldownPresetSetting = _cooldownPreset;
+            CSMModOptions.DurationPresetSetting = _durationPreset;
+            CSMModOptions.IntensityScalingEnabled = _intensityScalingEnabled;
+            CSMModOptions.IntensityScalingMax = _intensityScalingMax;
+        }
+
+        [Test]
+        public void PresetValues_MatchGoldenVectors()
+        {
+            var failures = new List<string>();
+            var rows = LoadVectors("preset_vectors.csv");
+            Assert.That(rows.Count, Is.GreaterThan(0), "No preset vectors loaded");
+
+            foreach (var row in rows)
+            {
+                var trigger = (TriggerType)Enum.Parse(typeof(TriggerType), row["trigger"]);
+                var intensity = (CSMModOptions.Preset)Enum.Parse(typeof(CSMModOptions.Preset), row["intensity"]);
+                CSMModOptions.ChancePresetSetting = row["chance"];
+                CSMModOptions.CooldownPresetSetting = row["cooldown"];
+                CSMModOptions.DurationPresetSetting = row["duration"];
+
+                CSMManager.GetPresetValues(intensity, trigger, out _, out float timeScale, out _, out _);
+                string label = row["trigger"] + "/" + row["intensity"] + "/" + row["chance"] + "/" + row["cooldown"] + "/" + row["duration"];
+                Check(failures, label, "chance", CSMModOptions.GetPresetChanceValue(trigger), row["expChance"]);
+                Check(failures, label, "timeScale", timeScale, row["expTimeScale"]);
+                Check(failures, label, "duration", CSMModOptions.GetPresetDurationValue(trigger), row["expDuration"]);
+                Check(failures, label, "cooldown", CSMModOptions.GetPresetCooldownValue(trigger), row["expCooldown"]);
+            }
+
+            AssertNoFailures(failures, rows.Count);
+        }
+
+        [Test]
+        public void CombinedMultiplier_MatchesGoldenVectors()
+        {
+            var failures = new List<string>();
+            var rows = LoadVectors("multiplier_vectors.csv");
+            Assert.That(rows.Count, Is.GreaterThan(0), "No multiplier vectors loaded");
+
+            foreach (var row in rows)
+            {
+                CSMModOptions.IntensityScalingEnabled = row["scalingEnabled"] == "true";
+                CSMModOptions.IntensityScalingMax = Parse(row["scalingMax"]);
+
+                // Same order as TriggerSlow: damage type * intensity * DOT * thrown.
+                float combined = Parse(row["damageMult"]) *
+                                 CSMModOptions.GetIntensityMultiplier(Parse(row["intensity"])) *
+                                 Parse(row["dotMult"]) *
+                                 Parse(row["thrownMult"]);
+                float timeScale = ApplyCombinedMultiplier(Parse(row["timeScale"]), combined);
+
+                string label = "timeScale=" + row["timeScale"] + " damage=" + row["damageMult"] +
+                               " scaling=" + row["scalingEnabled"] + "/" + row["scalingMax"] + "@" + row["intensity"] +
+                               " dot=" + row["dotMult"] + " thrown=" + row["thrownMult"];
+                Check(failures, label, "combined", combined, row["expCombined"]);
+                Check(failures, label, "timeScale", timeScale, row["expTimeScale"]);
+            }
+
+            AssertNoFailures(failures, rows.Count);
+        }
+
+        private static List<Dictionary<string, string>> LoadVectors(string fileName)
+        {
+            string path = Path.Combine(TestContext.CurrentContext.TestDirectory, "TestData", fileName);
+            Assert.That(File.Exists(path), Is.True, "Missing test vectors: " + path);
+
+            var rows = new List<Dictionary<string, string>>();
+            string[] header = null;
+            foreach (string line in File.ReadLines(path))
+            {
+                if (line.Length == 0 || line.StartsWith("#", StringComparison.Ordinal))
+                    continue;
+
+                string[] cells = line.Split(',');
+                if (header == null)
+                {
+                    header = cells;
+                    continue;
+                }
+
+                var row = new Dictionary<string, string>(header.Length);
+                for (int i = 0; i < header.Length && i < cells.Length; i++)
+                    row[header[i]] = cells[i];
+                rows.Add(row);
+            }
+            return rows;
+        }
+
+        /// <summary>
+        /// The multiplier step of CSMManager.TriggerSlow: divide by the combined multiplier
+        /// when it is not 1 and clamp to 0.01-1 (kept inline there, mirrored here).
+        /// </summary>
+        private static float ApplyCombinedMultiplier(float timeScale, float combinedMultiplier)
+        {
+            if (combinedMultiplier == 1.0f)
+                return timeScale;
+            return Math.Min(Math.Max(timeScale / combinedMultiplier, 0.01f), 1f);
+        }
+
+        private static float Parse(string value)
+        {
+            return float.Parse(value, NumberStyles.Float, CultureInfo.InvariantCulture);
+        }
+
+        private static void Check(List<string> failures, string label, string field, float actual, string expectedText)
+        {
+            float expected = Parse(expectedText);
+            if (Math.Abs(actual - expected) > Tolerance * Math.Max(1f, Math.Abs(expected)))
+                failures.Add(label + " " + field + ": expected " + expectedText + ", got " + actual.ToString("R", CultureInfo.InvariantCulture));
+        }
+
+        private static void AssertNoFailures(List<string> failures, int caseCount)
+        {
+            if (failures.Count == 0)
+                return;
+
+            int shown = Math.Min(failures.Count, MaxReportedFailures);
+            Assert.Fail(failures.Count + " mismatches in " + caseCount + " vectors (regenerate with _agent/gen_test_vectors.py if the C# change is intended):\n" +
+                        string.Join("\n", failures.GetRange(0, shown)));
+        }
+    }
+}
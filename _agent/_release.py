@@ -1,56 +1,179 @@
 # -*- coding: utf-8 -*-
-"""Build and release CSM mod."""
+"""Build and release CSM mod.
+
+The release runs as a dependency graph (task_graph.py):
+
+    check -> smoke -> package -> verify -> tag -> push -> publish
+
+The tag is only created once every gating step has passed, and an existing tag that
+points at another commit fails the release instead of being reused. Per-step wall
+times go to _agent/.cache/release/<tag>-timeline.json, and completed steps are
+remembered per tag and commit, so rerunning after a failed push or publish resumes there.
+--dry-run pushes to a local bare repository and replaces `gh release create` with a
+local stand-in that copies the assets under _agent/.cache/release/dry-run.
+"""
+import argparse
+import shlex
 import subprocess
 import json
+import os
+import shutil
+import sys
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from task_graph import Step, format_timeline, run_graph
+
 BASE = Path(__file__).parent.parent
 MANIFEST = BASE / "manifest.json"
+RELEASE_CACHE = BASE / "_agent" / ".cache" / "release"
+DRY_RUN_DIR = RELEASE_CACHE / "dry-run"
+
+# Build configuration folder under bin/Release -> release asset name.
+VARIANTS = {"PCVR": "CSM-PCVR.zip", "Nomad": "CSM-Nomad.zip"}
 
 def get_version():
     with open(MANIFEST, 'r') as f:
         return json.load(f)['ModVersion']
 
 def run(cmd, cwd=None):
-    print(f"$ {cmd}")
-    subprocess.run(cmd, shell=True, cwd=cwd or BASE, check=True)
+    print(f"$ {shlex.join(cmd)}")
+    subprocess.run(cmd, cwd=cwd or BASE, check=True)
+
+def git_output(*args):
+    return subprocess.check_output(["git", *args], cwd=BASE, text=True).strip()
+
+def powershell():
+    """pwsh on Linux/macOS runners, Windows PowerShell otherwise."""
+    return shutil.which("pwsh") or "powershell"
+
+def zip_variant(variant, zip_name):
+    """Zip bin/Release/<variant>/CSM as CSM/... (same layout as Compress-Archive), streaming each file."""
+    src = BASE / "bin" / "Release" / variant / "CSM"
+    if not src.is_dir():
+        raise FileNotFoundError(f"Missing build output: {src}")
+
+    dest = BASE / zip_name
+    tmp = dest.with_name(dest.name + ".tmp")
+    start = time.perf_counter()
+    files = 0
+    with zipfile.ZipFile(tmp, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(src.rglob("*")):
+            if path.is_file():
+                archive.write(path, (Path(src.name) / path.relative_to(src)).as_posix())
+                files += 1
+    os.replace(tmp, dest)
+    return dest, files, time.perf_counter() - start
+
+def build_zips():
+    """Build every variant concurrently; zlib releases the GIL, so this takes as long as the slowest one."""
+    with ThreadPoolExecutor(max_workers=len(VARIANTS)) as pool:
+        futures = [pool.submit(zip_variant, variant, name) for variant, name in VARIANTS.items()]
+        results = [future.result() for future in futures]
+    for dest, files, seconds in results:
+        print(f"{dest.name}: {files} files, {dest.stat().st_size / 1024:.0f} KB in {seconds:.2f}s")
+    return [dest for dest, _, _ in results]
 
 def require_clean_non_main_git_state():
-    branch = subprocess.check_output("git branch --show-current", shell=True, cwd=BASE, text=True).strip()
+    branch = git_output("branch", "--show-current")
     if branch in {"main", "master"}:
         raise RuntimeError(f"Refusing release on protected branch '{branch}'. Use a feature/release branch.")
 
-    status = subprocess.check_output("git status --porcelain", shell=True, cwd=BASE, text=True).strip()
+    status = git_output("status", "--porcelain")
     if status:
         raise RuntimeError("Working tree is dirty. Commit or stash changes before releasing.")
 
-def main():
-    version = get_version()
-    tag = f"v{version}"
 
-    print(f"\n=== Building CSM {version} ===\n")
+def dry_run_remote():
+    """Local bare repository standing in for origin."""
+    remote = DRY_RUN_DIR / "remote.git"
+    if not remote.exists():
+        remote.parent.mkdir(parents=True, exist_ok=True)
+        run(["git", "init", "--bare", "--quiet", str(remote)])
+    return str(remote)
+
+def dry_run_publish(tag, assets, title, notes):
+    """Stand-in for `gh release create`: copy the assets and record the release locally."""
+    dest = DRY_RUN_DIR / "releases" / tag
+    print(f"$ gh release create {tag} {' '.join(path.name for path in assets)} (dry run -> {dest})")
+    if dest.exists():
+        raise RuntimeError(f"release {tag} already exists in {dest}")
+    dest.mkdir(parents=True)
+    for path in assets:
+        shutil.copyfile(path, dest / path.name)
+    record = {"tag": tag, "title": title, "notes": notes, "assets": [path.name for path in assets]}
+    (dest / "release.json").write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+
+def release_steps(version, tag, dry_run):
+    zips = [BASE / name for name in VARIANTS.values()]
+    checksums = BASE / f"CSM-{version}-checksums.json"
+    title, notes = f"CSM {version}", f"Release {version}"
 
-    require_clean_non_main_git_state()
-    run("powershell -ExecutionPolicy Bypass -File _agent/ci-smoke.ps1 -Strict")
+    def tag_step():
+        if dry_run:
+            print(f"(dry run) would tag HEAD as {tag}")
+        elif tag not in git_output("tag", "-l", tag).splitlines():
+            run(["git", "tag", tag])
+        elif git_output("rev-parse", f"{tag}^{{commit}}") != git_output("rev-parse", "HEAD"):
+            raise RuntimeError(f"Tag {tag} already exists on another commit; delete it (git tag -d {tag}) "
+                               "or bump ModVersion before releasing HEAD.")
 
-    # Create zips
-    print("\n=== Creating release zips ===\n")
-    run(f'powershell -Command "Compress-Archive -Path bin/Release/PCVR/CSM -DestinationPath CSM-PCVR.zip -Force"')
-    run(f'powershell -Command "Compress-Archive -Path bin/Release/Nomad/CSM -DestinationPath CSM-Nomad.zip -Force"')
+    def push_step():
+        if dry_run:
+            run(["git", "push", "--force", dry_run_remote(), f"HEAD:refs/tags/{tag}"])
+        else:
+            run(["git", "push", "origin", tag])
 
-    # Git tag (if not exists)
-    result = subprocess.run(f"git tag -l {tag}", shell=True, capture_output=True, text=True, cwd=BASE)
-    if tag not in result.stdout:
-        run(f"git tag {tag}")
+    def publish_step():
+        if dry_run:
+            dry_run_publish(tag, zips + [checksums], title, notes)
+        else:
+            run(["gh", "release", "create", tag, *[str(path.name) for path in zips + [checksums]],
+                 "--title", title, "--notes", notes])
 
-    # Push tag
-    run(f"git push origin {tag}")
+    return [
+        Step("check", require_clean_non_main_git_state, description="clean, non-main working tree"),
+        Step("smoke", lambda: run([powershell(), "-ExecutionPolicy", "Bypass", "-File", "_agent/ci-smoke.ps1", "-Strict"]),
+             deps=["check"], description="Release + Nomad build and tests"),
+        Step("package", build_zips, deps=["smoke"], description="release zips"),
+        Step("verify", lambda: run([sys.executable, "_agent/verify_release.py"]), deps=["package"],
+             description="zips vs builds/, checksum manifest"),
+        Step("tag", tag_step, deps=["verify"], description=f"tag {tag}"),
+        Step("push", push_step, deps=["tag"], description=f"push {tag}"),
+        Step("publish", publish_step, deps=["push"], description="GitHub release"),
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and release CSM")
+    parser.add_argument("--dry-run", action="store_true", help="Push to a local bare repo and publish to a local folder")
+    parser.add_argument("--restart", action="store_true", help="Ignore completed steps from a previous run")
+    parser.add_argument("--skip", action="append", default=[], metavar="STEP",
+                        help="Treat a step as done for this run (repeatable)")
+    args = parser.parse_args()
+
+    version = get_version()
+    tag = f"v{version}"
+    steps = release_steps(version, tag, args.dry_run)
+    unknown = [name for name in args.skip if name not in {step.name for step in steps}]
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(unknown)}")
 
-    # Create GitHub release
-    print("\n=== Creating GitHub release ===\n")
-    run(f'gh release create {tag} CSM-PCVR.zip CSM-Nomad.zip --title "CSM {version}" --notes "Release {version}"')
+    mode = "-dry-run" if args.dry_run else ""
+    state = RELEASE_CACHE / f"{tag}{mode}-state.json"
+    timeline = RELEASE_CACHE / f"{tag}{mode}-timeline.json"
+    fingerprint = f"{tag}|{git_output('rev-parse', 'HEAD')}|{'dry-run' if args.dry_run else 'release'}"
 
-    print(f"\n=== CSM {version} released! ===\n")
+    print(f"\n=== Releasing CSM {version}{' (dry run)' if args.dry_run else ''} ===\n")
+    ok = run_graph(steps, state, timeline, fingerprint, restart=args.restart, skip=args.skip)
+    print()
+    print(format_timeline(timeline))
+    if not ok:
+        print(f"\n=== Release stopped; rerun to resume (timeline: {timeline}) ===\n")
+        return 1
+    print(f"\n=== CSM {version} {'dry run complete' if args.dry_run else 'released!'} ===\n")
+    return 0
 
 if __name__ == '__main__':
-    main()
+    raise SystemExit(main())
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Benchmark the _agent tools and fail on throughput regressions against a stored baseline.
+
+Cases:
+    log_parse:<kind>:<size>   player_log_report.load_log on a synthetic log (lines/sec, peak RSS)
+    extract:<function>        cs_source extraction on the real CSMModOptions.cs (calls/sec)
+    xlsx:<script>             one workbook builder end to end (builds/sec, output bytes)
+
+Results are appended to a JSON history file. The first run (or --update-baseline)
+becomes the baseline; later runs exit 1 when a case's throughput drops below
+baseline * (1 - tolerance).
+"""
+
+import argparse
+import gzip
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cs_source
+from gen_player_log import generate, parse_size
+from player_log_report import MODS, load_log
+
+AGENT_DIR = Path(__file__).resolve().parent
+DEFAULT_HISTORY = AGENT_DIR / "bench_history.json"
+DEFAULT_SIZES = "8MB,64MB"
+DEFAULT_TOLERANCE = 0.15
+DEFAULT_SEED = 1968
+HISTORY_KEEP = 200
+XLSX_SCRIPTS = ("build_menu_mock_xlsx.py", "build_presets_xlsx.py", "build_preset_organized_xlsx.py")
+LOG_KINDS = ("plain", "gzip")
+
+
+def peak_rss_bytes():
+    """Peak resident set size of the current process, or None when unavailable."""
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [
+                ("cb", wintypes.DWORD),
+                ("PageFaultCount", wintypes.DWORD),
+                ("PeakWorkingSetSize", ctypes.c_size_t),
+                ("WorkingSetSize", ctypes.c_size_t),
+                ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                ("PagefileUsage", ctypes.c_size_t),
+                ("PeakPagefileUsage", ctypes.c_size_t),
+            ]
+
+        counters = ProcessMemoryCounters()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return None
+        return counters.PeakWorkingSetSize
+
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def count_lines(path: Path) -> int:
+    lines = 0
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            lines += chunk.count(b"\n")
+    return lines
+
+
+def prepare_log(work_dir: Path, size: int, seed: int, kind: str):
+    """Generate (or reuse) a synthetic log of `size` bytes; return its path and line count."""
+    plain = work_dir / f"synthetic-{seed}-{size}.log"
+    meta_path = plain.with_suffix(".json")
+    meta = None
+    if plain.exists() and meta_path.exists():
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("bytes") != plain.stat().st_size:
+            meta = None
+    if meta is None:
+        generate(str(plain), size, seed, list(MODS), 1, (20, 240), 12, 0.02)
+        meta = {"bytes": plain.stat().st_size, "lines": count_lines(plain)}
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    if kind == "plain":
+        return plain, meta["lines"]
+    packed = plain.with_suffix(".log.gz")
+    if not packed.exists() or packed.stat().st_mtime < plain.stat().st_mtime:
+        with open(plain, "rb") as src, gzip.open(packed, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+    return packed, meta["lines"]
+
+
+def child_parse(log_path: str) -> int:
+    """Run in a fresh interpreter so peak RSS belongs to this parse alone."""
+    started = time.perf_counter()
+    events_by_mod, _ = load_log(log_path)
+    seconds = time.perf_counter() - started
+    events = sum(len(events) for events in events_by_mod.values())
+    print(json.dumps({"seconds": seconds, "events": events, "peakRss": peak_rss_bytes()}))
+    return 0
+
+
+def bench_log_parse(work_dir: Path, sizes, seed: int):
+    results = {}
+    for label, size in sizes:
+        for kind in LOG_KINDS:
+            path, lines = prepare_log(work_dir, size, seed, kind)
+            completed = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), "--child-parse", str(path)],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            child = json.loads(completed.stdout)
+            results[f"log_parse:{kind}:{label}"] = {
+                "throughput": lines / child["seconds"],
+                "unit": "lines/s",
+                "seconds": child["seconds"],
+                "lines": lines,
+                "events": child["events"],
+                "peakRssBytes": child["peakRss"],
+            }
+    return results
+
+
+def time_calls(func, repeat: int) -> float:
+    """Best-of-`repeat` seconds for one call, so scheduler noise does not read as a regression."""
+    best = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def bench_extract(repeat: int):
+    options = cs_source.read_source(cs_source.CSM_OPTIONS)
+    manager = cs_source.read_source(cs_source.CSM_MANAGER)
+    cases = {
+        "extract:extract_method_block": (
+            lambda: cs_source.extract_method_block(manager, r"public\s+static\s+void\s+GetPresetValues\s*\("),
+            len(manager),
+        ),
+        "extract:parse_modoptions": (lambda: cs_source.parse_modoptions(options), len(options)),
+        "extract:parse_provider_values": (lambda: cs_source.parse_provider_values(options), len(options)),
+    }
+    results = {}
+    for name, (func, source_bytes) in cases.items():
+        seconds = time_calls(func, repeat)
+        results[name] = {
+            "throughput": 1.0 / seconds,
+            "unit": "calls/s",
+            "seconds": seconds,
+            "sourceBytes": source_bytes,
+        }
+    return results
+
+
+def bench_xlsx(work_dir: Path, repeat: int):
+    results = {}
+    for script in XLSX_SCRIPTS:
+        output = work_dir / (Path(script).stem + ".xlsx")
+        best = None
+        error = None
+        for _ in range(max(1, repeat // 2)):
+            started = time.perf_counter()
+            completed = subprocess.run(
+                [sys.executable, str(AGENT_DIR / script), str(output)],
+                capture_output=True,
+                text=True,
+            )
+            elapsed = time.perf_counter() - started
+            if completed.returncode != 0:
+                lines = (completed.stderr or completed.stdout).strip().splitlines()
+                error = lines[-1] if lines else f"exit code {completed.returncode}"
+                break
+            best = elapsed if best is None else min(best, elapsed)
+
+        if error is not None:
+            results[f"xlsx:{script}"] = {"error": error}
+        else:
+            results[f"xlsx:{script}"] = {
+                "throughput": 1.0 / best,
+                "unit": "builds/s",
+                "seconds": best,
+                "outputBytes": output.stat().st_size,
+            }
+    return results
+
+
+def load_history(path: Path):
+    if not path.exists():
+        return {"baseline": None, "runs": []}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def compare(results, baseline, tolerance: float):
+    """Return `(lines, regressions)` describing each case against the baseline."""
+    report = []
+    regressions = []
+    for name in sorted(results):
+        current = results[name]
+        base = (baseline or {}).get("results", {}).get(name)
+        if "error" in current:
+            status = "FAILED"
+            if base and "error" not in base:
+                regressions.append(name)
+            report.append(f"  {name:<44} {status}: {current['error']}")
+            continue
+
+        extra = ""
+        if current.get("peakRssBytes"):
+            extra += f" peakRss={current['peakRssBytes'] / (1 << 20):.1f}MiB"
+        if current.get("outputBytes"):
+            extra += f" output={current['outputBytes']}B"
+        if not base or "error" in base:
+            report.append(f"  {name:<44} {current['throughput']:>14,.1f} {current['unit']} (no baseline){extra}")
+            continue
+
+        ratio = current["throughput"] / base["throughput"]
+        status = "ok"
+        if ratio < 1.0 - tolerance:
+            status = "REGRESSION"
+            regressions.append(name)
+        report.append(
+            f"  {name:<44} {current['throughput']:>14,.1f} {current['unit']} "
+            f"({ratio * 100.0:5.1f}% of baseline) {status}{extra}"
+        )
+    return report, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark _agent log parsing, C# extraction and xlsx builders")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help=f"Synthetic log sizes (default {DEFAULT_SIZES})")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for synthetic logs")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions for in-process cases (best is kept)")
+    parser.add_argument("--only", default="logs,extract,xlsx", help="Comma-separated groups: logs, extract, xlsx")
+    parser.add_argument("--history", type=Path, default=DEFAULT_HISTORY, help="JSON history/baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed throughput drop vs baseline, as a fraction (default 0.15)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the new baseline")
+    parser.add_argument("--work-dir", type=Path, help="Where synthetic logs and workbooks go (default: temp dir)")
+    parser.add_argument("--child-parse", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child_parse:
+        return child_parse(args.child_parse)
+
+    groups = {group.strip() for group in args.only.split(",") if group.strip()}
+    try:
+        sizes = [(size.strip(), parse_size(size)) for size in args.sizes.split(",") if size.strip()]
+    except argparse.ArgumentTypeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    cleanup = None
+    work_dir = args.work_dir
+    if work_dir is None:
+        cleanup = tempfile.TemporaryDirectory(prefix="csm-bench-")
+        work_dir = Path(cleanup.name)
+    work_dir.mkdir(parents=True, exist_ok=True)
+
+    try:
+        results = {}
+        if "logs" in groups:
+            results.update(bench_log_parse(work_dir, sizes, args.seed))
+        if "extract" in groups:
+            results.update(bench_extract(max(1, args.repeat)))
+        if "xlsx" in groups:
+            results.update(bench_xlsx(work_dir, max(1, args.repeat)))
+    except (OSError, subprocess.CalledProcessError, ValueError) as exc:
+        print(f"error: benchmark failed: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if cleanup is not None:
+            cleanup.cleanup()
+
+    history = load_history(args.history)
+    run = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    report, regressions = compare(results, history.get("baseline"), args.tolerance)
+
+    print(f"=== _agent benchmarks ({run['timestamp']}, tolerance {args.tolerance * 100:.0f}%) ===")
+    for line in report:
+        print(line)
+
+    history["runs"] = (history.get("runs", []) + [run])[-HISTORY_KEEP:]
+    if args.update_baseline or not history.get("baseline"):
+        history["baseline"] = run
+        print(f"Baseline stored in {args.history}")
+    else:
+        # Cases added since the baseline was taken get their first measurement as baseline.
+        base_results = history["baseline"].setdefault("results", {})
+        for name, current in results.items():
+            if name not in base_results and "error" not in current:
+                base_results[name] = current
+    args.history.write_text(json.dumps(history, indent=2), encoding="utf-8")
+
+    if regressions:
+        print(f"Throughput regressed beyond tolerance: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""Cached PCVR/Nomad builds and the builds/ sync, keyed by the hash of each variant's inputs.
+
+    build_cache.py build [--variant PCVR,Nomad] [--stub] [--force] [--no-sync]
+    build_cache.py status
+
+The input key of a variant is the SHA-256 of every compiled .cs file (the same globs as
+CSM.csproj), CSM.csproj, manifest.json, the variant's configuration and define
+constants, and the compiler command. Artifacts live in a content-addressed store:
+
+    _agent/.cache/build/objects/<sha256>        artifact contents
+    _agent/.cache/build/actions/<input key>.json   {file: sha256} for one variant build
+
+A build whose key already has an action entry is skipped; otherwise the compiler runs
+and its outputs are stored. `builds/CSM-<variant>/CSM` is then synced from the store,
+copying only files whose hash differs.
+
+`--stub` swaps dotnet for `build_cache.py stub-compile`, which writes a deterministic
+fake CSM.dll derived from the inputs, so the caching logic can be exercised on machines
+without the game libraries. Stub output goes to `_agent/.cache/build/stub/<variant>`
+and is never synced, so bin/ and the committed builds/ DLLs are left untouched.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from cs_source import compiled_sources
+
+AGENT_DIR = Path(__file__).resolve().parent
+ROOT = AGENT_DIR.parent
+DEFAULT_CACHE_DIR = AGENT_DIR / ".cache" / "build"
+CACHE_VERSION = 1
+
+# Variant -> MSBuild configuration, DefineConstants, output folder and builds/ folder (CSM.csproj).
+VARIANTS = {
+    "PCVR": {"configuration": "Release", "defines": "", "output": "bin/Release/PCVR/CSM", "builds": "builds/CSM-PCVR/CSM"},
+    "Nomad": {"configuration": "Nomad", "defines": "NOMAD", "output": "bin/Release/Nomad/CSM", "builds": "builds/CSM-Nomad/CSM"},
+}
+ARTIFACTS = ("CSM.dll", "manifest.json")
+PROJECT_FILES = ("CSM.csproj", "manifest.json")
+
+DOTNET_COMMAND = "dotnet build CSM.csproj -c {configuration} --nologo"
+STUB_COMMAND = (f"{shlex.quote(sys.executable)} {shlex.quote(str(Path(__file__).resolve()))} "
+                "--cache-dir {cache_dir} stub-compile {variant}")
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_files(root: Path):
+    """Repo-relative paths of every build input (compiled sources and project files), sorted."""
+    files = compiled_sources(root)
+    files.extend(name for name in PROJECT_FILES if (root / name).exists())
+    return sorted(files)
+
+
+def input_key(root: Path, variant: str, command: str):
+    """(key, input count) for one variant; the key changes with any input or build setting."""
+    settings = dict(VARIANTS[variant], variant=variant, command=command, cache=CACHE_VERSION)
+    digest = hashlib.sha256(json.dumps(settings, sort_keys=True).encode("utf-8"))
+    files = input_files(root)
+    for rel in files:
+        digest.update(f"{rel}\0{sha256_file(root / rel)}\n".encode("utf-8"))
+    return digest.hexdigest(), len(files)
+
+
+class BuildCache:
+    """Action entries (input key -> artifact hashes) over a content-addressed object store."""
+
+    def __init__(self, cache_dir: Path):
+        self.objects = cache_dir / "objects"
+        self.actions = cache_dir / "actions"
+
+    def lookup(self, key: str):
+        path = self.actions / f"{key}.json"
+        if not path.exists():
+            return None
+        entry = json.loads(path.read_text(encoding="utf-8"))
+        if not all((self.objects / sha).exists() for sha in entry["files"].values()):
+            return None
+        return entry
+
+    def store(self, key: str, variant: str, output: Path):
+        files = {}
+        self.objects.mkdir(parents=True, exist_ok=True)
+        for name in ARTIFACTS:
+            src = output / name
+            if not src.exists():
+                if name == ARTIFACTS[0]:
+                    raise FileNotFoundError(f"Build produced no {src}")
+                continue
+            sha = sha256_file(src)
+            dest = self.objects / sha
+            if not dest.exists():
+                tmp = dest.with_name(f"{sha}.{os.getpid()}.tmp")
+                shutil.copyfile(src, tmp)
+                os.replace(tmp, dest)
+            files[name] = sha
+        entry = {"variant": variant, "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "files": files}
+        self.actions.mkdir(parents=True, exist_ok=True)
+        tmp = self.actions / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(json.dumps(entry, indent=2), encoding="utf-8")
+        os.replace(tmp, self.actions / f"{key}.json")
+        return entry
+
+    def sync(self, entry, dest_dir: Path):
+        """Copy artifacts into `dest_dir`, skipping files that already match; returns names copied."""
+        copied = []
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        for name, sha in entry["files"].items():
+            dest = dest_dir / name
+            if dest.exists() and sha256_file(dest) == sha:
+                continue
+            tmp = dest.with_name(dest.name + ".tmp")
+            shutil.copyfile(self.objects / sha, tmp)
+            os.replace(tmp, dest)
+            copied.append(name)
+        return copied
+
+
+def stub_output(cache_dir: Path, variant: str) -> Path:
+    return cache_dir / "stub" / variant
+
+
+def run_build(root: Path, variant: str, command: str, cache_dir: Path):
+    cmd = command.format(variant=variant, cache_dir=shlex.quote(str(cache_dir)), **VARIANTS[variant])
+    print(f"$ {cmd}")
+    subprocess.run(cmd, shell=True, cwd=root, check=True)
+
+
+def build(args) -> int:
+    command = STUB_COMMAND if args.stub else args.command
+    cache = BuildCache(args.cache_dir)
+    variants = [v.strip() for v in args.variant.split(",")] if args.variant else list(VARIANTS)
+    for variant in variants:
+        if variant not in VARIANTS:
+            print(f"error: unknown variant '{variant}' (choose from {', '.join(VARIANTS)})", file=sys.stderr)
+            return 2
+
+    for variant in variants:
+        key, count = input_key(args.root, variant, command)
+        entry = None if args.force else cache.lookup(key)
+        if entry:
+            status = "cached"
+        else:
+            start = time.perf_counter()
+            output = stub_output(args.cache_dir, variant) if args.stub else args.root / VARIANTS[variant]["output"]
+            try:
+                run_build(args.root, variant, command, args.cache_dir)
+                entry = cache.store(key, variant, output)
+            except (OSError, subprocess.CalledProcessError) as exc:
+                print(f"error: {variant} build failed: {exc}", file=sys.stderr)
+                return 1
+            status = f"built in {time.perf_counter() - start:.1f}s"
+        if args.stub:
+            sync_note = "stub build, sync skipped"
+        elif args.no_sync:
+            sync_note = "sync skipped"
+        else:
+            synced = cache.sync(entry, args.root / VARIANTS[variant]["builds"])
+            sync_note = f"synced {', '.join(synced)}" if synced else "builds/ up to date"
+        print(f"{variant:<6} {key[:12]} ({count} inputs) {status}; {sync_note}")
+    return 0
+
+
+def status(args) -> int:
+    command = STUB_COMMAND if args.stub else args.command
+    cache = BuildCache(args.cache_dir)
+    for variant, info in VARIANTS.items():
+        key, count = input_key(args.root, variant, command)
+        entry = cache.lookup(key)
+        if not entry:
+            print(f"{variant:<6} {key[:12]} ({count} inputs) not cached")
+            continue
+        if args.stub:
+            print(f"{variant:<6} {key[:12]} ({count} inputs) cached {entry['created']}; stub build")
+            continue
+        dest = args.root / info["builds"]
+        stale = [name for name, sha in entry["files"].items()
+                 if not (dest / name).exists() or sha256_file(dest / name) != sha]
+        state = f"builds/ differs: {', '.join(stale)}" if stale else "builds/ up to date"
+        print(f"{variant:<6} {key[:12]} ({count} inputs) cached {entry['created']}; {state}")
+    return 0
+
+
+def stub_compile(args) -> int:
+    """Stand-in for dotnet build: a deterministic CSM.dll from the inputs, plus manifest.json, under the cache."""
+    info = VARIANTS[args.variant]
+    output = stub_output(args.cache_dir, args.variant)
+    output.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha256()
+    for rel in input_files(args.root):
+        digest.update(f"{rel}\0{sha256_file(args.root / rel)}\n".encode("utf-8"))
+    body = f"CSM stub build\nconfiguration={info['configuration']}\ndefines={info['defines']}\ninputs={digest.hexdigest()}\n"
+    (output / "CSM.dll").write_text(body, encoding="utf-8")
+    if (args.root / "manifest.json").exists():
+        shutil.copyfile(args.root / "manifest.json", output / "manifest.json")
+    print(f"stub build complete: {output / 'CSM.dll'} ({info['configuration']})")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Content-addressed build cache for the PCVR/Nomad outputs")
+    parser.add_argument("--root", type=Path, default=ROOT, help="Repository root")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Build cache directory")
+    commands = parser.add_subparsers(dest="command_name", required=True)
+
+    def add_compiler_arguments(sub):
+        sub.add_argument("--command", default=DOTNET_COMMAND,
+                         help="Build command; {variant}, {configuration}, {defines}, {output} are substituted")
+        sub.add_argument("--stub", action="store_true",
+                         help="Use the stub compiler (no game libraries needed); output stays in the cache, builds/ is not synced")
+
+    sub = commands.add_parser("build", help="Build variants whose inputs changed and sync builds/")
+    sub.add_argument("--variant", help="Comma-separated variants (default all)")
+    sub.add_argument("--force", action="store_true", help="Rebuild even when the input key is cached")
+    sub.add_argument("--no-sync", action="store_true", help="Do not update builds/")
+    add_compiler_arguments(sub)
+    sub.set_defaults(func=build)
+
+    sub = commands.add_parser("status", help="Show input keys, cache hits and builds/ state")
+    add_compiler_arguments(sub)
+    sub.set_defaults(func=status)
+
+    sub = commands.add_parser("stub-compile", help=argparse.SUPPRESS)
+    sub.add_argument("variant", choices=list(VARIANTS))
+    sub.set_defaults(func=stub_compile)
+
+    args = parser.parse_args()
+    args.root = args.root.resolve()
+    args.cache_dir = args.cache_dir.resolve()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,172 +1,19 @@
 from __future__ import annotations
-import re
+import sys
 import zipfile
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
-ROOT = Path(r"D:\Documents\Projects\repos\CSM")
-CSM_OPTIONS = ROOT / "Configuration" / "CSMModOptions.cs"
-OUTPUT = ROOT / "MENU_MOCK.xlsx"
+from cs_source import CSM_OPTIONS, ROOT, normalize_default, parse_modoptions, parse_provider_values, read_source
 
-text = CSM_OPTIONS.read_text(encoding="utf-8")
+OUTPUT = Path(sys.argv[1]) if len(sys.argv) > 1 else ROOT / "MENU_MOCK.xlsx"
+
+text = read_source(CSM_OPTIONS)
 
 NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
 
 
-def extract_method_block(source: str, signature_regex: str) -> str:
-    m = re.search(signature_regex, source)
-    if not m:
-        raise ValueError(f"Method signature not found: {signature_regex}")
-    idx = m.end()
-    brace_start = source.find("{", idx)
-    if brace_start == -1:
-        raise ValueError(f"No opening brace for method: {signature_regex}")
-    depth = 0
-    for i in range(brace_start, len(source)):
-        ch = source[i]
-        if ch == "{":
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0:
-                return source[brace_start + 1 : i]
-    raise ValueError(f"No matching closing brace for method: {signature_regex}")
-
-
-def strip_quotes(value: str) -> str:
-    value = value.strip()
-    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
-        return value[1:-1]
-    return value
-
-
-def parse_provider_values(source: str) -> dict[str, list[str]]:
-    providers: dict[str, list[str]] = {}
-    for match in re.finditer(r"public\s+static\s+ModOption(?:String|Float|Int)\[\]\s+(\w+)\s*\(", source):
-        name = match.group(1)
-        block = extract_method_block(source, rf"public\s+static\s+ModOption(?:String|Float|Int)\[\]\s+{re.escape(name)}\s*\(")
-        values = re.findall(r'new\s+ModOption(?:String|Float|Int)\("([^"]+)"', block)
-        providers[name] = values
-    return providers
-
-
-def split_args(arg_text: str) -> list[str]:
-    parts: list[str] = []
-    current = []
-    depth = 0
-    in_str = False
-    escape = False
-    for ch in arg_text:
-        if ch == '"' and not escape:
-            in_str = not in_str
-        if not in_str:
-            if ch == "(":
-                depth += 1
-            elif ch == ")":
-                depth -= 1
-            elif ch == "," and depth == 0:
-                part = "".join(current).strip()
-                if part:
-                    parts.append(part)
-                current = []
-                continue
-        if escape:
-            escape = False
-        elif ch == "\\":
-            escape = True
-        current.append(ch)
-    tail = "".join(current).strip()
-    if tail:
-        parts.append(tail)
-    return parts
-
-
-def parse_attr_kv(attr_text: str) -> dict[str, str]:
-    kv: dict[str, str] = {}
-    for part in split_args(attr_text):
-        if "=" not in part:
-            continue
-        key, value = part.split("=", 1)
-        kv[key.strip()] = value.strip()
-    return kv
-
-
-def normalize_default(value: str, field_type: str) -> str:
-    value = value.strip()
-    if field_type == "bool":
-        return "On" if value.lower() == "true" else "Off"
-    if field_type == "string":
-        return strip_quotes(value)
-    if field_type in ("float", "double"):
-        value = value.rstrip("f")
-        return value
-    return value
-
-
-def parse_modoptions(source: str) -> list[dict[str, str]]:
-    results: list[dict[str, str]] = []
-    idx = 0
-    while True:
-        start = source.find("[ModOption(", idx)
-        if start == -1:
-            break
-        i = start + len("[ModOption(")
-        depth = 1
-        in_str = False
-        escape = False
-        end = -1
-        while i < len(source):
-            ch = source[i]
-            if ch == '"' and not escape:
-                in_str = not in_str
-            if not in_str:
-                if ch == "(":
-                    depth += 1
-                elif ch == ")":
-                    depth -= 1
-                    if depth == 0:
-                        end = i
-                        break
-            if escape:
-                escape = False
-            elif ch == "\\":
-                escape = True
-            i += 1
-        if end == -1:
-            break
-        attr_text = source[start + len("[ModOption(") : end]
-        close = source.find("]", end)
-        if close == -1:
-            break
-        field_match = re.search(
-            r"public\s+static\s+([^\s]+)\s+([^\s=]+)\s*=\s*([^;]+);",
-            source[close + 1 :],
-        )
-        if not field_match:
-            idx = close + 1
-            continue
-        field_type, field_name, field_value = field_match.group(1, 2, 3)
-        idx = close + 1 + field_match.end()
-        kv = parse_attr_kv(attr_text)
-        results.append(
-            {
-                "name": strip_quotes(kv.get("name", "")),
-                "category": strip_quotes(kv.get("category", "")),
-                "tooltip": strip_quotes(kv.get("tooltip", "")),
-                "valueSourceName": strip_quotes(kv.get("valueSourceName", "")),
-                "defaultValueIndex": kv.get("defaultValueIndex", ""),
-                "interactionType": kv.get("interactionType", ""),
-                "order": kv.get("order", ""),
-                "categoryOrder": kv.get("categoryOrder", ""),
-                "fieldType": field_type,
-                "fieldName": field_name,
-                "fieldValue": field_value.strip(),
-            }
-        )
-    return results
-
-
 providers = parse_provider_values(text)
 options = parse_modoptions(text)
 
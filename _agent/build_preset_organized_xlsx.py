@@ -1,75 +1,27 @@
 from __future__ import annotations
-import re
+import sys
 import zipfile
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
-ROOT = Path(r"C:\Users\dkatz\Documents\Projects\CSM")
-CSM_MANAGER = ROOT / "Core" / "CSMManager.cs"
-CSM_OPTIONS = ROOT / "Configuration" / "CSMModOptions.cs"
-TRIGGER_TYPE = ROOT / "Configuration" / "TriggerType.cs"
-OUTPUT = ROOT / "PRESET_GUIDE_ORGANIZED.xlsx"
-
-manager_text = CSM_MANAGER.read_text(encoding="utf-8")
-options_text = CSM_OPTIONS.read_text(encoding="utf-8")
-trigger_text = TRIGGER_TYPE.read_text(encoding="utf-8")
-
-
-def extract_method_block(text: str, signature_regex: str) -> str:
-    m = re.search(signature_regex, text)
-    if not m:
-        raise ValueError(f"Method signature not found: {signature_regex}")
-    idx = m.end()
-    brace_start = text.find('{', idx)
-    if brace_start == -1:
-        raise ValueError(f"No opening brace for method: {signature_regex}")
-    depth = 0
-    for i in range(brace_start, len(text)):
-        ch = text[i]
-        if ch == '{':
-            depth += 1
-        elif ch == '}':
-            depth -= 1
-            if depth == 0:
-                return text[brace_start + 1:i]
-    raise ValueError(f"No matching closing brace for method: {signature_regex}")
-
-
-def parse_enum(text: str, enum_name: str) -> list[str]:
-    pattern = re.compile(rf"public enum {re.escape(enum_name)}\s*\{{(.*?)\}}", re.S)
-    match = pattern.search(text)
-    if not match:
-        return []
-    body = match.group(1)
-    names = []
-    for line in body.splitlines():
-        line = line.strip()
-        if not line or line.startswith("//"):
-            continue
-        line = line.split('//', 1)[0].strip()
-        if not line:
-            continue
-        token = line.rstrip(',')
-        token = token.split('=')[0].strip()
-        if token:
-            names.append(token)
-    return names
-
-
-def parse_modoption_strings(text: str, method_name: str) -> dict[str, str]:
-    block = extract_method_block(text, rf"public\s+static\s+ModOptionString\[\]\s+{re.escape(method_name)}\s*\(")
-    mapping: dict[str, str] = {}
-    for m in re.finditer(r'new\s+ModOptionString\("([^"]+)",\s*"([^"]+)"\)', block):
-        mapping[m.group(2)] = m.group(1)
-    return mapping
-
-
-def pick_display(mapping: dict[str, str], fallback: str, *keys: str) -> str:
-    for key in keys:
-        value = mapping.get(key)
-        if value:
-            return value
-    return fallback
+import easing_cost
+import multiplier_sweep
+from cs_source import ROOT
+from preset_model import PresetModel
+
+OUTPUT = Path(sys.argv[1]) if len(sys.argv) > 1 else ROOT / "PRESET_GUIDE_ORGANIZED.xlsx"
+
+model = PresetModel.from_sources(ROOT)
+costs = easing_cost.compute(model, easing_cost.EasingSpec.from_sources())
+multiplier_grid = multiplier_sweep.MultiplierGrid.from_sources()
+sweep = multiplier_sweep.sweep(model, multiplier_grid)
+trigger_order = model.triggers
+preset_order = model.intensities
+chance_order = model.chance_presets
+cooldown_order = model.cooldown_presets
+duration_order = model.duration_presets
+transition_order = model.transitions
+profile_order = model.profiles
 
 
 def display_trigger(name: str) -> str:
@@ -98,177 +50,6 @@ def format_number(value: float) -> str:
     return f"{value:.2f}".rstrip('0').rstrip('.')
 
 
-def clamp_percent(value: float) -> tuple[str, str]:
-    raw_pct = value * 100.0
-    if raw_pct <= 100.0 + 1e-6:
-        return format_percent(value), ""
-    clamped = "100%"
-    raw = f"{raw_pct:.1f}%" if abs(raw_pct - round(raw_pct)) > 1e-6 else f"{int(round(raw_pct))}%"
-    return clamped, f"clamped from {raw}"
-
-
-# Trigger order
-trigger_enum = parse_enum(trigger_text, "TriggerType")
-
-# Parse GetPresetValues
-preset_block = extract_method_block(manager_text, r"public\s+static\s+void\s+GetPresetValues\s*\(")
-trigger_case_pattern = re.compile(r"case\s+TriggerType\.(\w+)\s*:")
-trigger_matches = list(trigger_case_pattern.finditer(preset_block))
-
-intensity_values: dict[str, dict[str, dict[str, object]]] = {}
-trigger_order: list[str] = []
-
-for idx, match in enumerate(trigger_matches):
-    trigger = match.group(1)
-    start = match.end()
-    end = trigger_matches[idx + 1].start() if idx + 1 < len(trigger_matches) else len(preset_block)
-    block = preset_block[start:end]
-
-    trigger_order.append(trigger)
-    intensity_values[trigger] = {}
-
-    defaults: dict[str, object] = {}
-    pre_switch = block.split("switch (preset)", 1)[0]
-    for var in ["chance", "timeScale", "duration", "cooldown", "smoothing"]:
-        m_value = re.search(rf"{var}\s*=\s*([0-9.]+)f;", pre_switch)
-        if m_value:
-            defaults[var] = float(m_value.group(1))
-    m_third = re.search(r"thirdPerson\s*=\s*(true|false);", pre_switch)
-    if m_third:
-        defaults["thirdPerson"] = m_third.group(1) == "true"
-
-    preset_case_pattern = re.compile(r"case\s+CSMModOptions\.Preset\.(\w+)\s*:(.*?)(?=case\s+CSMModOptions\.Preset|\Z)", re.S)
-    for preset_match in preset_case_pattern.finditer(block):
-        preset = preset_match.group(1)
-        case_block = preset_match.group(2)
-        values: dict[str, object] = {}
-        for var in ["chance", "timeScale", "duration", "cooldown", "smoothing"]:
-            m = re.search(rf"{var}\s*=\s*([0-9.]+)f;", case_block)
-            if m:
-                values[var] = float(m.group(1))
-        m_third = re.search(r"thirdPerson\s*=\s*(true|false);", case_block)
-        if m_third:
-            values["thirdPerson"] = m_third.group(1) == "true"
-        for key, default_value in defaults.items():
-            if key not in values:
-                values[key] = default_value
-        intensity_values[trigger][preset] = values
-
-if not trigger_order:
-    trigger_order = trigger_enum
-
-third_person_allowed = {t for t in trigger_order if t not in ("Parry", "LastStand")}
-
-# Preset order
-preset_order_all = parse_enum(options_text, "Preset")
-preset_order = [p for p in preset_order_all if p != "Custom"]
-if not preset_order:
-    for trigger in trigger_order:
-        if trigger in intensity_values:
-            preset_order = list(intensity_values[trigger].keys())
-            break
-
-# Killcam base chance
-base_killcam_block = extract_method_block(options_text, r"private\s+static\s+float\s+GetKillcamBaseChance\s*\(")
-base_killcam: dict[str, float] = {}
-for m in re.finditer(r"case\s+TriggerType\.(\w+)\s*:\s*return\s*([0-9.]+)f;", base_killcam_block):
-    base_killcam[m.group(1)] = float(m.group(2))
-
-# Camera distribution multipliers
-camera_dist_block = extract_method_block(options_text, r"public\s+static\s+float\s+GetCameraDistributionMultiplier\s*\(")
-camera_distribution: dict[str, float] = {}
-for m in re.finditer(r"case\s+CameraDistributionPreset\.(\w+)\s*:\s*return\s*([0-9.]+)f;", camera_dist_block):
-    camera_distribution[m.group(1)] = float(m.group(2))
-
-camera_distribution_display = parse_modoption_strings(options_text, "CameraDistributionProvider")
-camera_distribution_labels = {
-    "FirstPersonOnly": pick_display(camera_distribution_display, "First Person Only", "First Person Only"),
-    "MostlyFirstPerson": pick_display(
-        camera_distribution_display,
-        "Mostly First Person",
-        "Mixed (Rare Third Person)",
-        "Mostly First Person",
-        "Rare",
-    ),
-    "Mixed": pick_display(camera_distribution_display, "Mixed", "Mixed", "Standard"),
-    "MostlyThirdPerson": pick_display(camera_distribution_display, "Mostly Third Person", "Mostly Third Person", "Frequent"),
-    "ThirdPersonOnly": pick_display(camera_distribution_display, "Third Person Only", "Third Person Only", "Always"),
-}
-
-# Chance presets
-chance_block = extract_method_block(options_text, r"public\s+static\s+void\s+ApplyChancePreset\s*\(")
-chance_presets: dict[str, float] = {}
-for case in re.finditer(r"case\s+ChancePreset\.(\w+)\s*:(.*?)(?=case\s+ChancePreset|default|\Z)", chance_block, re.S):
-    name = case.group(1)
-    body = case.group(2)
-    m_chance = re.search(r"chanceMultiplier\s*=\s*([0-9.]+)f;", body)
-    if m_chance:
-        chance_presets[name] = float(m_chance.group(1))
-
-# Cooldown presets
-cooldown_block = extract_method_block(options_text, r"public\s+static\s+void\s+ApplyCooldownPreset\s*\(")
-cooldown_presets: dict[str, float] = {}
-for case in re.finditer(r"case\s+CooldownPreset\.(\w+)\s*:(.*?)(?=case\s+CooldownPreset|default|\Z)", cooldown_block, re.S):
-    name = case.group(1)
-    body = case.group(2)
-    m_cooldown = re.search(r"cooldownMultiplier\s*=\s*([0-9.]+)f;", body)
-    if m_cooldown:
-        cooldown_presets[name] = float(m_cooldown.group(1))
-
-# Duration presets
-duration_block = extract_method_block(options_text, r"public\s+static\s+void\s+ApplyDurationPreset\s*\(")
-duration_presets: dict[str, float] = {}
-for case in re.finditer(r"case\s+DurationPreset\.(\w+)\s*:(.*?)(?=case\s+DurationPreset|default|\Z)", duration_block, re.S):
-    name = case.group(1)
-    body = case.group(2)
-    m_mult = re.search(r"durationMultiplier\s*=\s*([0-9.]+)f;", body)
-    if m_mult:
-        duration_presets[name] = float(m_mult.group(1))
-
-# Smoothness presets
-smoothness_block = extract_method_block(options_text, r"public\s+static\s+void\s+ApplySmoothnessPreset\s*\(")
-smoothness_presets: dict[str, float] = {}
-for case in re.finditer(r"case\s+SmoothnessPreset\.(\w+)\s*:(.*?)(?=case\s+SmoothnessPreset|default|\Z)", smoothness_block, re.S):
-    name = case.group(1)
-    body = case.group(2)
-    m_mult = re.search(r"smoothingMultiplier\s*=\s*([0-9.]+)f;", body)
-    if m_mult:
-        smoothness_presets[name] = float(m_mult.group(1))
-
-# Trigger profile mapping
-profile_triggers: dict[str, list[str]] = {
-    "All": list(trigger_order),
-    "KillsOnly": ["BasicKill", "Critical", "Dismemberment", "Decapitation", "LastEnemy"],
-    "Highlights": ["Critical", "Decapitation", "LastEnemy"],
-    "LastEnemyOnly": ["LastEnemy"],
-}
-for key, triggers in list(profile_triggers.items()):
-    profile_triggers[key] = [t for t in triggers if t in trigger_order]
-
-# Enum orders
-chance_order = parse_enum(options_text, "ChancePreset")
-cooldown_order = parse_enum(options_text, "CooldownPreset")
-duration_order = parse_enum(options_text, "DurationPreset")
-smoothness_order = parse_enum(options_text, "SmoothnessPreset")
-profile_order = parse_enum(options_text, "TriggerProfilePreset")
-
-base_standard = {t: intensity_values.get(t, {}).get("Standard", {}) for t in trigger_order}
-
-
-def compute_chance_value(base_chance: float, preset_name: str) -> str:
-    if preset_name == "Off":
-        return "100%"
-    mult = chance_presets.get(preset_name, 1.0)
-    return format_percent(min(1.0, base_chance * mult))
-
-
-def compute_cooldown_value(base_cooldown: float, preset_name: str) -> str:
-    if preset_name == "Off":
-        return "0"
-    mult = cooldown_presets.get(preset_name, 1.0)
-    return format_number(max(0.0, base_cooldown * mult))
-
-
 # Sheet building helpers
 STYLE_DEFAULT = 0
 STYLE_TITLE = 1
@@ -279,9 +60,7 @@ STYLE_NOTE = 5
 STYLE_SECTION_INTENSITY = 6
 STYLE_SECTION_FREQUENCY = 7
 STYLE_SECTION_DURATION = 8
-STYLE_SECTION_SMOOTHNESS = 9
-STYLE_SECTION_CAMERA = 10
-STYLE_SECTION_KILLCAM = 11
+STYLE_SECTION_TRANSITION = 9
 STYLE_SECTION_PROFILE = 12
 
 
@@ -359,12 +138,8 @@ def build_sheet_xml(rows: list[list[str]], row_types: list[str]):
             style_idx = STYLE_SECTION_FREQUENCY
         elif row_type == "section_duration":
             style_idx = STYLE_SECTION_DURATION
-        elif row_type == "section_smoothness":
-            style_idx = STYLE_SECTION_SMOOTHNESS
-        elif row_type == "section_camera":
-            style_idx = STYLE_SECTION_CAMERA
-        elif row_type == "section_killcam":
-            style_idx = STYLE_SECTION_KILLCAM
+        elif row_type == "section_transition":
+            style_idx = STYLE_SECTION_TRANSITION
         elif row_type == "section_profile":
             style_idx = STYLE_SECTION_PROFILE
         elif row_type == "preset":
@@ -399,12 +174,8 @@ def section_row_type(header: str) -> str:
         return "section_frequency"
     if header.startswith("Duration"):
         return "section_duration"
-    if header.startswith("Smoothness"):
-        return "section_smoothness"
-    if header.startswith("Camera Distribution") or header.startswith("Third Person Distribution"):
-        return "section_camera"
-    if "Killcam" in header:
-        return "section_killcam"
+    if header.startswith("Transition"):
+        return "section_transition"
     if header.startswith("Profile") or header.startswith("Trigger Profiles"):
         return "section_profile"
     return "section"
@@ -439,94 +210,115 @@ def make_sheet(title: str, notes: list[str], blocks: list[tuple[str, list[list[s
 
 chance_preset_note = "Chance Preset Off disables chance rolls (cooldown only)."
 cooldown_preset_note = "Cooldown Preset Off disables per-trigger cooldowns."
+transition_note = (
+    f"Transition easing = Duration x {format_percent(model.ramp_percent)} (Off = instant); "
+    "it also extends the global cooldown."
+)
+cost_note = (
+    "Real = slow-mo plus ease-out; Game = game seconds that pass in that time; "
+    "Game Lost = Real - Game; Cooldown Occupancy = Real / (Real + Cooldown)."
+)
+
+# Every table below is a slice of the preset tensor; axes that do not affect a field are
+# pinned to their first label, since the value does not depend on them.
+PIN = {axis: labels[0] for axis, labels in model.axes.items()}
+
+
+def column(field: str, **labels) -> list[float]:
+    """One value per trigger for `field` with the other axes fixed by `labels`."""
+    fixed = dict(PIN)
+    fixed.update(labels)
+    fixed.pop("trigger")
+    return [float(value) for value in model.select(field, **fixed)]
+
+
+def row(field: str, trigger: str, axis: str, **labels) -> list[float]:
+    """One value per label of `axis` for one trigger."""
+    fixed = dict(PIN)
+    fixed.update(labels)
+    fixed["trigger"] = trigger
+    fixed.pop(axis)
+    return [float(value) for value in model.select(field, **fixed)]
+
+
+def cost_column(field: str, **labels) -> list[float]:
+    """Like `column`, for the easing_cost fields."""
+    fixed = dict(PIN)
+    fixed.update(labels)
+    fixed.pop("trigger")
+    return [float(value) for value in easing_cost.select(model, costs, field, **fixed)]
+
 
 # Overview sheet
 overview_blocks: list[tuple[str, list[list[str]]]] = []
 
-# Third Person Distribution blocks
-for preset, mult in camera_distribution.items():
-    label = camera_distribution_labels.get(preset, preset)
-    table = [["Trigger", "Killcam Chance", "Eligible"]]
-    for trigger in trigger_order:
-        base_chance = base_killcam.get(trigger, 0.0)
-        allow = trigger in third_person_allowed and mult > 0.0
-        eligible = "Yes" if allow else "No"
-        chance, _ = clamp_percent(base_chance * mult if allow else 0.0)
-        table.append([display_trigger(trigger), chance, eligible])
-    overview_blocks.append((f"Third Person Distribution: {label} (Killcam x{format_number(mult)})", table))
-
 # Intensity blocks (TimeScale only)
 for preset in preset_order:
     table = [["Trigger", "TimeScale"]]
-    for trigger in trigger_order:
-        values = intensity_values.get(trigger, {}).get(preset, {})
-        table.append([
-            display_trigger(trigger),
-            format_timescale(float(values.get("timeScale", 0.0))),
-        ])
+    for trigger, value in zip(trigger_order, column("timeScale", intensity=preset)):
+        table.append([display_trigger(trigger), format_timescale(value)])
     overview_blocks.append((f"Intensity Preset: {preset}", table))
 
 # Chance preset blocks
 for preset in chance_order:
-    if preset == "Off":
-        header = "Chance Preset: Off (Cooldown Only)"
-    else:
-        mult = chance_presets.get(preset, 1.0)
-        header = f"Chance Preset: {preset} (Chance x{format_number(mult)})"
+    header = "Chance Preset: Off (Cooldown Only)" if preset == "Off" else f"Chance Preset: {preset}"
     table = [["Trigger", "Chance"]]
-    for trigger in trigger_order:
-        base = base_standard.get(trigger, {})
-        base_chance = float(base.get("chance", 0.0))
-        table.append([display_trigger(trigger), compute_chance_value(base_chance, preset)])
+    for trigger, value in zip(trigger_order, column("chance", chance=preset)):
+        table.append([display_trigger(trigger), format_percent(value)])
     overview_blocks.append((header, table))
 
 # Cooldown preset blocks
 for preset in cooldown_order:
+    header = "Cooldown Preset: Off (Disabled)" if preset == "Off" else f"Cooldown Preset: {preset}"
     table = [["Trigger", "Cooldown (s)"]]
-    for trigger in trigger_order:
-        base = base_standard.get(trigger, {})
-        base_cooldown = float(base.get("cooldown", 0.0))
-        table.append([display_trigger(trigger), compute_cooldown_value(base_cooldown, preset)])
-    if preset == "Off":
-        header = "Cooldown Preset: Off (Disabled)"
-    else:
-        mult = cooldown_presets.get(preset, 1.0)
-        header = f"Cooldown Preset: {preset} (Cooldown x{format_number(mult)})"
+    for trigger, value in zip(trigger_order, column("cooldown", cooldown=preset)):
+        table.append([display_trigger(trigger), format_number(value)])
     overview_blocks.append((header, table))
 
 # Duration blocks
 for preset in duration_order:
-    if preset not in duration_presets:
-        continue
-    mult = duration_presets[preset]
     table = [["Trigger", "Duration (s)"]]
-    for trigger in trigger_order:
-        base = base_standard.get(trigger, {})
-        duration = max(0.05, float(base.get("duration", 0.0)) * mult)
-        table.append([display_trigger(trigger), format_number(duration)])
-    overview_blocks.append((f"Duration Preset: {preset} (Duration x{format_number(mult)})", table))
-
-# Smoothness blocks
-for preset in smoothness_order:
-    if preset not in smoothness_presets:
-        continue
-    mult = smoothness_presets[preset]
-    table = [["Trigger", "Smoothing (x)"]]
-    for trigger in trigger_order:
-        base = base_standard.get(trigger, {})
-        smoothing = max(0.0, float(base.get("smoothing", 0.0)) * mult)
-        table.append([display_trigger(trigger), format_number(smoothing)])
-    overview_blocks.append((f"Smoothness Preset: {preset} (Smoothing x{format_number(mult)})", table))
+    for trigger, value in zip(trigger_order, column("duration", duration=preset)):
+        table.append([display_trigger(trigger), format_number(value)])
+    overview_blocks.append((f"Duration Preset: {preset}", table))
+
+# Transition blocks (easing and time cost at the Default duration/intensity/cooldown presets)
+default_duration = "Default" if "Default" in duration_order else duration_order[0]
+default_intensity = "Default" if "Default" in preset_order else preset_order[0]
+default_cooldown = "Default" if "Default" in cooldown_order else cooldown_order[0]
+for preset in transition_order:
+    table = [["Trigger", "Easing (s)", "Global Cooldown (s)", "Real (s)", "Game (s)", "Game Lost (s)", "Cooldown Occupancy"]]
+    easing = column("easing", transition=preset, duration=default_duration)
+    busy = column("busy", transition=preset, duration=default_duration)
+    cost_labels = {"transition": preset, "duration": default_duration, "intensity": default_intensity}
+    real = cost_column("realSeconds", **cost_labels)
+    game = cost_column("gameSeconds", **cost_labels)
+    lost = cost_column("lostSeconds", **cost_labels)
+    occupancy = cost_column("occupancy", cooldown=default_cooldown, **cost_labels)
+    for idx, trigger in enumerate(trigger_order):
+        table.append([
+            display_trigger(trigger),
+            format_number(easing[idx]),
+            format_number(busy[idx]),
+            format_number(real[idx]),
+            format_number(game[idx]),
+            format_number(lost[idx]),
+            format_percent(occupancy[idx]),
+        ])
+    overview_blocks.append((
+        f"Transition Preset: {preset} (Duration/Intensity/Cooldown = {default_duration})",
+        table,
+    ))
 
 overview_sheet = make_sheet(
     "Overview (Preset-First)",
     [
         "Intensity tab shows only TimeScale.",
-        "Chance/Cooldown/Duration/Smoothness tables are derived from Intensity = Standard.",
+        "Chance/Cooldown/Duration tables are final values from CSMModOptions (independent of Intensity).",
         chance_preset_note,
         cooldown_preset_note,
-        "Killcam chance = Base Chance x Third Person Distribution.",
-        "Killcam tables assume Third Person Distribution controls killcam.",
+        transition_note,
+        cost_note,
     ],
     overview_blocks,
 )
@@ -535,12 +327,8 @@ overview_sheet = make_sheet(
 profile_blocks: list[tuple[str, list[list[str]]]] = []
 for profile in profile_order:
     table = [["Trigger", "Enabled"]]
-    for trigger in trigger_order:
-        if profile == "All":
-            enabled = "Yes"
-        else:
-            enabled = "Yes" if trigger in profile_triggers.get(profile, []) else "No"
-        table.append([display_trigger(trigger), enabled])
+    for trigger, enabled in zip(trigger_order, column("enabled", profile=profile)):
+        table.append([display_trigger(trigger), "Yes" if enabled else "No"])
     profile_blocks.append((f"Profile: {profile}", table))
 
 profile_sheet = make_sheet(
@@ -555,88 +343,104 @@ for trigger in trigger_order:
     trigger_name = display_trigger(trigger)
     blocks: list[tuple[str, list[list[str]]]] = []
 
-    # Intensity table (TimeScale only)
     table = [["Preset", "TimeScale"]]
-    for preset in preset_order:
-        values = intensity_values.get(trigger, {}).get(preset, {})
-        table.append([
-            preset,
-            format_timescale(float(values.get("timeScale", 0.0))),
-        ])
+    for preset, value in zip(preset_order, row("timeScale", trigger, "intensity")):
+        table.append([preset, format_timescale(value)])
     blocks.append(("Intensity Presets", table))
 
-    # Chance preset table
     table = [["Preset", "Chance"]]
-    base = base_standard.get(trigger, {})
-    for preset in chance_order:
-        base_chance = float(base.get("chance", 0.0))
-        table.append([preset, compute_chance_value(base_chance, preset)])
-    blocks.append(("Chance Presets (from Intensity Standard)", table))
+    for preset, value in zip(chance_order, row("chance", trigger, "chance")):
+        table.append([preset, format_percent(value)])
+    blocks.append(("Chance Presets", table))
 
-    # Cooldown preset table
     table = [["Preset", "Cooldown (s)"]]
-    for preset in cooldown_order:
-        base_cooldown = float(base.get("cooldown", 0.0))
-        table.append([preset, compute_cooldown_value(base_cooldown, preset)])
-    blocks.append(("Cooldown Presets (from Intensity Standard)", table))
-
-    # Duration table
-    table = [["Preset", "Duration (s)"]]
+    for preset, value in zip(cooldown_order, row("cooldown", trigger, "cooldown")):
+        table.append([preset, format_number(value)])
+    blocks.append(("Cooldown Presets", table))
+
+    table = [["Preset", "Duration (s)"] + [f"Easing: {name} (s)" for name in transition_order]]
+    durations = row("duration", trigger, "duration")
+    easing_by_transition = [row("easing", trigger, "duration", transition=name) for name in transition_order]
+    for idx, preset in enumerate(duration_order):
+        table.append([preset, format_number(durations[idx])] + [format_number(easing[idx]) for easing in easing_by_transition])
+    blocks.append(("Duration Presets", table))
+
+    table = [["Duration Preset", "Transition", "Real (s)", "Game (s)", "Game Lost (s)", "Cooldown Occupancy"]]
     for preset in duration_order:
-        if preset not in duration_presets:
-            continue
-        mult = duration_presets[preset]
-        duration = max(0.05, float(base.get("duration", 0.0)) * mult)
-        table.append([preset, format_number(duration)])
-    blocks.append(("Duration Presets (from Intensity Standard)", table))
-
-    # Smoothness table
-    table = [["Preset", "Smoothing (x)"]]
-    for preset in smoothness_order:
-        if preset not in smoothness_presets:
-            continue
-        mult = smoothness_presets[preset]
-        smoothing = max(0.0, float(base.get("smoothing", 0.0)) * mult)
-        table.append([preset, format_number(smoothing)])
-    blocks.append(("Smoothness Presets (from Intensity Standard)", table))
-
-    # Trigger profiles table
+        for transition in transition_order:
+            labels = {"trigger": trigger, "duration": preset, "transition": transition, "intensity": default_intensity}
+            pick = dict(PIN, **labels)
+            table.append([
+                preset,
+                transition,
+                format_number(float(easing_cost.select(model, costs, "realSeconds", **pick))),
+                format_number(float(easing_cost.select(model, costs, "gameSeconds", **pick))),
+                format_number(float(easing_cost.select(model, costs, "lostSeconds", **pick))),
+                format_percent(float(easing_cost.select(model, costs, "occupancy", **dict(pick, cooldown=default_cooldown)))),
+            ])
+    blocks.append((f"Duration Time Cost (Intensity/Cooldown = {default_intensity})", table))
+
     table = [["Profile", "Enabled"]]
-    for profile in profile_order:
-        if profile == "All":
-            enabled = "Yes"
-        else:
-            enabled = "Yes" if trigger in profile_triggers.get(profile, []) else "No"
-        table.append([profile, enabled])
+    for profile, enabled in zip(profile_order, row("enabled", trigger, "profile")):
+        table.append([profile, "Yes" if enabled else "No"])
     blocks.append(("Trigger Profiles", table))
 
-    # Killcam tables
-    base_chance = base_killcam.get(trigger, 0.0)
-    table = [["Base Killcam Chance", format_percent(base_chance)]]
-    blocks.append(("Killcam Base Chance", table))
-
-    table = [["Third Person Distribution", "Killcam Chance", "Eligible"]]
-    for preset, mult in camera_distribution.items():
-        chance, _ = clamp_percent(base_chance * mult)
-        eligible = "Yes" if mult > 0.0 else "No"
-        label = camera_distribution_labels.get(preset, preset)
-        table.append([label, chance, eligible])
-    blocks.append(("Killcam by Third Person Distribution", table))
-
     trigger_sheets.append(make_sheet(
         f"{trigger_name}",
         [
             "Intensity table shows only TimeScale.",
-            "Chance/Cooldown/Duration/Smoothness derived from Intensity = Standard.",
             chance_preset_note,
-            "Killcam chance = Base Chance x Third Person Distribution.",
-            "Killcam only triggers if eligible unless camera mode forces third person.",
+            transition_note,
+            cost_note,
         ],
         blocks,
     ))
 
+# Multiplier sweep sheet
+sweep_blocks: list[tuple[str, list[list[str]]]] = []
+combined_max = sweep["combinedRange"][1]
+for i, preset in enumerate(preset_order):
+    table = [["Trigger", "TimeScale", "1.0x At Combined <=", "0.01x At Combined >=", "Grid At 1.0x", "Grid At 0.01x", "Distinct Results"]]
+    for t, trigger in enumerate(trigger_order):
+        floor_at = float(sweep["floorAt"][t, i])
+        table.append([
+            display_trigger(trigger),
+            format_timescale(float(sweep["timeScale"][t, i])),
+            format_timescale(float(sweep["ceilingAt"][t, i])),
+            format_timescale(floor_at) if floor_at <= combined_max else "Unreachable",
+            format_percent(float(sweep["ceilingShare"][t, i])),
+            format_percent(float(sweep["floorShare"][t, i])),
+            str(int(sweep["distinct"][t, i])),
+        ])
+    sweep_blocks.append((f"Intensity Preset: {preset}", table))
+
+table = [["Trigger", "Multiplier", "TimeScale", "Options -> 1.0x", "Options -> 0.01x"]]
+for entry in multiplier_sweep.single_axis(model, multiplier_grid, default_intensity):
+    table.append([
+        display_trigger(entry["trigger"]),
+        entry["multiplier"],
+        format_timescale(entry["timeScale"]),
+        multiplier_sweep.format_options(entry["ceilingOptions"]),
+        multiplier_sweep.format_options(entry["floorOptions"]),
+    ])
+sweep_blocks.append((f"Single Multiplier Clamping (Intensity = {default_intensity}, others 1.0x)", table))
+
+sweep_sheet = make_sheet(
+    "Multiplier Sweep",
+    [
+        "Effective TimeScale = Clamp(TimeScale / (Damage Type x Intensity x DOT x Thrown), 0.01, 1).",
+        f"Grid = every DamageMultiplierProvider value for Damage Type/DOT/Thrown x Intensity Scaling "
+        f"(Off, or every IntensityMaxProvider value at {len(multiplier_grid.impacts)} impact steps): "
+        f"{sweep['gridSize']:,} points, {format_percent(sweep['blockedShare'])} blocked by a 0x multiplier.",
+        "Grid At 1.0x / 0.01x = share of non-blocked grid points clamped to that bound; "
+        "options that land on the same bound are indistinguishable in game.",
+        "Intensity Max options are shown at full impact intensity.",
+    ],
+    sweep_blocks,
+)
+
 # Collect sheets
-sheets: list[tuple[str, list[list[str]], list[str]]] = [overview_sheet, profile_sheet] + trigger_sheets
+sheets: list[tuple[str, list[list[str]], list[str]]] = [overview_sheet, profile_sheet] + trigger_sheets + [sweep_sheet]
 
 
 # Workbook writer
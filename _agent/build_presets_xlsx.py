@@ -1,10 +1,11 @@
 from __future__ import annotations
+import sys
 import zipfile
 from pathlib import Path
 import xml.etree.ElementTree as ET
 
-ROOT = Path(r"D:\Documents\Projects\repos\CSM")
-OUTPUT = ROOT / "Presets.xlsx"
+ROOT = Path(__file__).resolve().parent.parent
+OUTPUT = Path(sys.argv[1]) if len(sys.argv) > 1 else ROOT / "Presets.xlsx"
 
 NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
 NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
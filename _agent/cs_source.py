@@ -0,0 +1,363 @@
+"""Helpers for pulling ModOptions, providers, enums and method bodies out of the C# sources,
+plus the C# tokenizer shared by hotpath_alloc, log_audit and telemetry_schema."""
+
+from __future__ import annotations
+
+import fnmatch
+import os
+import re
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+CSM_MANAGER = ROOT / "Core" / "CSMManager.cs"
+CSM_OPTIONS = ROOT / "Configuration" / "CSMModOptions.cs"
+TRIGGER_TYPE = ROOT / "Configuration" / "TriggerType.cs"
+# <Compile Include="**\*.cs" Exclude=...> plus <Compile Remove="Patches\**\*.cs" /> in CSM.csproj.
+COMPILE_EXCLUDE = ("BasSDK/*", "7dtd Reference/*", "References/*", "obj/*", "bin/*", "builds/*", "CSM.Tests/*", "Patches/*")
+PRUNE_DIRS = {".git", ".cache", "__pycache__", "node_modules"}
+
+
+def read_source(path: Path) -> str:
+    return Path(path).read_text(encoding="utf-8")
+
+
+def compiled_sources(root: Path = ROOT) -> list[str]:
+    """Repo-relative paths of every .cs file CSM.csproj compiles, sorted."""
+    files = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(name for name in dirnames if name not in PRUNE_DIRS)
+        rel_dir = Path(dirpath).relative_to(root).as_posix()
+        for name in filenames:
+            if not name.endswith(".cs"):
+                continue
+            rel = name if rel_dir == "." else f"{rel_dir}/{name}"
+            if not any(fnmatch.fnmatch(rel, pattern) for pattern in COMPILE_EXCLUDE):
+                files.append(rel)
+    return sorted(files)
+
+
+def extract_method_block(source: str, signature_regex: str) -> str:
+    m = re.search(signature_regex, source)
+    if not m:
+        raise ValueError(f"Method signature not found: {signature_regex}")
+    idx = m.end()
+    brace_start = source.find("{", idx)
+    if brace_start == -1:
+        raise ValueError(f"No opening brace for method: {signature_regex}")
+    depth = 0
+    for i in range(brace_start, len(source)):
+        ch = source[i]
+        if ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return source[brace_start + 1 : i]
+    raise ValueError(f"No matching closing brace for method: {signature_regex}")
+
+
+def strip_quotes(value: str) -> str:
+    value = value.strip()
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return value[1:-1]
+    return value
+
+
+def parse_provider_values(source: str) -> dict[str, list[str]]:
+    providers: dict[str, list[str]] = {}
+    for match in re.finditer(r"public\s+static\s+ModOption(?:String|Float|Int)\[\]\s+(\w+)\s*\(", source):
+        name = match.group(1)
+        block = extract_method_block(source, rf"public\s+static\s+ModOption(?:String|Float|Int)\[\]\s+{re.escape(name)}\s*\(")
+        values = re.findall(r'new\s+ModOption(?:String|Float|Int)\("([^"]+)"', block)
+        providers[name] = values
+    return providers
+
+
+def parse_modoption_strings(source: str, method_name: str) -> dict[str, str]:
+    """Map each `ModOptionString(label, value)` value to its label for one provider."""
+    block = extract_method_block(source, rf"public\s+static\s+ModOptionString\[\]\s+{re.escape(method_name)}\s*\(")
+    mapping: dict[str, str] = {}
+    for m in re.finditer(r'new\s+ModOptionString\("([^"]+)",\s*"([^"]+)"\)', block):
+        mapping[m.group(2)] = m.group(1)
+    return mapping
+
+
+def parse_preset_options(source: str) -> dict[str, dict[str, str]]:
+    """Map each preset enum to `{member: ModOption value}` from its `PresetOption<T>(label, value, T.Member)` table."""
+    options: dict[str, dict[str, str]] = {}
+    for m in re.finditer(r'new\s+PresetOption<(\w+)>\(\s*"([^"]*)"\s*,\s*"([^"]*)"\s*,\s*\w+\.(\w+)\s*\)', source):
+        options.setdefault(m.group(1), {})[m.group(4)] = m.group(3)
+    return options
+
+
+def parse_enum(source: str, enum_name: str) -> list[str]:
+    pattern = re.compile(rf"public enum {re.escape(enum_name)}\s*\{{(.*?)\}}", re.S)
+    match = pattern.search(source)
+    if not match:
+        return []
+    body = match.group(1)
+    names = []
+    for line in body.splitlines():
+        line = line.strip()
+        if not line or line.startswith("//"):
+            continue
+        line = line.split("//", 1)[0].strip()
+        if not line:
+            continue
+        token = line.rstrip(",")
+        token = token.split("=")[0].strip()
+        if token:
+            names.append(token)
+    return names
+
+
+def split_args(arg_text: str) -> list[str]:
+    parts: list[str] = []
+    current = []
+    depth = 0
+    in_str = False
+    escape = False
+    for ch in arg_text:
+        if ch == '"' and not escape:
+            in_str = not in_str
+        if not in_str:
+            if ch == "(":
+                depth += 1
+            elif ch == ")":
+                depth -= 1
+            elif ch == "," and depth == 0:
+                part = "".join(current).strip()
+                if part:
+                    parts.append(part)
+                current = []
+                continue
+        if escape:
+            escape = False
+        elif ch == "\\":
+            escape = True
+        current.append(ch)
+    tail = "".join(current).strip()
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def parse_attr_kv(attr_text: str) -> dict[str, str]:
+    kv: dict[str, str] = {}
+    for part in split_args(attr_text):
+        if "=" not in part:
+            continue
+        key, value = part.split("=", 1)
+        kv[key.strip()] = value.strip()
+    return kv
+
+
+def normalize_default(value: str, field_type: str) -> str:
+    value = value.strip()
+    if field_type == "bool":
+        return "On" if value.lower() == "true" else "Off"
+    if field_type == "string":
+        return strip_quotes(value)
+    if field_type in ("float", "double"):
+        value = value.rstrip("f")
+        return value
+    return value
+
+
+def parse_modoptions(source: str) -> list[dict[str, str]]:
+    results: list[dict[str, str]] = []
+    idx = 0
+    while True:
+        start = source.find("[ModOption(", idx)
+        if start == -1:
+            break
+        i = start + len("[ModOption(")
+        depth = 1
+        in_str = False
+        escape = False
+        end = -1
+        while i < len(source):
+            ch = source[i]
+            if ch == '"' and not escape:
+                in_str = not in_str
+            if not in_str:
+                if ch == "(":
+                    depth += 1
+                elif ch == ")":
+                    depth -= 1
+                    if depth == 0:
+                        end = i
+                        break
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            i += 1
+        if end == -1:
+            break
+        attr_text = source[start + len("[ModOption(") : end]
+        close = source.find("]", end)
+        if close == -1:
+            break
+        field_match = re.search(
+            r"public\s+static\s+([^\s]+)\s+([^\s=]+)\s*=\s*([^;]+);",
+            source[close + 1 :],
+        )
+        if not field_match:
+            idx = close + 1
+            continue
+        field_type, field_name, field_value = field_match.group(1, 2, 3)
+        idx = close + 1 + field_match.end()
+        kv = parse_attr_kv(attr_text)
+        results.append(
+            {
+                "name": strip_quotes(kv.get("name", "")),
+                "category": strip_quotes(kv.get("category", "")),
+                "tooltip": strip_quotes(kv.get("tooltip", "")),
+                "valueSourceName": strip_quotes(kv.get("valueSourceName", "")),
+                "defaultValueIndex": kv.get("defaultValueIndex", ""),
+                "interactionType": kv.get("interactionType", ""),
+                "order": kv.get("order", ""),
+                "categoryOrder": kv.get("categoryOrder", ""),
+                "fieldType": field_type,
+                "fieldName": field_name,
+                "fieldValue": field_value.strip(),
+            }
+        )
+    return results
+
+
+def evaluate_float_provider(source: str, method_name: str) -> list[float]:
+    """Values of a `ModOptionFloat[]` provider built from literals and simple `for` loops.
+
+    Handles the shapes used in CSMModOptions.cs: `new ModOptionFloat("..", 1.5f)` and
+    `for (int i = a; i <= b; i++ / i += s)` bodies adding `i / N`, `(float)i` or a
+    `float val = i / N;` local.
+    """
+    block = extract_method_block(source, rf"public\s+static\s+ModOptionFloat\[\]\s+{re.escape(method_name)}\s*\(")
+    loop_re = re.compile(r"for\s*\(\s*int\s+(\w+)\s*=\s*(\d+)\s*;\s*\1\s*<=\s*(\d+)\s*;\s*\1\s*(\+\+|\+=\s*(\d+))\s*\)")
+    literal_re = re.compile(r'new\s+ModOptionFloat\("[^"]*",\s*' + r"(-?[0-9]*\.?[0-9]+)f?\s*\)")
+    values: list[float] = []
+    pos = 0
+    while True:
+        loop = loop_re.search(block, pos)
+        head = block[pos : loop.start() if loop else len(block)]
+        values.extend(float(m.group(1)) for m in literal_re.finditer(head))
+        if not loop:
+            return values
+        var, start, stop = loop.group(1), int(loop.group(2)), int(loop.group(3))
+        step = int(loop.group(5)) if loop.group(5) else 1
+        body = extract_method_block(block[loop.start() :], re.escape(loop.group(0)))
+        local = re.search(r"float\s+(\w+)\s*=\s*([^;]+);", body)
+        added = re.search(r"new\s+ModOptionFloat\([^,]+,\s*(.+?)\)\s*\)\s*;", body)
+        if not added:
+            raise ValueError(f"Unsupported loop body in {method_name}")
+        expr = added.group(1).strip()
+        if local and expr == local.group(1):
+            expr = local.group(2).strip()
+        divided = re.fullmatch(rf"\(?\s*{var}\s*/\s*([0-9.]+)f?\s*\)?", expr)
+        if divided:
+            values.extend(i / float(divided.group(1)) for i in range(start, stop + 1, step))
+        elif re.fullmatch(rf"(?:\(float\)\s*)?{var}", expr):
+            values.extend(float(i) for i in range(start, stop + 1, step))
+        else:
+            raise ValueError(f"Unsupported provider expression in {method_name}: {expr}")
+        pos = loop.start() + block[loop.start() :].find("{") + len(body) + 2
+
+
+TOKEN_RE = re.compile(
+    r"(?P<ws>\s+)"
+    r"|(?P<comment>//[^\n]*|/\*.*?\*/)"
+    r"|(?P<ident>@?[A-Za-z_]\w*)"
+    r"|(?P<number>\d[\w.]*)"
+    r"|(?P<op>=>|\+\+|--|\+=|-=|\*=|/=|==|!=|<=|>=|&&|\|\||\?\?=?|\?\.|::|[{}()\[\];,.<>+\-*/%=!?:&|^~#])",
+    re.S,
+)
+
+
+class Token:
+    __slots__ = ("kind", "text", "line", "holes")
+
+    def __init__(self, kind, text, line, holes=None):
+        self.kind = kind
+        self.text = text
+        self.line = line
+        self.holes = holes
+
+
+def _scan_string(src: str, i: int):
+    """(end index, hole expressions or None) for a string literal starting at `i`."""
+    j = i
+    interpolated = verbatim = False
+    while src[j] in "$@":
+        interpolated |= src[j] == "$"
+        verbatim |= src[j] == "@"
+        j += 1
+    j += 1  # opening quote
+    holes = [] if interpolated else None
+    while j < len(src):
+        ch = src[j]
+        if ch == "\\" and not verbatim:
+            j += 2
+            continue
+        if ch == '"':
+            if verbatim and src[j + 1:j + 2] == '"':
+                j += 2
+                continue
+            return j + 1, holes
+        if interpolated and ch == "{":
+            if src[j + 1:j + 2] == "{":
+                j += 2
+                continue
+            depth, start = 1, j + 1
+            j += 1
+            while j < len(src) and depth:
+                depth += {"{": 1, "}": -1}.get(src[j], 0)
+                j += 1
+            holes.append(src[start:j - 1])
+            continue
+        j += 1
+    return j, holes
+
+
+def tokenize(src: str):
+    """C# tokens with line numbers; comments, whitespace and preprocessor lines are dropped."""
+    tokens = []
+    i, line, n = 0, 1, len(src)
+    at_line_start = True
+    while i < n:
+        ch = src[i]
+        if at_line_start and ch == "#":  # preprocessor directive
+            end = src.find("\n", i)
+            i = n if end == -1 else end
+            continue
+        if ch == '"' or (ch in "$@" and re.match(r'[$@]{1,2}"', src[i:i + 3])):
+            end, holes = _scan_string(src, i)
+            tokens.append(Token("string", src[i:end], line, holes))
+            line += src.count("\n", i, end)
+            i = end
+            at_line_start = False
+            continue
+        if ch == "'":
+            end = i + 1
+            while end < n and src[end] != "'":
+                end += 2 if src[end] == "\\" else 1
+            tokens.append(Token("char", src[i:end + 1], line))
+            i = end + 1
+            continue
+        m = TOKEN_RE.match(src, i)
+        if not m:
+            i += 1
+            continue
+        text = m.group()
+        kind = m.lastgroup
+        if kind in ("ws", "comment"):
+            newlines = text.count("\n")
+            line += newlines
+            if newlines:
+                at_line_start = True
+        else:
+            tokens.append(Token(kind, text, line))
+            at_line_start = False
+        i = m.end()
+    return tokens
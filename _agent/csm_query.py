@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Answer preset questions from a cached copy of the preset model.
+
+    csm_query.py timeScale Critical Epic     one value
+    csm_query.py chance BasicKill            one field for every preset of a trigger
+    csm_query.py --all Parry                 every value for a trigger
+    csm_query.py --list                      fields, triggers and presets
+
+Values are the flat cells of preset_history.extract_values (`Trigger.field.Preset`).
+They are kept in _agent/.cache/query/model.json together with the SHA-1 of each C#
+source; a query only stats the sources (and hashes them when size or mtime moved), so
+no C# is parsed and NumPy is not imported unless the sources changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from cs_source import ROOT
+
+AGENT_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_FILE = AGENT_DIR / ".cache" / "query" / "model.json"
+CACHE_VERSION = 2
+# Same files as preset_history.SOURCES, listed here so the cached path imports nothing heavy.
+SOURCES = {
+    "manager": "Core/CSMManager.cs",
+    "options": "Configuration/CSMModOptions.cs",
+    "trigger": "Configuration/TriggerType.cs",
+    "visibility": "Core/CSMModOptionVisibility.cs",
+}
+FIELDS = ("timeScale", "chance", "cooldown", "duration")
+
+
+def source_state(root: Path, previous=None):
+    """{path: [size, mtime_ns, sha1]}, reusing a previous hash when size and mtime match."""
+    previous = previous or {}
+    state = {}
+    for path in SOURCES.values():
+        stat = (root / path).stat()
+        old = previous.get(path)
+        if old and old[0] == stat.st_size and old[1] == stat.st_mtime_ns:
+            state[path] = old
+        else:
+            digest = hashlib.sha1((root / path).read_bytes()).hexdigest()
+            state[path] = [stat.st_size, stat.st_mtime_ns, digest]
+    return state
+
+
+def build_model(root: Path):
+    from preset_history import extract_values  # imports NumPy; only on a cache miss
+
+    texts = {name: (root / path).read_text(encoding="utf-8") for name, path in SOURCES.items()}
+    extracted = extract_values(texts)
+    if extracted["error"]:
+        raise ValueError(extracted["error"])
+    return extracted["values"]
+
+
+def load_values(root: Path, cache_file: Path, use_cache: bool = True):
+    """(values, rebuilt) with the cache refreshed when any source hash changed."""
+    cached = None
+    if use_cache and cache_file.exists():
+        try:
+            cached = json.loads(cache_file.read_text(encoding="utf-8"))
+        except ValueError:
+            cached = None
+        if cached and (cached.get("version") != CACHE_VERSION or cached.get("root") != str(root)):
+            cached = None
+
+    state = source_state(root, cached["sources"] if cached else None)
+    if cached and all(state[path][2] == cached["sources"][path][2] for path in state):
+        if state != cached["sources"]:
+            cached["sources"] = state  # touched but unchanged: remember the new mtimes
+            write_cache(cache_file, cached)
+        return cached["values"], False
+
+    values = build_model(root)
+    if use_cache:
+        write_cache(cache_file, {"version": CACHE_VERSION, "root": str(root), "sources": state, "values": values})
+    return values, True
+
+
+def write_cache(cache_file: Path, data):
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data), encoding="utf-8")
+    os.replace(tmp, cache_file)
+
+
+def labels(values):
+    """Triggers, fields and presets per field, in source order."""
+    triggers, presets = [], {field: [] for field in FIELDS}
+    for name in values:
+        parts = name.split(".")
+        if len(parts) != 3 or parts[1] not in presets:
+            continue
+        if parts[0] not in triggers:
+            triggers.append(parts[0])
+        if parts[2] not in presets[parts[1]]:
+            presets[parts[1]].append(parts[2])
+    return triggers, presets
+
+
+def resolve(name: str, choices, kind: str) -> str:
+    for choice in choices:
+        if choice.lower() == name.replace(" ", "").lower():
+            return choice
+    raise ValueError(f"unknown {kind} '{name}' (choose from {', '.join(choices)})")
+
+
+def query(values, args):
+    """[(name, value)] for the requested cells."""
+    triggers, presets = labels(values)
+    if args.all:
+        trigger = resolve(args.all, triggers, "trigger")
+        return [(name, value) for name, value in values.items() if name.startswith(trigger + ".")]
+    if not args.terms:
+        raise ValueError("give a field and trigger, --all TRIGGER or --list")
+    field = resolve(args.terms[0], FIELDS, "field")
+    if len(args.terms) < 2:
+        raise ValueError(f"{field} needs a trigger ({', '.join(triggers)})")
+    trigger = resolve(args.terms[1], triggers, "trigger")
+    wanted = [resolve(term, presets[field], f"{field} preset") for term in args.terms[2:]] or presets[field]
+    return [(f"{trigger}.{field}.{preset}", values[f"{trigger}.{field}.{preset}"]) for preset in wanted]
+
+
+def format_value(value) -> str:
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="csm-query", description="Query preset values from the cached preset model")
+    parser.add_argument("terms", nargs="*", help="FIELD TRIGGER [PRESET ...], e.g. timeScale Critical Epic")
+    parser.add_argument("--all", metavar="TRIGGER", help="Every value for one trigger")
+    parser.add_argument("--list", action="store_true", help="List fields, triggers and presets")
+    parser.add_argument("--root", type=Path, default=ROOT, help="Repository root")
+    parser.add_argument("--cache-file", type=Path, default=DEFAULT_CACHE_FILE, help="Serialized model cache")
+    parser.add_argument("--no-cache", action="store_true", help="Parse the sources and do not write the cache")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        values, rebuilt = load_values(args.root.resolve(), args.cache_file, not args.no_cache)
+        if args.list:
+            triggers, presets = labels(values)
+            result = {"triggers": triggers, "fields": presets,
+                      "other": [name for name in values if name.count(".") != 2]}
+            print(json.dumps(result, indent=2) if args.json else "\n".join(
+                [f"triggers: {', '.join(triggers)}"]
+                + [f"{field}: {', '.join(names)}" for field, names in presets.items()]
+                + [f"other: {', '.join(result['other'])}"]
+            ))
+            return 0
+        rows = query(values, args)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    if rebuilt and not args.no_cache:
+        print("(model cache rebuilt)", file=sys.stderr)
+    if args.json:
+        print(json.dumps(dict(rows), indent=2))
+    elif len(rows) == 1:
+        print(format_value(rows[0][1]))
+    else:
+        width = max(len(name) for name, _ in rows)
+        for name, value in rows:
+            print(f"{name:<{width}}  {format_value(value)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
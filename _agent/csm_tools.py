@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""Command-line entry point for the CSM maintenance tools.
+
+    csm_tools.py preset-diff <rev-a> [<rev-b>]
+
+`preset-diff` compares the full preset model of two revisions and prints only the
+cells that changed: the intensity/chance/cooldown/duration tables, the transition
+ramp, every ModOption default (value, defaultValueIndex, provider) and every value
+provider. A revision is anything `git cat-file` accepts, or `WORKTREE` (the default
+for <rev-b>) for the files on disk. Sources are read through one `git cat-file --batch`
+process, both sides are parsed concurrently, and each parsed snapshot is cached by its
+blob SHAs next to the preset_history cache. Exit status is 1 when something changed,
+like `diff`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from cs_source import ROOT, evaluate_float_provider, parse_modoptions, parse_provider_values
+from preset_history import AGENT_DIR, SOURCES, BlobReader, extract_values, snapshot_key
+
+DEFAULT_CACHE_DIR = AGENT_DIR / ".cache" / "preset_diff"
+CACHE_VERSION = 1
+WORKTREE = "WORKTREE"
+
+
+def blob_sha(data: bytes) -> str:
+    """The SHA git would give `data` as a blob, so working-tree files share the cache."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def read_revision(reader: BlobReader, repo: Path, rev: str):
+    """(blob SHAs, source texts) of the preset sources at `rev`."""
+    blobs = {}
+    texts = {}
+    for name, path in SOURCES.items():
+        if rev == WORKTREE:
+            file = repo / path
+            sha, data = (blob_sha(file.read_bytes()), file.read_bytes()) if file.exists() else (None, None)
+        else:
+            sha, data = reader.read_object(f"{rev}:{path}")
+        if sha is None:
+            raise ValueError(f"{path} not found at {rev}")
+        blobs[path] = sha
+        texts[name] = data.decode("utf-8-sig", errors="replace")
+    return blobs, texts
+
+
+def extract_model(texts):
+    """Every diffable cell of one source snapshot (runs in a worker)."""
+    preset = extract_values(texts)
+    options_text = texts["options"]
+
+    options = {}
+    for option in parse_modoptions(options_text):
+        field = option["fieldName"]
+        options[f"{field}.value"] = option["fieldValue"]
+        if option["defaultValueIndex"]:
+            options[f"{field}.defaultValueIndex"] = option["defaultValueIndex"]
+        if option["valueSourceName"]:
+            options[f"{field}.valueSourceName"] = option["valueSourceName"]
+
+    providers = {}
+    for name, labels in parse_provider_values(options_text).items():
+        if not labels:
+            try:
+                labels = [f"{value:g}" for value in evaluate_float_provider(options_text, name)]
+            except ValueError:
+                labels = []
+        providers[name] = labels
+
+    return {"error": preset["error"], "presets": preset["values"], "options": options, "providers": providers}
+
+
+def load_model(job):
+    blobs, texts, cache_dir, use_cache = job
+    cache_file = cache_dir / f"{snapshot_key(blobs)}-{CACHE_VERSION}.json"
+    if use_cache and cache_file.exists():
+        return json.loads(cache_file.read_text(encoding="utf-8")), True
+    model = extract_model(texts)
+    if use_cache:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(model), encoding="utf-8")
+        os.replace(tmp, cache_file)
+    return model, False
+
+
+def diff_cells(a: dict, b: dict):
+    """[(name, old, new)] for cells that differ; a missing side is None."""
+    names = list(a) + [name for name in b if name not in a]
+    return [(name, a.get(name), b.get(name)) for name in names if a.get(name) != b.get(name)]
+
+
+def diff_providers(a: dict, b: dict):
+    """[(name, summary)] for providers whose option list changed."""
+    changes = []
+    for name in list(a) + [name for name in b if name not in a]:
+        old, new = a.get(name), b.get(name)
+        if old == new:
+            continue
+        if old is None or new is None:
+            changes.append((name, "added" if old is None else "removed"))
+            continue
+        removed = [value for value in old if value not in new]
+        added = [value for value in new if value not in old]
+        parts = [f"{len(old)} -> {len(new)} options"]
+        if removed:
+            parts.append("removed " + ", ".join(removed[:8]) + (" ..." if len(removed) > 8 else ""))
+        if added:
+            parts.append("added " + ", ".join(added[:8]) + (" ..." if len(added) > 8 else ""))
+        if not removed and not added:
+            parts.append("reordered")
+        changes.append((name, "; ".join(parts)))
+    return changes
+
+
+def format_cell(value) -> str:
+    if value is None:
+        return "(none)"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def preset_diff(args) -> int:
+    try:
+        with BlobReader(args.repo) as reader:
+            sides = [read_revision(reader, args.repo, rev) for rev in (args.rev_a, args.rev_b)]
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    jobs = [(blobs, texts, args.cache_dir, not args.no_cache) for blobs, texts in sides]
+    if sides[0][0] == sides[1][0]:
+        loaded = [load_model(jobs[0])] * 2
+    else:
+        with ProcessPoolExecutor(max_workers=2) as pool:
+            loaded = list(pool.map(load_model, jobs))
+    (a, _), (b, _) = loaded
+    for rev, model in zip((args.rev_a, args.rev_b), (a, b)):
+        if model["error"]:
+            print(f"warning: preset tables at {rev} could not be parsed: {model['error']}", file=sys.stderr)
+
+    sections = {
+        "presets": diff_cells(a["presets"], b["presets"]),
+        "options": diff_cells(a["options"], b["options"]),
+        "providers": diff_providers(a["providers"], b["providers"]),
+    }
+    changed = any(sections.values())
+
+    if args.json:
+        print(json.dumps({
+            "a": args.rev_a,
+            "b": args.rev_b,
+            "cached": [cached for _, cached in loaded],
+            "presets": [{"name": n, "a": old, "b": new} for n, old, new in sections["presets"]],
+            "options": [{"name": n, "a": old, "b": new} for n, old, new in sections["options"]],
+            "providers": [{"name": n, "change": change} for n, change in sections["providers"]],
+        }, indent=2))
+        return 1 if changed else 0
+
+    if not changed:
+        print(f"No preset changes between {args.rev_a} and {args.rev_b}.")
+        return 0
+    titles = {"presets": "Preset values", "options": "ModOption defaults", "providers": "Providers"}
+    for key, rows in sections.items():
+        if not rows:
+            continue
+        print(f"=== {titles[key]} ({len(rows)} changed) ===")
+        if key == "providers":
+            for name, change in rows:
+                print(f"  {name}: {change}")
+        else:
+            width = max(len(name) for name, _, _ in rows)
+            for name, old, new in rows:
+                print(f"  {name:<{width}}  {format_cell(old)} -> {format_cell(new)}")
+        print()
+    return 1
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="csm-tools", description="CSM maintenance tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    diff = commands.add_parser("preset-diff", help="Changed preset cells between two revisions")
+    diff.add_argument("rev_a", help="Base revision")
+    diff.add_argument("rev_b", nargs="?", default=WORKTREE, help=f"Revision to compare (default {WORKTREE})")
+    diff.add_argument("--repo", type=Path, default=ROOT, help="Repository root")
+    diff.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Parsed snapshot cache")
+    diff.add_argument("--no-cache", action="store_true", help="Re-parse both sides and do not write the cache")
+    diff.add_argument("--json", action="store_true", help="Print the changes as JSON")
+    diff.set_defaults(func=preset_diff)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
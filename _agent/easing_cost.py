@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""Real-time and game-time cost of a slow-mo, including its easing transitions.
+
+The curve is taken from CSMManager.cs: StartSlowMotion eases from 1.0 to the target
+over `duration * TransitionRampPercent` with EaseInOut, holds the target until the end
+time, and EndSlowMotion eases back over the same length (also part of the global
+cooldown). UpdateTransition jumps to the target once TransitionTimeoutSeconds have
+elapsed, and ApplyTimeScale clamps every value.
+
+The EaseInOut cases are parsed from the source and sampled on a fixed grid, so the
+integral covers every trigger x intensity x duration x transition at once:
+
+    realSeconds     duration + ease-out (wall clock from start to time scale 1.0)
+    gameSeconds     integral of timeScale over realSeconds
+    lostSeconds     realSeconds - gameSeconds
+    easingLost      share of lostSeconds spent in the two transitions
+    occupancy       realSeconds / (realSeconds + cooldown), the busy share of one
+                    trigger's shortest repeat cycle
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+
+import numpy as np
+
+from cs_source import CSM_MANAGER, extract_method_block, read_source
+from preset_model import AXES, PresetModel
+
+DEFAULT_SAMPLES = 513
+# NumPy 2.0 renamed np.trapz to np.trapezoid and deprecated the old name; 1.x only has trapz.
+trapezoid = getattr(np, "trapezoid", None) or np.trapz
+SAFE_EXPR_RE = re.compile(r"[x0-9.+\-*/() ]+")
+
+
+class EasingSpec:
+    """EaseInOut curves, transition timeout and time-scale clamp parsed from CSMManager.cs."""
+
+    def __init__(self, manager_text: str):
+        body = extract_method_block(manager_text, r"private\s+float\s+EaseInOut\s*\(")
+        self.curves = {}
+        for name, expr in re.findall(r"case\s+[\w.]*EasingCurve\.(\w+)\s*:\s*return\s+([^;]+);", body):
+            self.curves[name] = self._compile(expr)
+        default = re.search(r"default\s*:\s*//\s*(\w+)\s*return\s+([^;]+);", body)
+        if default:
+            self.curves.setdefault(default.group(1), self._compile(default.group(2)))
+        if not self.curves:
+            raise ValueError("No EaseInOut cases found in CSMManager.cs")
+
+        timeout = re.search(r"TransitionTimeoutSeconds\s*=\s*([0-9.]+)f?", manager_text)
+        self.timeout = float(timeout.group(1)) if timeout else float("inf")
+        clamp = re.search(
+            r"void\s+ApplyTimeScale\s*\([^)]*\)\s*\{[^}]*?Mathf\.Clamp\(\s*\w+\s*,\s*([0-9.]+)f?\s*,\s*([0-9.]+)f?\s*\)",
+            manager_text,
+        )
+        self.scale_min, self.scale_max = (float(clamp.group(1)), float(clamp.group(2))) if clamp else (0.005, 1.0)
+
+    @staticmethod
+    def _compile(expr: str):
+        expr = re.sub(r"(\d)f\b", r"\1", expr.strip())
+        if not SAFE_EXPR_RE.fullmatch(expr):
+            raise ValueError(f"Unsupported EaseInOut expression: {expr}")
+        code = compile(expr, "<EaseInOut>", "eval")
+        return lambda x: np.broadcast_to(eval(code, {"__builtins__": {}}, {"x": x}), np.shape(x))
+
+    @classmethod
+    def from_sources(cls) -> "EasingSpec":
+        return cls(read_source(CSM_MANAGER))
+
+
+def _ramp_integral(spec: EasingSpec, curve, start, end, length, u):
+    """Integral of lerp(start, end, curve(t / length)) over t in [0, length], vectorised."""
+    t = length[..., None] * u
+    eased = np.where(t > spec.timeout, 1.0, curve(u))
+    scale = np.clip(start[..., None] + (end - start)[..., None] * eased, spec.scale_min, spec.scale_max)
+    return trapezoid(scale, t, axis=-1)
+
+
+def compute(model: PresetModel, spec: EasingSpec, samples: int = DEFAULT_SAMPLES):
+    """Cost fields broadcast to the full preset tensor shape (same axes as `model.tensor()`)."""
+    u = np.linspace(0.0, 1.0, samples)
+    scale = model.timescale_ti[:, :, None, None]  # trigger, intensity, duration, transition
+    duration = model.duration_td[:, None, :, None]
+    ramp = model.ramp_x[None, None, None, :]
+    shape = np.broadcast_shapes(scale.shape, duration.shape, ramp.shape)
+    scale, duration, ramp = (np.broadcast_to(a, shape) for a in (scale, duration, ramp))
+    easing = duration * ramp
+    ones = np.ones(shape)
+
+    ease_in = np.zeros(shape)
+    ease_out = np.zeros(shape)
+    for x, name in enumerate(model.transitions):
+        curve = spec.curves.get(name)
+        if curve is None or not np.any(easing[..., x] > 0.0):
+            continue
+        ease_in[..., x] = _ramp_integral(spec, curve, ones[..., x], scale[..., x], easing[..., x], u)
+        ease_out[..., x] = _ramp_integral(spec, curve, scale[..., x], ones[..., x], easing[..., x], u)
+
+    real = duration + easing
+    game = ease_in + (duration - easing) * scale + ease_out
+    lost = real - game
+    hold_lost = (duration - easing) * (1.0 - scale)
+    easing_lost = np.clip(np.divide(lost - hold_lost, lost, out=np.zeros(shape), where=lost > 1e-9), 0.0, 1.0)
+
+    full = model.shape
+    cooldown = model.cooldown_tk[:, None, :, None, None]  # trigger, cooldown, duration, transition
+    busy = real[:, :1, :, :][:, :, None, :, :]  # busy time does not depend on intensity
+    occupancy = busy / np.maximum(busy + cooldown, 1e-9)
+
+    def expand(array, axes):
+        dims = [slice(None) if axis in axes else None for axis in AXES]
+        return np.broadcast_to(array[tuple(dims)], full)
+
+    core = ("trigger", "intensity", "duration", "transition")
+    return {
+        "realSeconds": expand(real, core),
+        "gameSeconds": expand(game, core),
+        "lostSeconds": expand(lost, core),
+        "easingLost": expand(easing_lost, core),
+        "occupancy": expand(occupancy[:, 0], ("trigger", "cooldown", "duration", "transition")),
+    }
+
+
+def select(model: PresetModel, costs, field: str, **labels):
+    """Slice one cost field by axis labels, like `PresetModel.select`."""
+    key = tuple(model.index(axis, labels[axis]) if axis in labels else slice(None) for axis in AXES)
+    return costs[field][key]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real/game-time cost of slow-mo presets including easing")
+    for axis in ("trigger", "intensity", "cooldown", "duration", "transition"):
+        parser.add_argument(f"--{axis}", default="all", help=f"{axis.capitalize()} label(s), comma-separated or 'all'")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="Samples per transition")
+    parser.add_argument("--json", action="store_true", help="Print rows as JSON")
+    args = parser.parse_args()
+
+    try:
+        model = PresetModel.from_sources()
+        spec = EasingSpec.from_sources()
+        picks = {}
+        for axis in ("trigger", "intensity", "cooldown", "duration", "transition"):
+            wanted = getattr(args, axis)
+            labels = model.axes[axis] if wanted == "all" else [label.strip() for label in wanted.split(",")]
+            for label in labels:
+                model.index(axis, label)
+            picks[axis] = labels
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    costs = compute(model, spec, max(3, args.samples))
+    rows = []
+    for trigger in picks["trigger"]:
+        for intensity in picks["intensity"]:
+            for duration in picks["duration"]:
+                for transition in picks["transition"]:
+                    labels = {"trigger": trigger, "intensity": intensity, "duration": duration, "transition": transition}
+                    values = {field: float(select(model, costs, field, **labels)[0, 0, 0]) for field in
+                              ("realSeconds", "gameSeconds", "lostSeconds", "easingLost")}
+                    occupancy = {
+                        cooldown: float(select(model, costs, "occupancy", cooldown=cooldown, **labels)[0, 0])
+                        for cooldown in picks["cooldown"]
+                    }
+                    rows.append(dict(labels, **values, occupancy=occupancy))
+
+    if args.json:
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    curves = ", ".join(spec.curves)
+    print(f"=== Slow-mo time cost (curves: {curves}; ramp {model.ramp_percent * 100:.0f}%; timeout {spec.timeout:g}s) ===")
+    header = (
+        f"{'trigger':<14} {'intensity':<10} {'duration':<10} {'transition':<11} "
+        f"{'real s':>7} {'game s':>7} {'lost s':>7} {'easing':>7}  occupancy by cooldown"
+    )
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        occupancy = " ".join(f"{name}={value * 100:.0f}%" for name, value in row["occupancy"].items())
+        print(
+            f"{row['trigger']:<14} {row['intensity']:<10} {row['duration']:<10} {row['transition']:<11} "
+            f"{row['realSeconds']:>7.2f} {row['gameSeconds']:>7.2f} {row['lostSeconds']:>7.2f} "
+            f"{row['easingLost'] * 100:>6.1f}%  {occupancy}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+"""Generate synthetic Blade & Sorcery Player.log files for scale-testing the log tools.
+
+Output interleaves Unity engine noise, exception/stack-trace blocks, mod debug
+lines and `diag evt=` telemetry in the exact field order CSMTelemetry writes.
+Lines are streamed to disk in batches, so generating a multi-GB log needs only
+a few MB of memory.
+"""
+
+import argparse
+import random
+import re
+import sys
+from collections import Counter
+
+from player_log_report import MODS
+
+SUMMARY_INTERVAL_SEC = 30
+WRITE_BATCH_LINES = 8192
+SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?i?b?)\s*$", re.IGNORECASE)
+SIZE_UNITS = {"": 1, "k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+
+TRIGGER_TYPES = ("BasicKill", "LastEnemy", "Dismemberment", "Critical", "Parry", "Decapitation", "LastStand")
+TRIGGER_WEIGHTS = (50, 6, 10, 12, 14, 7, 1)
+BLOCK_REASONS = ("GlobalCooldown", "TriggerCooldown", "AlreadyActive", "ChanceFailed", "TriggerDisabled", "EasingOut")
+BLOCK_WEIGHTS = (30, 25, 15, 40, 5, 4)
+KILL_SKIPS = ("not_player_kill", "deflect_non_player", "parry_non_player")
+ERROR_CONTEXTS = ("on_creature_kill_exception", "on_creature_hit_exception", "trigger_slow_exception")
+DAMAGE_TYPES = ("Pierce", "Slash", "Blunt", "Energy")
+PRESETS = {
+    "preset": ("Subtle", "Default", "Dramatic", "Cinematic", "Epic"),
+    "chancePreset": ("Off", "VeryRare", "Rare", "Default", "Frequent"),
+    "cooldownPreset": ("Off", "Short", "Default", "Long", "Extended"),
+    "durationPreset": ("VeryShort", "Short", "Default", "Long", "Extended"),
+}
+
+UNITY_FILENAME = "(Filename: C:\\buildslave\\unity\\build\\Runtime/Export/Debug/Debug.bindings.h Line: 35)"
+UNITY_NOISE = (
+    "Unloading {n} unused Assets to reduce memory usage. Loaded Objects now: {big}.",
+    "Total: {ms}.{frac} ms (FindLiveObjects: 1.{frac} ms CreateObjectMapping: 0.{frac} ms MarkObjects: {ms}.{frac} ms"
+    "  DeleteObjects: 0.{frac} ms)",
+    "[ThunderRoad] Spawning creature {creature} at wave step {n}",
+    "[ThunderRoad] Load scene {level} ({ms} ms)",
+    "[Addressables] Loaded {n} locations for catalog {level}",
+    "[Steamworks.NET] SteamAPI_RunCallbacks: {n} callbacks processed",
+    "WaveSpawner: wave {n} complete ({creature})",
+    "Physics: overlap query returned {n} colliders",
+    "The referenced script (Unknown) on this Behaviour is missing!",
+    "Material doesn't have a texture property '_MainTex'",
+)
+UNITY_EXCEPTIONS = (
+    "NullReferenceException: Object reference not set to an instance of an object",
+    "ArgumentOutOfRangeException: Index was out of range. Must be non-negative and less than the size of the collection.",
+    "InvalidOperationException: Collection was modified; enumeration operation may not execute.",
+)
+STACK_FRAMES = (
+    "  at ThunderRoad.Creature.UpdateRagdoll () [0x0003a] in <{h}>:0 ",
+    "  at ThunderRoad.RagdollPart.OnCollisionEnter (UnityEngine.Collision collision) [0x00102] in <{h}>:0 ",
+    "  at ThunderRoad.Item.OnGrab (ThunderRoad.Handle handle) [0x00015] in <{h}>:0 ",
+    "  at ThunderRoad.EventManager.InvokeCreatureKill (ThunderRoad.Creature creature) [0x00040] in <{h}>:0 ",
+    "  at ThunderRoad.WaveSpawner.Update () [0x0001c] in <{h}>:0 ",
+)
+CREATURES = ("HumanMale", "HumanFemale", "Gladiator", "Rogue", "Mage", "Archer")
+LEVELS = ("Arena", "Canyon", "Citadel", "Ruins", "Home", "Outpost")
+
+
+def parse_size(text: str) -> int:
+    match = SIZE_RE.match(text)
+    if not match:
+        raise argparse.ArgumentTypeError(f"invalid size '{text}' (examples: 500000, 64MB, 2.5GiB)")
+    number, unit = match.groups()
+    return int(float(number) * SIZE_UNITS[unit[:1].lower()])
+
+
+def format_top(counter: Counter) -> str:
+    """Mirror CSMTelemetry.FormatTop: up to six `key:count` pairs by count, `|`-joined."""
+    if not counter:
+        return "none"
+    pairs = sorted(counter.items(), key=lambda item: item[1], reverse=True)[:6]
+    return "|".join(f"{key}:{count}" for key, count in pairs)
+
+
+def trigger_family(trigger: str) -> str:
+    if trigger == "Parry":
+        return "parry"
+    if trigger == "LastStand":
+        return "survival"
+    return "kill"
+
+
+class CsmStats:
+    """One telemetry interval (or session total) in CSMTelemetry's field order."""
+
+    INT_FIELDS = (
+        "killEval", "killPlayer", "parry", "parryPlayer", "deflect", "deflectPlayer", "lastStand",
+        "triggerTry", "triggerOk",
+    )
+    TAIL_INT_FIELDS = (
+        "quickTests", "slowStart", "slowEnd", "slowCancel", "frameDrop", "severeDrop",
+    )
+    DEFERRED_FIELDS = ("deferredQueued", "deferredExecuted", "deferredDropped", "deferredExpired")
+    TOP_FIELDS = (
+        "topKillSkips", "topTriggerBlocks", "topTriggerBlocksByType", "topTriggerBlocksByFamily",
+        "topTriggerOk", "topDeferred", "topErrors",
+    )
+
+    def __init__(self):
+        self.counts = Counter()
+        self.worst_drop_ms = 0.0
+        self.tops = {name: Counter() for name in self.TOP_FIELDS}
+
+    def add(self, other: "CsmStats"):
+        self.counts.update(other.counts)
+        self.worst_drop_ms = max(self.worst_drop_ms, other.worst_drop_ms)
+        for name, counter in other.tops.items():
+            self.tops[name].update(counter)
+
+    def is_empty(self) -> bool:
+        counts = self.counts
+        return not any(counts[key] for key in ("killEval", "parry", "deflect", "triggerTry", "slowStart", "frameDrop"))
+
+    def trigger_rate(self) -> float:
+        attempts = self.counts["triggerTry"]
+        return self.counts["triggerOk"] * 100.0 / attempts if attempts else 0.0
+
+    def fields(self) -> str:
+        counts = self.counts
+        parts = [f"{key}={counts[key]}" for key in self.INT_FIELDS]
+        parts.append(f"triggerRate={self.trigger_rate():.1f}%")
+        parts.extend(f"{key}={counts[key]}" for key in self.TAIL_INT_FIELDS)
+        parts.append(f"worstDropMs={self.worst_drop_ms:.1f}")
+        parts.extend(f"{key}={counts[key]}" for key in self.DEFERRED_FIELDS)
+        parts.append(f"errors={counts['errors']}")
+        parts.extend(f"{name}={format_top(self.tops[name])}" for name in self.TOP_FIELDS)
+        return " ".join(parts)
+
+
+class LogGenerator:
+    def __init__(self, rng: random.Random, mods, noise_per_interval: int, exception_rate: float):
+        self.rng = rng
+        self.mods = mods
+        self.noise_per_interval = noise_per_interval
+        self.exception_rate = exception_rate
+        self.assembly_hash = "%032x" % rng.getrandbits(128)
+
+    def run_id(self) -> str:
+        return "%08x" % self.rng.getrandbits(32)
+
+    def noise(self, out):
+        rng = self.rng
+        template = rng.choice(UNITY_NOISE)
+        out.append(
+            template.format(
+                n=rng.randint(1, 400),
+                big=rng.randint(20000, 400000),
+                ms=rng.randint(1, 90),
+                frac=rng.randint(100000, 999999),
+                creature=rng.choice(CREATURES),
+                level=rng.choice(LEVELS),
+            )
+        )
+        out.append("")
+        out.append(UNITY_FILENAME)
+        out.append("")
+
+    def exception(self, out):
+        rng = self.rng
+        out.append(rng.choice(UNITY_EXCEPTIONS))
+        for frame in rng.sample(STACK_FRAMES, rng.randint(2, len(STACK_FRAMES))):
+            out.append(frame.format(h=self.assembly_hash))
+        out.append("")
+
+    def debug_line(self, out, line: str):
+        out.append(line)
+        out.append("")
+        out.append(UNITY_FILENAME)
+        out.append("")
+
+    def csm_interval(self, out) -> CsmStats:
+        """Simulate one 30s interval of CSM activity, writing its debug lines."""
+        rng = self.rng
+        stats = CsmStats()
+        counts = stats.counts
+        kills = rng.randint(0, 14)
+        player_kills = sum(rng.random() < 0.85 for _ in range(kills))
+        parries = rng.randint(0, 5)
+        player_parries = sum(rng.random() < 0.7 for _ in range(parries))
+        deflects = rng.randint(0, 3)
+        player_deflects = sum(rng.random() < 0.6 for _ in range(deflects))
+        counts.update(
+            killEval=kills, killPlayer=player_kills, parry=parries, parryPlayer=player_parries,
+            deflect=deflects, deflectPlayer=player_deflects,
+        )
+        if kills > player_kills:
+            stats.tops["topKillSkips"]["not_player_kill"] += kills - player_kills
+        if parries > player_parries:
+            stats.tops["topKillSkips"]["parry_non_player"] += parries - player_parries
+        if deflects > player_deflects:
+            stats.tops["topKillSkips"]["deflect_non_player"] += deflects - player_deflects
+
+        for _ in range(player_kills):
+            damage = rng.choice(DAMAGE_TYPES)
+            self.debug_line(out, f"[CSM] CreatureKill event: {rng.choice(CREATURES)}")
+            self.debug_line(out, f"[CSM] Kill damage: type={damage} intensity={rng.random():.2f}")
+        attempts = player_kills + player_parries + player_deflects
+        if rng.random() < 0.02:
+            counts["lastStand"] += 1
+            attempts += 1
+            self.debug_line(out, "[CSM] Last Stand triggered!")
+
+        for _ in range(attempts):
+            trigger = rng.choices(TRIGGER_TYPES, TRIGGER_WEIGHTS)[0]
+            counts["triggerTry"] += 1
+            if rng.random() < 0.35:
+                counts["triggerOk"] += 1
+                counts["slowStart"] += 1
+                stats.tops["topTriggerOk"][trigger] += 1
+                if rng.random() < 0.05:
+                    counts["slowCancel"] += 1
+                else:
+                    counts["slowEnd"] += 1
+                self.debug_line(out, f"[CSM] {trigger} detected")
+            else:
+                reason = rng.choices(BLOCK_REASONS, BLOCK_WEIGHTS)[0]
+                stats.tops["topTriggerBlocks"][reason] += 1
+                stats.tops["topTriggerBlocksByType"][f"{trigger}_{reason}"] += 1
+                stats.tops["topTriggerBlocksByFamily"][f"{trigger_family(trigger)}_{reason}"] += 1
+
+        if counts["slowStart"]:
+            drops = rng.randint(0, 4 * counts["slowStart"])
+            severe = sum(rng.random() < 0.2 for _ in range(drops))
+            counts.update(frameDrop=drops, severeDrop=severe)
+            if drops:
+                stats.worst_drop_ms = round(rng.uniform(22.0, 60.0 if not severe else 180.0), 1)
+
+        if rng.random() < self.exception_rate:
+            context = rng.choice(ERROR_CONTEXTS)
+            counts["errors"] += 1
+            stats.tops["topErrors"][context] += 1
+            self.debug_line(out, f"[CSM] Error in {context.replace('_exception', '')}: simulated exception")
+        return stats
+
+    def other_mod_interval(self, out, mod: str, run: str, totals: Counter):
+        rng = self.rng
+        ticks = rng.randint(0, 200)
+        applied = rng.randint(0, ticks)
+        interval = Counter(ticks=ticks, applied=applied, skipped=ticks - applied, errors=0)
+        totals.update(interval)
+        if ticks:
+            out.append(
+                f"[{mod}] diag evt=summary run={run} intervalSec={SUMMARY_INTERVAL_SEC} ticks={ticks} "
+                f"applied={applied} skipped={ticks - applied} errors=0"
+            )
+
+    def other_mod_close(self, out, mod: str, run: str, totals: Counter, uptime: float, summaries: int):
+        ticks = totals["ticks"] or 1
+        apply_rate = totals["applied"] * 100.0 / ticks
+        out.append(
+            f"[{mod}] diag evt=session_totals run={run} uptimeSec={uptime:.1f} summaryCount={summaries} "
+            f"ticks={totals['ticks']} applied={totals['applied']} skipped={totals['skipped']} errors={totals['errors']}"
+        )
+        out.append(
+            f"[{mod}] diag evt=session_kpi run={run} applyRate={apply_rate:.1f}% skipRate={100.0 - apply_rate:.1f}% "
+            f"peakActive={self.rng.randint(1, 40)} errors={totals['errors']}"
+        )
+        out.append(f"[{mod}] diag evt=session_end run={run} uptimeSec={uptime:.1f} summaryCount={summaries}")
+
+    def session(self, intervals: int):
+        """Yield batches of lines for one game session (one run per enabled mod)."""
+        rng = self.rng
+        runs = {mod: self.run_id() for mod in self.mods}
+        out = []
+        if "CSM" in runs:
+            settings = " ".join(f"{key}={rng.choice(values)}" for key, values in PRESETS.items())
+            out.append(
+                f"[CSM] diag evt=session_start run={runs['CSM']} {settings} deferredQueue=off sessionDiagnostics=True"
+            )
+        for mod, run in runs.items():
+            if mod != "CSM":
+                out.append(f"[{mod}] diag evt=session_start run={run}")
+
+        csm_totals = CsmStats()
+        other_totals = {mod: Counter() for mod in runs if mod != "CSM"}
+        summaries = Counter()
+        for step in range(intervals):
+            for _ in range(rng.randint(0, 2 * self.noise_per_interval)):
+                self.noise(out)
+            if rng.random() < self.exception_rate:
+                self.exception(out)
+
+            if "CSM" in runs:
+                stats = self.csm_interval(out)
+                csm_totals.add(stats)
+                # The final interval is always flushed, like EmitSummary(force: true) on shutdown.
+                if not stats.is_empty() or step == intervals - 1:
+                    summaries["CSM"] += 1
+                    out.append(
+                        f"[CSM] diag evt=summary run={runs['CSM']} intervalSec={SUMMARY_INTERVAL_SEC} {stats.fields()}"
+                    )
+            for mod, totals in other_totals.items():
+                before = totals["ticks"]
+                self.other_mod_interval(out, mod, runs[mod], totals)
+                if totals["ticks"] != before:
+                    summaries[mod] += 1
+
+            if len(out) >= WRITE_BATCH_LINES:
+                yield out
+                out = []
+
+        uptime = intervals * SUMMARY_INTERVAL_SEC + rng.uniform(0.0, SUMMARY_INTERVAL_SEC)
+        if "CSM" in runs:
+            run = runs["CSM"]
+            counts = csm_totals.counts
+            attempts = counts["triggerTry"]
+            block_rate = (attempts - counts["triggerOk"]) * 100.0 / attempts if attempts else 0.0
+            drops = counts["frameDrop"]
+            severe_rate = counts["severeDrop"] * 100.0 / drops if drops else 0.0
+            out.append(
+                f"[CSM] diag evt=session_totals run={run} uptimeSec={uptime:.1f} summaryCount={summaries['CSM']} "
+                f"{csm_totals.fields()}"
+            )
+            out.append(
+                f"[CSM] diag evt=session_kpi run={run} triggerRate={csm_totals.trigger_rate():.1f}% "
+                f"blockRate={block_rate:.1f}% frameDrop={drops} severeDropRate={severe_rate:.1f}% "
+                f"errors={counts['errors']}"
+            )
+            out.append(f"[CSM] diag evt=session_end run={run} uptimeSec={uptime:.1f} summaryCount={summaries['CSM']}")
+            out.append("[CSM] CSM deactivated")
+        for mod, totals in other_totals.items():
+            self.other_mod_close(out, mod, runs[mod], totals, uptime, summaries[mod])
+        yield out
+
+
+def generate(path: str, target_bytes: int, seed: int, mods, min_runs: int, intervals, noise: int, exception_rate: float):
+    """Write sessions to `path` until it reaches `target_bytes` and `min_runs` sessions."""
+    rng = random.Random(seed)
+    generator = LogGenerator(rng, mods, noise, exception_rate)
+    written = 0
+    sessions = 0
+    with open(path, "w", encoding="utf-8", newline="\n", buffering=1 << 20) as handle:
+        header = [
+            "Mono path[0] = 'BladeAndSorcery_Data/Managed'",
+            "Initialize engine version: 2021.3.38f1 (synthetic)",
+            "",
+        ]
+        text = "\n".join(header) + "\n"
+        handle.write(text)
+        written += len(text.encode("utf-8"))
+        while written < target_bytes or sessions < min_runs:
+            for batch in generator.session(rng.randint(*intervals)):
+                text = "\n".join(batch) + "\n"
+                handle.write(text)
+                written += len(text.encode("utf-8"))
+            sessions += 1
+    return {"bytes": written, "sessions": sessions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Player.log with realistic diag telemetry")
+    parser.add_argument("output", help="Path of the Player.log to write")
+    parser.add_argument("--size", type=parse_size, default=parse_size("64MB"), help="Target size, e.g. 64MB, 20GB")
+    parser.add_argument("--seed", type=int, default=1968, help="Random seed (same seed + args = same file)")
+    parser.add_argument("--min-runs", type=int, default=1, help="Minimum number of game sessions to write")
+    parser.add_argument("--intervals", type=int, nargs=2, default=(20, 240), metavar=("MIN", "MAX"),
+                        help="Summary intervals (30s each) per session")
+    parser.add_argument("--noise", type=int, default=12, help="Average Unity noise lines per interval")
+    parser.add_argument("--exception-rate", type=float, default=0.02, help="Chance of an exception per interval")
+    parser.add_argument("--mods", default=",".join(MODS), help="Comma-separated mods to emit (default: all)")
+    args = parser.parse_args()
+
+    mods = [mod.strip().upper() for mod in args.mods.split(",") if mod.strip()]
+    unknown = [mod for mod in mods if mod not in MODS]
+    if unknown or not mods:
+        print(f"error: unknown mod(s): {', '.join(unknown) or 'none given'} (known: {', '.join(MODS)})", file=sys.stderr)
+        return 2
+    low, high = args.intervals
+    if low < 1 or high < low:
+        print("error: --intervals needs 1 <= MIN <= MAX", file=sys.stderr)
+        return 2
+
+    try:
+        stats = generate(args.output, args.size, args.seed, mods, args.min_runs, (low, high), args.noise,
+                         args.exception_rate)
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(f"Wrote {args.output} bytes={stats['bytes']} sessions={stats['sessions']} seed={args.seed}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Generate the golden preset/multiplier vectors that CSM.Tests checks the C# code against.
+
+Two CSV files are written to CSM.Tests/TestData:
+
+    preset_vectors.csv      trigger x intensity x chance x cooldown x duration preset ->
+                            chance, timeScale, duration, cooldown (every combination, so
+                            the tests also prove each axis only moves its own value);
+                            chance/cooldown/duration hold the ModOption values the
+                            *PresetSetting fields store ("Very Rare", "Off"), intensity
+                            the Preset enum name the test passes to Enum.Parse
+    multiplier_vectors.csv  preset timeScale x damage/intensity/DOT/thrown multipliers ->
+                            combined multiplier and Mathf.Clamp(timeScale / combined, 0.01, 1)
+
+Expected values come from PresetModel (parsed from CSMManager.cs / CSMModOptions.cs) and
+are computed as whole arrays in float32, the precision the mod uses. `--check` rebuilds
+the files in memory and exits 1 when the committed copies are stale.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+from pathlib import Path
+
+import numpy as np
+
+from cs_source import CSM_OPTIONS, ROOT, parse_preset_options, read_source
+from preset_model import PresetModel
+
+OUTPUT_DIR = ROOT / "CSM.Tests" / "TestData"
+PRESET_FILE = "preset_vectors.csv"
+MULTIPLIER_FILE = "multiplier_vectors.csv"
+HEADER_NOTE = "# Generated by _agent/gen_test_vectors.py from the C# sources. Do not edit by hand."
+
+EFFECTIVE_MIN = 0.01
+EFFECTIVE_MAX = 1.0
+
+# Multiplier grid: low/high ends of DamageMultiplierProvider and IntensityMaxProvider,
+# enough to reach both clamp bounds from every preset timeScale.
+DAMAGE_MULTS = (0.1, 0.5, 1.0, 2.0)
+INTENSITY_SCALING = ((False, 1.5, 0.0), (True, 1.5, 0.5), (True, 2.0, 1.0))  # enabled, max, intensity
+DOT_MULTS = (1.0, 0.1)
+THROWN_MULTS = (1.0, 2.0)
+# CSV column -> preset enum whose ModOption value the test assigns to the *PresetSetting field.
+SETTING_ENUMS = {"chance": "ChancePreset", "cooldown": "CooldownPreset", "duration": "DurationPreset"}
+
+
+def fmt(value) -> str:
+    return f"{float(value):.6g}"
+
+
+def preset_rows(model: PresetModel, option_values):
+    """Every preset combination per trigger, built from broadcast slices of the tensor."""
+    tensor = model.tensor()
+    axes = ("trigger", "intensity", "chance", "cooldown", "duration")
+    # Transition and profile do not change these values; pin them to their first label.
+    fields = {name: tensor[name][..., 0, 0] for name in ("chance", "timeScale", "duration", "cooldown")}
+    labels = []
+    for axis in axes:
+        if axis in SETTING_ENUMS:
+            values = option_values.get(SETTING_ENUMS[axis], {})
+            missing = [name for name in model.axes[axis] if name not in values]
+            if missing:
+                raise ValueError(f"No PresetOption<{SETTING_ENUMS[axis]}> value for {', '.join(missing)}")
+            labels.append([values[name] for name in model.axes[axis]])
+        else:
+            labels.append(model.axes[axis])
+    grid = np.indices([len(axis) for axis in labels]).reshape(len(axes), -1).T
+    values = {name: array.astype(np.float32).reshape(-1) for name, array in fields.items()}
+    rows = []
+    for flat, index in enumerate(grid):
+        rows.append(
+            [labels[a][i] for a, i in enumerate(index)]
+            + [fmt(values[name][flat]) for name in ("chance", "timeScale", "duration", "cooldown")]
+        )
+    return ["trigger", "intensity", "chance", "cooldown", "duration",
+            "expChance", "expTimeScale", "expDuration", "expCooldown"], rows
+
+
+def multiplier_rows(model: PresetModel):
+    """Every distinct preset timeScale against the multiplier grid, computed in float32."""
+    scales = np.unique(model.timescale_ti.astype(np.float32))
+    scaling = np.array(INTENSITY_SCALING, dtype=object)
+    s, d, k, o, w = np.meshgrid(
+        scales,
+        np.array(DAMAGE_MULTS, dtype=np.float32),
+        np.arange(len(INTENSITY_SCALING)),
+        np.array(DOT_MULTS, dtype=np.float32),
+        np.array(THROWN_MULTS, dtype=np.float32),
+        indexing="ij",
+    )
+    s, d, k, o, w = (a.reshape(-1) for a in (s, d, k, o, w))
+    enabled = scaling[k, 0].astype(bool)
+    scale_max = scaling[k, 1].astype(np.float32)
+    intensity = scaling[k, 2].astype(np.float32)
+
+    # GetIntensityMultiplier: Mathf.Lerp(1, max, Clamp01(intensity)) when enabled.
+    intensity_mult = np.where(enabled, 1.0 + (scale_max - 1.0) * np.clip(intensity, 0.0, 1.0), 1.0).astype(np.float32)
+    # TriggerSlow: damageType * intensity * dot * thrown, evaluated left to right.
+    combined = (((d * intensity_mult).astype(np.float32) * o).astype(np.float32) * w).astype(np.float32)
+    expected = np.where(
+        combined == np.float32(1.0),
+        s,
+        np.clip((s / combined).astype(np.float32), EFFECTIVE_MIN, EFFECTIVE_MAX),
+    ).astype(np.float32)
+
+    rows = [
+        [fmt(s[i]), fmt(d[i]), "true" if enabled[i] else "false", fmt(scale_max[i]), fmt(intensity[i]),
+         fmt(o[i]), fmt(w[i]), fmt(combined[i]), fmt(expected[i])]
+        for i in range(len(s))
+    ]
+    return ["timeScale", "damageMult", "scalingEnabled", "scalingMax", "intensity",
+            "dotMult", "thrownMult", "expCombined", "expTimeScale"], rows
+
+
+def render(header, rows) -> str:
+    out = io.StringIO()
+    out.write(HEADER_NOTE + "\n")
+    out.write(",".join(header) + "\n")
+    for row in rows:
+        out.write(",".join(row) + "\n")
+    return out.getvalue()
+
+
+def build(model: PresetModel, options_text: str):
+    return {
+        PRESET_FILE: render(*preset_rows(model, parse_preset_options(options_text))),
+        MULTIPLIER_FILE: render(*multiplier_rows(model)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate CSM.Tests golden vectors from the C# sources")
+    parser.add_argument("--output-dir", type=Path, default=OUTPUT_DIR, help="Where the CSV files go")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the files on disk are out of date")
+    args = parser.parse_args()
+
+    try:
+        files = build(PresetModel.from_sources(), read_source(CSM_OPTIONS))
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    stale = []
+    for name, text in files.items():
+        path = args.output_dir / name
+        current = path.read_text(encoding="utf-8") if path.exists() else None
+        if current == text:
+            continue
+        stale.append(name)
+        if not args.check:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(text, encoding="utf-8", newline="\n")
+
+    counts = ", ".join(f"{name}={text.count(chr(10)) - 2}" for name, text in files.items())
+    if args.check:
+        if stale:
+            print(f"Stale test vectors: {', '.join(stale)} (run gen_test_vectors.py)", file=sys.stderr)
+            return 1
+        print(f"Test vectors up to date ({counts})")
+        return 0
+    print(f"Wrote {args.output_dir} ({counts}; {len(stale)} changed)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""Find heap allocations reachable from per-frame entry points in the C# sources.
+
+Every compiled .cs file (the CSM.csproj globs, see cs_source.compiled_sources) is tokenized
+by cs_source.tokenize (comments, strings and preprocessor lines handled), split into
+methods, and turned into a call graph by method name (qualified calls such as `CSMTelemetry.Update(` are
+narrowed to that class). Starting from Update-style entry points (Update, LateUpdate,
+FixedUpdate, OnGUI and ThunderScript's Script*Update), every reachable allocation site is
+reported with an estimated number of executions per frame:
+
+    entry point                  1 per frame
+    loop body (for/foreach/...)  x --loop-factor (assumed iterations)
+    if/else/switch branch        x --branch-factor
+    code after `if (...) return` x --branch-factor (throttles such as _nextUpdateTime)
+    catch block                  x --rare-factor
+
+A call site passes its factor on to the callee; a method reached along several paths
+keeps the highest estimate. Allocation kinds:
+
+    new          `new T(...)`, arrays and initializers (value types declared as
+                 `struct` in the sources or in VALUE_TYPES are skipped)
+    concat       `+`/`+=` next to a string literal
+    interpolate  `$"..."`; holes that are not strings box value types
+    format       string.Format/Concat/Join, .ToString()
+    linq         LINQ operators in files that use System.Linq
+    closure      lambdas and anonymous delegates
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from cs_source import ROOT, Token, compiled_sources, tokenize
+
+ENTRY_NAMES = ("Update", "LateUpdate", "FixedUpdate", "OnGUI", "ScriptUpdate", "ScriptLateUpdate", "ScriptFixedUpdate")
+DEFAULT_LOOP_FACTOR = 8.0
+DEFAULT_BRANCH_FACTOR = 0.5
+DEFAULT_RARE_FACTOR = 0.01
+
+VALUE_TYPES = {
+    "Vector2", "Vector3", "Vector4", "Quaternion", "Color", "Color32", "Rect", "Bounds", "Ray",
+    "KeyValuePair", "TimeSpan", "DateTime", "Guid", "Nullable", "RaycastHit",
+    "int", "float", "double", "bool", "long", "short", "byte", "char", "decimal", "uint", "ulong",
+}
+LINQ_METHODS = {
+    "Where", "Select", "SelectMany", "OrderBy", "OrderByDescending", "ThenBy", "GroupBy", "ToList",
+    "ToArray", "ToDictionary", "Any", "All", "First", "FirstOrDefault", "Last", "LastOrDefault", "Count",
+    "Sum", "Min", "Max", "Average", "Distinct", "Concat", "Skip", "Take", "Cast", "OfType", "Aggregate",
+}
+TYPE_KEYWORDS = {"class", "struct", "interface", "enum", "namespace", "record"}
+CONTROL_LOOP = {"for", "foreach", "while"}
+CONTROL_BRANCH = {"if", "switch"}
+NOT_CALLS = {
+    "if", "for", "foreach", "while", "switch", "catch", "using", "lock", "fixed", "return", "new", "typeof",
+    "sizeof", "nameof", "default", "when", "await", "throw", "checked", "unchecked", "base", "this",
+}
+
+class Method:
+    __slots__ = ("cls", "name", "file", "line", "calls", "allocs", "logs")
+
+    def __init__(self, cls, name, file, line):
+        self.cls = cls
+        self.name = name
+        self.file = file
+        self.line = line
+        self.calls = []   # (name, qualifier, factor, line)
+        self.allocs = []  # (kind, detail, factor, line)
+        self.logs = []    # (name, line, factor, conditions, argument tokens) for Debug.Log*
+
+    def add_alloc(self, kind, detail, factor, line):
+        """One site per kind and line: `a + ":" + b` compiles to a single String.Concat."""
+        for index, (k, _, f, l) in enumerate(self.allocs):
+            if k == kind and l == line:
+                if factor > f:
+                    self.allocs[index] = (kind, detail, factor, line)
+                return
+        self.allocs.append((kind, detail, factor, line))
+
+    @property
+    def label(self):
+        return f"{self.cls}.{self.name}" if self.cls else self.name
+
+
+class Context:
+    __slots__ = ("kind", "factor", "tail", "returns", "virtual", "depth", "method", "name", "condition", "guards")
+
+    def __init__(self, kind, factor=1.0, virtual=False, depth=0, method=None, name=None, condition=None):
+        self.kind = kind          # "type", "method", "property", "block"
+        self.factor = factor
+        self.tail = 1.0           # reduced after a guarded early return
+        self.returns = False
+        self.condition = condition  # if-header tokens, ("catch",), or None
+        self.guards = []          # negated conditions of earlier `if (...) return;`
+        self.virtual = virtual    # brace-less statement body, ends at `;`
+        self.depth = depth
+        self.method = method
+        self.name = name
+
+
+def _match(tokens, i, open_text, close_text):
+    depth = 0
+    for j in range(i, len(tokens)):
+        if tokens[j].kind != "op":
+            continue
+        if tokens[j].text == open_text:
+            depth += 1
+        elif tokens[j].text == close_text:
+            depth -= 1
+            if depth == 0:
+                return j
+    return len(tokens) - 1
+
+
+def _hole_boxes(hole: str) -> bool:
+    text = hole.split(":")[0].strip()
+    return not (text.endswith(".ToString()") or text.startswith('"') or text.endswith(".Name") or text.endswith(".name"))
+
+
+class Analyzer:
+    def __init__(self, loop_factor, branch_factor, rare_factor):
+        self.loop_factor = loop_factor
+        self.branch_factor = branch_factor
+        self.rare_factor = rare_factor
+        self.methods: list[Method] = []
+        self.structs = set()
+
+    def parse(self, rel: str, src: str):
+        tokens = tokenize(src)
+        self.structs.update(tokens[i + 1].text for i, t in enumerate(tokens[:-1]) if t.text == "struct")
+        uses_linq = "using System.Linq" in src
+        stack: list[Context] = [Context("type")]
+        decl: list[Token] = []
+        pending = None        # factor for the body of the control header just closed
+        pending_condition = None
+        header_end = -1
+        paren_depth = 0
+        method_end_semicolon = None  # expression-bodied member
+
+        def current_method():
+            for ctx in reversed(stack):
+                if ctx.method:
+                    return ctx.method, ctx
+            return None, None
+
+        def factor():
+            value = 1.0
+            for ctx in reversed(stack):
+                value *= ctx.factor * ctx.tail
+                if ctx.method:
+                    break
+            return value
+
+        def conditions():
+            """Conditions that hold at the current token, innermost first."""
+            found = []
+            for ctx in reversed(stack):
+                found.extend(reversed(ctx.guards))
+                if ctx.condition is not None:
+                    found.append(ctx.condition)
+                if ctx.method:
+                    break
+            return tuple(found)
+
+        def pop():
+            ctx = stack.pop()
+            if ctx.returns and ctx.factor < 1.0 and stack:
+                stack[-1].tail *= self.branch_factor
+                if ctx.condition not in (None, ("catch",)):
+                    stack[-1].guards.append(("!", "(") + ctx.condition + (")",))
+            return ctx
+
+        def pop_virtuals():
+            while len(stack) > 1 and stack[-1].virtual and stack[-1].depth == len([c for c in stack if not c.virtual]):
+                pop()
+
+        i = 0
+        while i < len(tokens):
+            tok = tokens[i]
+            text = tok.text
+            method, method_ctx = current_method()
+            top = stack[-1]
+
+            if method is None:
+                # Type level: collect declarations until a body starts.
+                if text == "{" and tok.kind == "op":
+                    kind, name = self._classify(decl, top)
+                    if kind == "method":
+                        m = Method(self._type_name(stack), name, rel, decl[0].line if decl else tok.line)
+                        self.methods.append(m)
+                        stack.append(Context("method", method=m))
+                    else:
+                        stack.append(Context(kind, name=name))
+                    decl = []
+                elif text == "=>" and tok.kind == "op" and decl:
+                    kind, name = self._classify(decl, top, expression=True)
+                    if kind == "method":
+                        m = Method(self._type_name(stack), name, rel, decl[0].line)
+                        self.methods.append(m)
+                        stack.append(Context("method", method=m))
+                        method_end_semicolon = len(stack)
+                    decl = []
+                elif text == "}" and tok.kind == "op":
+                    if len(stack) > 1:
+                        pop()
+                    decl = []
+                elif text in (";", "]") and tok.kind == "op":
+                    decl = []
+                else:
+                    decl.append(tok)
+                i += 1
+                continue
+
+            # Inside a method body.
+            if pending is not None and i > header_end:
+                if text == "{":
+                    stack.append(Context("block", factor=pending, condition=pending_condition))
+                    pending = pending_condition = None
+                    i += 1
+                    continue
+                stack.append(Context("block", factor=pending, virtual=True, condition=pending_condition,
+                                     depth=len([c for c in stack if not c.virtual])))
+                pending = pending_condition = None
+
+            if tok.kind == "op":
+                if text == "(":
+                    paren_depth += 1
+                elif text == ")":
+                    paren_depth = max(0, paren_depth - 1)
+                elif text == "{":
+                    stack.append(Context("block"))
+                elif text == "}":
+                    while stack[-1].virtual:
+                        pop()
+                    ctx = pop()
+                    if ctx.method:
+                        paren_depth = 0
+                    pop_virtuals()
+                elif text == ";" and paren_depth == 0:
+                    if method_end_semicolon is not None and len(stack) == method_end_semicolon:
+                        pop()
+                        method_end_semicolon = None
+                    else:
+                        pop_virtuals()
+                elif text == "=>":
+                    method.add_alloc("closure", "lambda (allocates when it captures)", factor(), tok.line)
+                elif text in ("+", "+=") and self._next_to_string(tokens, i):
+                    method.add_alloc("concat", "string " + text, factor(), tok.line)
+                i += 1
+                continue
+
+            if tok.kind == "string":
+                if tok.holes is not None:
+                    boxed = sum(1 for hole in tok.holes if _hole_boxes(hole))
+                    detail = f"$\"...\" {len(tok.holes)} holes" + (f", {boxed} may box" if boxed else "")
+                    method.add_alloc("interpolate", detail, factor(), tok.line)
+                i += 1
+                continue
+
+            if tok.kind != "ident":
+                i += 1
+                continue
+
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+            prev = tokens[i - 1] if i else None
+            if text in CONTROL_LOOP or text in CONTROL_BRANCH or text == "catch":
+                if nxt is not None and nxt.text == "(":
+                    header_end = _match(tokens, i + 1, "(", ")")
+                    pending = (self.loop_factor if text in CONTROL_LOOP else
+                               self.rare_factor if text == "catch" else self.branch_factor)
+                    pending_condition = (tuple(t.text for t in tokens[i + 2:header_end]) if text == "if" else
+                                         ("catch",) if text == "catch" else None)
+                    if text == "while" and prev is not None and prev.text == "}" and self._closes_do(tokens, i):
+                        pending = None  # do { } while (...);
+                elif text == "catch":
+                    header_end = i
+                    pending = self.rare_factor
+                    pending_condition = ("catch",)
+            elif text == "else":
+                if nxt is None or nxt.text != "if":
+                    header_end = i
+                    pending = self.branch_factor
+                    pending_condition = None
+            elif text == "do":
+                header_end = i
+                pending = self.loop_factor
+                pending_condition = None
+            elif text == "return" or text == "continue" or text == "break":
+                for ctx in reversed(stack):
+                    if ctx.method:
+                        break
+                    if ctx.factor < 1.0:
+                        ctx.returns = text == "return"
+                        break
+            elif text == "new":
+                detail = self._new_detail(tokens, i)
+                if detail:
+                    method.add_alloc("new", detail, factor(), tok.line)
+            elif text == "delegate" and nxt is not None and nxt.text in ("(", "{"):
+                method.add_alloc("closure", "anonymous delegate", factor(), tok.line)
+            elif nxt is not None and nxt.text == "(" and text not in NOT_CALLS:
+                qualifier = tokens[i - 2].text if prev is not None and prev.text in (".", "?.") and i >= 2 else None
+                if prev is not None and prev.text == "new":
+                    pass
+                elif qualifier == "string" and text in ("Format", "Concat", "Join"):
+                    method.add_alloc("format", f"string.{text}", factor(), tok.line)
+                elif text == "ToString" and prev is not None and prev.text in (".", "?."):
+                    method.add_alloc("format", ".ToString()", factor(), tok.line)
+                elif uses_linq and text in LINQ_METHODS and prev is not None and prev.text in (".", "?."):
+                    method.add_alloc("linq", f".{text}()", factor(), tok.line)
+                else:
+                    method.calls.append((text, qualifier, factor(), tok.line))
+                    if qualifier == "Debug" and text.startswith("Log"):
+                        end = _match(tokens, i + 1, "(", ")")
+                        method.logs.append((text, tok.line, factor(), conditions(), tokens[i + 2:end]))
+            i += 1
+
+    @staticmethod
+    def _closes_do(tokens, i):
+        depth = 0
+        for j in range(i - 1, -1, -1):
+            if tokens[j].text == "}":
+                depth += 1
+            elif tokens[j].text == "{":
+                depth -= 1
+                if depth == 0:
+                    return j > 0 and tokens[j - 1].text == "do"
+        return False
+
+    @staticmethod
+    def _type_name(stack):
+        names = [ctx.name for ctx in stack if ctx.kind == "type" and ctx.name]
+        return names[-1] if names else ""
+
+    @staticmethod
+    def _classify(decl, top, expression=False):
+        texts = [t.text for t in decl]
+        first_paren = texts.index("(") if "(" in texts else len(texts)
+        keyword = next((t for t in texts[:first_paren] if t in TYPE_KEYWORDS), None)
+        if keyword:
+            after = texts[texts.index(keyword) + 1:]
+            return "type", (after[0] if after and keyword != "namespace" else None)
+        if top.kind == "property" and texts and texts[-1] in ("get", "set", "add", "remove"):
+            return "method", f"{top.name}.{texts[-1]}"
+        if "(" in texts and first_paren > 0 and decl[first_paren - 1].kind == "ident":
+            return "method", texts[first_paren - 1]
+        if expression and texts and decl[-1].kind == "ident":
+            return "method", f"{texts[-1]}.get"
+        name = next((t.text for t in reversed(decl) if t.kind == "ident"), None)
+        return "property", name
+
+    @staticmethod
+    def _next_to_string(tokens, i):
+        before = tokens[i - 1] if i else None
+        after = tokens[i + 1] if i + 1 < len(tokens) else None
+        return (before is not None and before.kind == "string") or (after is not None and after.kind == "string")
+
+    def _new_detail(self, tokens, i):
+        j = i + 1
+        if j >= len(tokens):
+            return None
+        if tokens[j].text in ("[", "{"):
+            return "new " + ("anonymous array" if tokens[j].text == "[" else "anonymous object")
+        if tokens[j].text == "(":
+            return "new() (target-typed)"
+        parts = []
+        while j < len(tokens) and (tokens[j].kind == "ident" or tokens[j].text == "."):
+            parts.append(tokens[j].text)
+            j += 1
+        type_name = "".join(parts)
+        base = parts[-1] if parts else ""
+        is_array = j < len(tokens) and tokens[j].text == "["
+        if j < len(tokens) and tokens[j].text == "<":
+            end = _match(tokens, j, "<", ">")
+            type_name += "<" + "".join(t.text for t in tokens[j + 1:end]).replace(",", ", ") + ">"
+            is_array = end + 1 < len(tokens) and tokens[end + 1].text == "["
+        if not is_array and (base in VALUE_TYPES or base in self.structs):
+            return None
+        return f"new {type_name}" + ("[]" if is_array else "")
+
+    def reach(self, entries):
+        """{method: (frequency, caller)} for every method reachable from `entries`."""
+        by_name = {}
+        for method in self.methods:
+            by_name.setdefault(method.name, []).append(method)
+        classes = {method.cls for method in self.methods}
+
+        best = {method: (1.0, None) for method in entries}
+        work = list(entries)
+        rounds = 0
+        while work and rounds < 50 * max(1, len(self.methods)):
+            rounds += 1
+            caller = work.pop()
+            caller_freq = best[caller][0]
+            for name, qualifier, site_factor, _ in caller.calls:
+                candidates = by_name.get(name, [])
+                if qualifier in classes:
+                    candidates = [m for m in candidates if m.cls == qualifier]
+                elif qualifier in (None, "this", "Instance"):
+                    same = [m for m in candidates if m.cls == caller.cls]
+                    candidates = same or candidates
+                for callee in candidates:
+                    freq = caller_freq * site_factor
+                    if freq > best.get(callee, (0.0, None))[0] * 1.000001:
+                        best[callee] = (freq, caller)
+                        work.append(callee)
+        return best
+
+
+def path_to(best, method):
+    names = []
+    seen = set()
+    while method is not None and method not in seen:
+        seen.add(method)
+        names.append(method.label)
+        method = best[method][1]
+    return " <- ".join(names)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Allocation sites reachable per frame in the CSM C# sources")
+    parser.add_argument("--root", type=Path, default=ROOT, help="Repository root")
+    parser.add_argument("--entry", action="append", default=[], metavar="[CLASS.]METHOD",
+                        help=f"Extra entry point (default: methods named {', '.join(ENTRY_NAMES)})")
+    parser.add_argument("--loop-factor", type=float, default=DEFAULT_LOOP_FACTOR, help="Assumed loop iterations")
+    parser.add_argument("--branch-factor", type=float, default=DEFAULT_BRANCH_FACTOR, help="Share of frames a branch runs")
+    parser.add_argument("--rare-factor", type=float, default=DEFAULT_RARE_FACTOR, help="Share of frames a catch block runs")
+    parser.add_argument("--min-frequency", type=float, default=0.0, help="Hide sites below this many per frame")
+    parser.add_argument("--top", type=int, default=40, help="Sites to print (0 = all)")
+    parser.add_argument("--json", action="store_true", help="Print all sites as JSON")
+    args = parser.parse_args()
+
+    analyzer = Analyzer(args.loop_factor, args.branch_factor, args.rare_factor)
+    try:
+        for rel in compiled_sources(args.root):
+            analyzer.parse(rel, (args.root / rel).read_text(encoding="utf-8-sig"))
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    entries = [m for m in analyzer.methods if m.name in ENTRY_NAMES]
+    for spec in args.entry:
+        cls, _, name = spec.rpartition(".")
+        found = [m for m in analyzer.methods if m.name == name and (not cls or m.cls == cls)]
+        if not found:
+            print(f"error: no method {spec}", file=sys.stderr)
+            return 2
+        entries.extend(found)
+
+    best = analyzer.reach(entries)
+    sites = []
+    for method, (freq, _) in best.items():
+        for kind, detail, site_factor, line in method.allocs:
+            estimate = freq * site_factor
+            if estimate >= args.min_frequency:
+                sites.append({
+                    "perFrame": round(estimate, 6),
+                    "kind": kind,
+                    "detail": detail,
+                    "location": f"{method.file}:{line}",
+                    "method": method.label,
+                    "path": path_to(best, method),
+                })
+    sites.sort(key=lambda s: (-s["perFrame"], s["location"]))
+
+    if args.json:
+        print(json.dumps({
+            "entries": [m.label for m in entries],
+            "methods": len(analyzer.methods),
+            "reachable": len(best),
+            "sites": sites,
+        }, indent=2))
+        return 0
+
+    print(
+        f"=== Per-frame allocation sites: {len(analyzer.methods)} methods, {len(best)} reachable from "
+        f"{', '.join(sorted({m.label for m in entries}))} ==="
+    )
+    shown = sites if args.top == 0 else sites[:args.top]
+    header = f"{'per frame':>9}  {'kind':<11} {'location':<34} {'method':<36} detail"
+    print(header)
+    print("-" * len(header))
+    for site in shown:
+        print(f"{site['perFrame']:>9.3g}  {site['kind']:<11} {site['location']:<34} {site['method']:<36} {site['detail']}")
+    if len(shown) < len(sites):
+        print(f"... {len(sites) - len(shown)} more (use --top 0)")
+    by_kind = {}
+    for site in sites:
+        by_kind[site["kind"]] = by_kind.get(site["kind"], 0.0) + site["perFrame"]
+    print()
+    print("Estimated allocations per frame by kind: " + ", ".join(
+        f"{kind}={value:.3g}" for kind, value in sorted(by_kind.items(), key=lambda kv: -kv[1])))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
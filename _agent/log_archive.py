@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""Compact archives of the mod-tagged lines from Blade & Sorcery Player.log.
+
+Only lines carrying a `[DOT]`/`[CSM]`/`[EIP]`/`[IDM]` tag are kept: structured
+`diag evt=` lines are stored pre-parsed with interned mod/event/key names, and
+the remaining tagged debug lines are stored verbatim. Every record keeps its
+original line number and the signal flags used by the report, so reports built
+from an archive match reports built from the original log.
+
+Layout (little-endian):
+    MAGIC
+    block*    BLOCK_HEADER(payload_bytes, record_count, first_line) + zlib(JSON records)
+    trailer   zlib(JSON {"strings": [...], "lines": n, "source": {...}})
+    FOOTER    (trailer_offset, trailer_bytes) + END_MAGIC
+
+A JSON sidecar (`<archive>.idx`) lists every block's offset, line range and the
+runs it contains per mod, so readers can seek straight to the blocks they need:
+latest_starts() decodes blocks backwards only until every mod's last session_start is
+found (--latest), and context_block_filter() picks the blocks around a run or line
+(--show-context).
+"""
+
+import argparse
+import json
+import lzma
+import os
+import struct
+import sys
+import zipfile
+import zlib
+from collections import defaultdict
+
+from player_log_report import (
+    DIAG_RE,
+    apply_signal_flags,
+    line_flags,
+    make_event,
+    new_signal_counts,
+    open_log_text,
+    parse_diag_fields,
+)
+
+MAGIC = b"CSMLOG\x01\n"
+END_MAGIC = b"CSMLEND\n"
+BLOCK_HEADER = struct.Struct("<III")
+FOOTER = struct.Struct("<QI8s")
+BLOCK_RECORDS = 4096
+INDEX_SUFFIX = ".idx"
+INDEX_VERSION = 1
+
+RECORD_TEXT = 0
+RECORD_DIAG = 1
+
+
+class StringTable:
+    """Interns mod, event and key names so each is stored once per archive."""
+
+    def __init__(self, strings=None):
+        self.strings = list(strings or [])
+        self.ids = {value: idx for idx, value in enumerate(self.strings)}
+
+    def intern(self, value: str) -> int:
+        idx = self.ids.get(value)
+        if idx is None:
+            idx = len(self.strings)
+            self.strings.append(value)
+            self.ids[value] = idx
+        return idx
+
+
+def index_path(archive_path: str) -> str:
+    return archive_path + INDEX_SUFFIX
+
+
+def source_stamp(path: str):
+    stat = os.stat(path)
+    return {"path": os.path.abspath(path), "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def is_archive(path: str) -> bool:
+    try:
+        with open(path, "rb") as handle:
+            return handle.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def compact_log(log_path: str, out_path: str, block_records: int = BLOCK_RECORDS, member: str = None):
+    """Write the tagged lines of `log_path` to a compact archive plus sidecar index.
+
+    `log_path` may be plain text or any compressed input `open_log_text` accepts.
+    """
+    strings = StringTable()
+    blocks = []
+    pending = []
+    pending_runs = defaultdict(set)
+    total_lines = 0
+    kept = 0
+
+    with open_log_text(log_path, member) as src, open(out_path, "wb") as out:
+        out.write(MAGIC)
+
+        def flush():
+            payload = zlib.compress(json.dumps(pending, separators=(",", ":")).encode("utf-8"), 6)
+            offset = out.tell()
+            out.write(BLOCK_HEADER.pack(len(payload), len(pending), pending[0][1]))
+            out.write(payload)
+            blocks.append(
+                {
+                    "offset": offset,
+                    "records": len(pending),
+                    "first_line": pending[0][1],
+                    "last_line": pending[-1][1],
+                    "runs": {mod: sorted(runs) for mod, runs in pending_runs.items()},
+                }
+            )
+            pending.clear()
+            pending_runs.clear()
+
+        for line_number, raw_line in enumerate(src, start=1):
+            total_lines = line_number
+            line = raw_line.strip()
+            flags = line_flags(line)
+            if not flags:
+                continue
+
+            match = DIAG_RE.search(line)
+            if match:
+                mod, event, tail = match.groups()
+                record = [RECORD_DIAG, line_number, flags, strings.intern(mod), strings.intern(event)]
+                for key, value in parse_diag_fields(mod, event, tail).items():
+                    record.append(strings.intern(key))
+                    record.append(value)
+                    if key == "run":
+                        pending_runs[mod].add(value)
+            else:
+                record = [RECORD_TEXT, line_number, flags, line]
+
+            pending.append(record)
+            kept += 1
+            if len(pending) >= block_records:
+                flush()
+
+        if pending:
+            flush()
+
+        source = source_stamp(log_path)
+        trailer = zlib.compress(
+            json.dumps({"strings": strings.strings, "lines": total_lines, "source": source}).encode("utf-8"), 6
+        )
+        trailer_offset = out.tell()
+        out.write(trailer)
+        out.write(FOOTER.pack(trailer_offset, len(trailer), END_MAGIC))
+
+    index = {"version": INDEX_VERSION, "archive": source_stamp(out_path), "lines": total_lines, "blocks": blocks}
+    with open(index_path(out_path), "w", encoding="utf-8") as handle:
+        json.dump(index, handle, separators=(",", ":"))
+
+    return {"lines": total_lines, "records": kept, "blocks": len(blocks), "bytes": os.path.getsize(out_path)}
+
+
+def read_trailer(handle):
+    handle.seek(-FOOTER.size, os.SEEK_END)
+    trailer_offset, trailer_size, end_magic = FOOTER.unpack(handle.read(FOOTER.size))
+    if end_magic != END_MAGIC:
+        raise ValueError("archive is truncated (missing footer)")
+    handle.seek(trailer_offset)
+    trailer = json.loads(zlib.decompress(handle.read(trailer_size)))
+    return trailer_offset, trailer
+
+
+def read_index(archive_path: str):
+    """Return the sidecar index if it exists and still describes `archive_path` (same size and mtime)."""
+    try:
+        with open(index_path(archive_path), "r", encoding="utf-8") as handle:
+            index = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    stamp = index.get("archive", {})
+    current = source_stamp(archive_path)
+    if index.get("version") != INDEX_VERSION or any(stamp.get(key) != current[key] for key in ("size", "mtime")):
+        return None
+    return index
+
+
+def scan_block_offsets(handle, trailer_offset: int):
+    offset = len(MAGIC)
+    while offset < trailer_offset:
+        handle.seek(offset)
+        payload_size, _, _ = BLOCK_HEADER.unpack(handle.read(BLOCK_HEADER.size))
+        yield offset
+        offset += BLOCK_HEADER.size + payload_size
+
+
+def read_block(handle, offset: int):
+    """Decoded records of the block at `offset`."""
+    handle.seek(offset)
+    payload_size, _, _ = BLOCK_HEADER.unpack(handle.read(BLOCK_HEADER.size))
+    return json.loads(zlib.decompress(handle.read(payload_size)))
+
+
+def iter_records(archive_path: str, block_filter=None):
+    """Yield decoded records, optionally only from index blocks accepted by `block_filter`.
+
+    Without a current index every block is read and `block_filter` is ignored.
+    """
+    with open(archive_path, "rb") as handle:
+        if handle.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"not a compact log archive: {archive_path}")
+        trailer_offset, trailer = read_trailer(handle)
+        strings = trailer["strings"]
+
+        index = read_index(archive_path)
+        if index is not None:
+            offsets = [block["offset"] for block in index["blocks"] if block_filter is None or block_filter(block)]
+        else:
+            offsets = list(scan_block_offsets(handle, trailer_offset))
+
+        for offset in offsets:
+            for record in read_block(handle, offset):
+                yield record, strings
+
+
+def latest_starts(archive_path: str, mods):
+    """{mod: line} of each mod's last session_start, or None without a current index.
+
+    Blocks are decoded from the end, skipping those whose index entry lists no run of a
+    mod still being looked for, until every mod is found.
+    """
+    index = read_index(archive_path)
+    if index is None:
+        return None
+    pending = set(mods)
+    starts = {}
+    with open(archive_path, "rb") as handle:
+        _, trailer = read_trailer(handle)
+        strings = trailer["strings"]
+        for block in reversed(index["blocks"]):
+            if not pending:
+                break
+            if not pending & set(block["runs"]):
+                continue
+            for record in read_block(handle, block["offset"]):
+                if record[0] == RECORD_DIAG and strings[record[4]] == "session_start":
+                    mod = strings[record[3]]
+                    if mod in pending:
+                        starts[mod] = max(starts.get(mod, 0), record[1])
+            pending -= set(starts)
+    return starts
+
+
+def context_block_filter(archive_path: str, run: str = None, line: int = None, context: int = 0):
+    """Block filter for the blocks holding `run` (or `line`) plus enough neighbours for
+    `context` archived lines around them; None without a current index."""
+    index = read_index(archive_path)
+    if index is None:
+        return None
+    blocks = index["blocks"]
+    span = 1 + context // max(1, min((block["records"] for block in blocks), default=1))
+    hits = [
+        position for position, block in enumerate(blocks)
+        if (run is not None and any(run in runs for runs in block["runs"].values()))
+        or (line is not None and block["first_line"] <= line <= block["last_line"])
+    ]
+    offsets = {blocks[near]["offset"] for hit in hits
+               for near in range(max(0, hit - span), min(len(blocks), hit + span + 1))}
+    return lambda block: block["offset"] in offsets
+
+
+def load_archive(archive_path: str, block_filter=None, start_line: int = 1):
+    """Rebuild the report's `(events_by_mod, signal_counts)` from an archive, from `start_line` on."""
+    events_by_mod = defaultdict(list)
+    signal_counts = new_signal_counts()
+
+    for record, strings in iter_records(archive_path, block_filter):
+        if record[1] < start_line:
+            continue
+        apply_signal_flags(record[2], signal_counts)
+        if record[0] != RECORD_DIAG:
+            continue
+        mod = strings[record[3]]
+        event = strings[record[4]]
+        fields = {}
+        for pos in range(5, len(record), 2):
+            fields[strings[record[pos]]] = record[pos + 1]
+        raw = f"[{mod}] diag evt={event} " + " ".join(f"{key}={value}" for key, value in fields.items())
+        events_by_mod[mod].append(make_event(record[1], event, fields, raw))
+
+    return events_by_mod, signal_counts
+
+
+def iter_text_lines(archive_path: str, block_filter=None):
+    """Yield `(line_number, text)` for every archived line, rebuilding diag lines."""
+    for record, strings in iter_records(archive_path, block_filter):
+        if record[0] == RECORD_DIAG:
+            parts = [f"[{strings[record[3]]}] diag evt={strings[record[4]]}"]
+            parts.extend(f"{strings[record[pos]]}={record[pos + 1]}" for pos in range(5, len(record), 2))
+            yield record[1], " ".join(parts)
+        else:
+            yield record[1], record[3]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact Player.log diagnostics into a fast-loading archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    compact = sub.add_parser("compact", help="Extract tagged/diag lines from a Player.log into an archive")
+    compact.add_argument("log_path", help="Path to Player.log (plain, .gz/.bz2/.xz, or a zip bundle)")
+    compact.add_argument("--member", help="Log file to read inside a zip bundle (default: Player.log)")
+    compact.add_argument("-o", "--output", help="Archive path (default: <log_path>.csmlog)")
+    compact.add_argument("--block-records", type=int, default=BLOCK_RECORDS, help="Records per compressed block")
+
+    info = sub.add_parser("info", help="Describe an existing archive")
+    info.add_argument("archive_path", help="Path to a .csmlog archive")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "compact":
+            output = args.output or args.log_path + ".csmlog"
+            stats = compact_log(args.log_path, output, max(1, args.block_records), args.member)
+            source_size = os.path.getsize(args.log_path)
+            ratio = (source_size / stats["bytes"]) if stats["bytes"] else 0.0
+            print(
+                f"Wrote {output} lines={stats['lines']} records={stats['records']} "
+                f"blocks={stats['blocks']} bytes={stats['bytes']} ratio={ratio:.1f}x"
+            )
+            return 0
+
+        with open(args.archive_path, "rb") as handle:
+            if handle.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"not a compact log archive: {args.archive_path}")
+            _, trailer = read_trailer(handle)
+        index = read_index(args.archive_path)
+        source = trailer.get("source", {})
+        print(f"archive: {args.archive_path}")
+        print(f"  source: {source.get('path', 'n/a')} size={source.get('size', 'n/a')} lines={trailer.get('lines', 'n/a')}")
+        print(f"  strings: {len(trailer['strings'])}")
+        if index is None:
+            print("  index: missing or stale (blocks are scanned sequentially)")
+        else:
+            records = sum(block["records"] for block in index["blocks"])
+            print(f"  index: blocks={len(index['blocks'])} records={records}")
+        return 0
+    except (OSError, ValueError, EOFError, zlib.error, zipfile.BadZipFile, lzma.LZMAError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
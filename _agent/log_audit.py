@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""Audit Debug.Log* calls in the C# sources for unguarded argument construction.
+
+Static check over the source text only (no build, no game libraries), so it runs on any
+CI runner. Every compiled .cs file (the CSM.csproj globs; Patches/ is not compiled) is
+parsed with cs_source's tokenizer and hotpath_alloc's method splitter, and each Debug.Log,
+LogWarning, LogError and LogException call is classified on three axes:
+
+    guard    the enclosing if-conditions, including earlier `if (!Flag) return;`
+             statements, imply a logging flag (--guard; default DebugLogging,
+             DiagnosticsEnabled, SessionDiagnostics). `A && Flag` is guarded,
+             `A || Flag` is not.
+    cost     what building the argument does: constant (string literals only),
+             expression (passes an existing value), or concat / interpolate / format,
+             which allocate a new string on every call whether or not it is shown
+    context  per-frame   reachable from Update-style entry points (hotpath_alloc.ENTRY_NAMES)
+             per-event   reachable from a subscribed handler (`x += Handler;`,
+                         `new SomeEvent(this.Handler)`), e.g. EventHooks.OnCreatureHit
+             on-change   behind a change test on a remembered value, e.g.
+                         `bool changed = _lastX != X; if (!changed) return;` or
+                         `if (x != _lastX)`: runs once per change, however often the
+                         enclosing method runs
+             one-shot    everything else (init, level load, option changes)
+
+Unguarded calls are ranked by severity, then by estimated executions (per frame or per
+event, with hotpath_alloc's loop/branch/catch factors) weighted by context and cost:
+
+    high    builds a string in per-frame code
+    medium  builds a string in per-event code
+    low     constant or pass-through arguments, catch blocks, on-change and one-shot code
+
+--fail-on high|medium|low exits 1 when any call at or above that severity is found.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from cs_source import ROOT, compiled_sources, tokenize
+from hotpath_alloc import (
+    DEFAULT_BRANCH_FACTOR, DEFAULT_LOOP_FACTOR, DEFAULT_RARE_FACTOR, ENTRY_NAMES, Analyzer, path_to,
+)
+
+DEFAULT_GUARDS = ("DebugLogging", "DiagnosticsEnabled", "SessionDiagnostics")
+SEVERITIES = ("high", "medium", "low")
+CONTEXT_WEIGHT = {"per-frame": 1000.0, "per-event": 10.0, "on-change": 1.0, "one-shot": 1.0}
+BUILD_KINDS = {"concat", "interpolate", "format"}
+# Fields that remember the previous value for change detection (_lastDebugLogging, _prevState).
+REMEMBERED_RE = re.compile(r"^_*(?:[lL]ast|[pP]rev(?:ious)?)[A-Z0-9_]")
+
+
+def _split(tokens, op):
+    parts, current, depth = [], [], 0
+    for text in tokens:
+        depth += {"(": 1, ")": -1}.get(text, 0)
+        if text == op and depth == 0:
+            parts.append(current)
+            current = []
+        else:
+            current.append(text)
+    parts.append(current)
+    return parts
+
+
+def _strip(tokens):
+    while len(tokens) >= 2 and tokens[0] == "(" and tokens[-1] == ")":
+        depth = 0
+        for index, text in enumerate(tokens):
+            depth += {"(": 1, ")": -1}.get(text, 0)
+            if depth == 0 and index < len(tokens) - 1:
+                return tokens
+        tokens = tokens[1:-1]
+    return tokens
+
+
+def implied_guard(tokens, guards, negated=False):
+    """The guard flag a condition implies when it holds (or fails, if `negated`), else None."""
+    tokens = _strip(list(tokens))
+    if not tokens:
+        return None
+    for op, needs_all in (("||", not negated), ("&&", negated)):
+        parts = _split(tokens, op)
+        if len(parts) > 1:
+            found = [implied_guard(part, guards, negated) for part in parts]
+            if needs_all:
+                return found[0] if all(found) else None
+            return next((flag for flag in found if flag), None)
+    if tokens[0] == "!":
+        return implied_guard(tokens[1:], guards, not negated)
+    if not negated and tokens[-1] in guards and all(t == "." or t[:1].isalpha() or t[:1] == "_" for t in tokens):
+        return tokens[-1]
+    return None
+
+
+def _remembered(tokens, index):
+    """A remembered-value field of this object (`_lastX`, `this.lastX`), not a member of another value."""
+    if not REMEMBERED_RE.match(tokens[index]):
+        return False
+    return index == 0 or tokens[index - 1] not in (".", "?.") or (index >= 2 and tokens[index - 2] == "this")
+
+
+def _change_test(tokens, op="!="):
+    return (op in tokens and "||" not in tokens and "&&" not in tokens
+            and any(_remembered(tokens, index) for index in range(len(tokens))))
+
+
+def change_flags(tokens):
+    """Names of locals assigned a change test: `bool changed = _lastX != X;`."""
+    found = set()
+    for index in range(len(tokens) - 3):
+        if tokens[index].text == "bool" and tokens[index + 1].kind == "ident" and tokens[index + 2].text == "=":
+            end = index + 3
+            while end < len(tokens) and tokens[end].text != ";":
+                end += 1
+            if _change_test([t.text for t in tokens[index + 3:end]]):
+                found.add(tokens[index + 1].text)
+    return found
+
+
+def implies_change(tokens, flags):
+    """True when a condition only holds after a remembered value changed."""
+    if implied_guard(tokens, flags):
+        return True
+    tokens, negated = _strip(list(tokens)), False
+    while tokens and tokens[0] == "!":
+        tokens, negated = _strip(tokens[1:]), not negated
+    if negated:
+        return _change_test(tokens, "==")
+    return any(_change_test(part) for part in _split(tokens, "&&"))
+
+
+def argument_cost(tokens):
+    """Sorted allocation kinds of a call's argument list, or constant / expression."""
+    kinds = set()
+    has_string = any(t.kind == "string" for t in tokens)
+    for index, tok in enumerate(tokens):
+        prev = tokens[index - 1].text if index else ""
+        if tok.kind == "string" and tok.holes is not None:
+            kinds.add("interpolate")
+        elif tok.text in ("+", "+=") and has_string:
+            kinds.add("concat")
+        elif tok.text == "ToString" and prev in (".", "?."):
+            kinds.add("format")
+        elif tok.text in ("Format", "Concat", "Join") and prev == "." and index >= 2 and tokens[index - 2].text == "string":
+            kinds.add("format")
+    if kinds:
+        return "+".join(sorted(kinds))
+    if tokens and all(t.kind == "string" or t.text == "," for t in tokens):
+        return "constant"
+    return "expression"
+
+
+def method_groups(tokens, names):
+    """Method names passed as delegates: `+= Name;`, `+= this.Name;`, `new SomeEvent(this.Name)`."""
+    found = set()
+    for index, tok in enumerate(tokens):
+        if tok.kind != "ident" or tok.text not in names or index + 1 >= len(tokens):
+            continue
+        if tokens[index + 1].text not in (";", ")", ","):
+            continue
+        j = index - 1
+        if j >= 1 and tokens[j].text == "." and tokens[j - 1].text == "this":
+            j -= 2
+        if j < 0:
+            continue
+        if tokens[j].text in ("+=", "-="):
+            found.add(tok.text)
+        elif tokens[j].text == "(":
+            k = j - 1
+            while k >= 0 and (tokens[k].kind == "ident" or tokens[k].text == ".") and tokens[k].text != "new":
+                k -= 1
+            if k >= 0 and k < j - 1 and tokens[k].text == "new":
+                found.add(tok.text)
+    return found
+
+
+def audit(root: Path, guards, loop_factor, branch_factor, rare_factor, extra_entries=()):
+    """(calls, summary) for every Debug.Log* call in the compiled sources."""
+    analyzer = Analyzer(loop_factor, branch_factor, rare_factor)
+    handler_names = set()
+    flags = set()
+    sources = {}
+    for rel in compiled_sources(root):
+        sources[rel] = (root / rel).read_text(encoding="utf-8-sig")
+        analyzer.parse(rel, sources[rel])
+    names = {method.name for method in analyzer.methods}
+    for src in sources.values():
+        tokens = tokenize(src)
+        handler_names |= method_groups(tokens, names)
+        flags |= change_flags(tokens)
+
+    frame_entries = [m for m in analyzer.methods if m.name in ENTRY_NAMES or m.label in extra_entries]
+    event_entries = [m for m in analyzer.methods if m.name in handler_names and m not in frame_entries]
+    per_frame = analyzer.reach(frame_entries)
+    per_event = analyzer.reach(event_entries)
+
+    calls = []
+    for method in analyzer.methods:
+        if method in per_frame:
+            context, (freq, _), best = "per-frame", per_frame[method], per_frame
+        elif method in per_event:
+            context, (freq, _), best = "per-event", per_event[method], per_event
+        else:
+            context, freq, best = "one-shot", 1.0, None
+        for name, line, site_factor, conditions, arg_tokens in method.logs:
+            guard = next((flag for flag in (implied_guard(cond, guards) for cond in conditions) if flag), None)
+            cost = argument_cost(arg_tokens)
+            builds = bool(BUILD_KINDS & set(cost.split("+")))
+            error_path = ("catch",) in conditions
+            on_change = context != "one-shot" and any(implies_change(cond, flags) for cond in conditions)
+            call_context, call_freq = ("on-change", 1.0) if on_change else (context, freq)
+            if guard:
+                severity = "ok"
+            elif builds and not error_path and call_context == "per-frame":
+                severity = "high"
+            elif builds and not error_path and call_context == "per-event":
+                severity = "medium"
+            else:
+                severity = "low"
+            estimate = call_freq * site_factor
+            calls.append({
+                "severity": severity,
+                "priority": 0.0 if guard else round(CONTEXT_WEIGHT[call_context] * estimate * (4.0 if builds else 1.0), 6),
+                "call": f"Debug.{name}",
+                "guard": guard,
+                "cost": cost,
+                "context": call_context + (" (catch)" if error_path else ""),
+                "estimate": round(estimate, 6),
+                "location": f"{method.file}:{line}",
+                "method": method.label,
+                "path": path_to(best, method) if best else method.label,
+            })
+    rank = {severity: index for index, severity in enumerate(SEVERITIES + ("ok",))}
+    calls.sort(key=lambda c: (rank[c["severity"]], -c["priority"], c["location"]))
+
+    summary = {
+        "calls": len(calls),
+        "guarded": sum(1 for c in calls if c["guard"]),
+        "bySeverity": {severity: sum(1 for c in calls if c["severity"] == severity) for severity in SEVERITIES},
+        "frameEntries": sorted({m.label for m in frame_entries}),
+        "eventHandlers": sorted({m.label for m in event_entries}),
+    }
+    return calls, summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Find Debug.Log calls whose argument construction is not behind a debug flag")
+    parser.add_argument("--root", type=Path, default=ROOT, help="Repository root")
+    parser.add_argument("--guard", action="append", metavar="FLAG",
+                        help=f"Flag name that guards logging (repeatable; default {', '.join(DEFAULT_GUARDS)})")
+    parser.add_argument("--entry", action="append", default=[], metavar="CLASS.METHOD", help="Extra per-frame entry point")
+    parser.add_argument("--loop-factor", type=float, default=DEFAULT_LOOP_FACTOR, help="Assumed loop iterations")
+    parser.add_argument("--branch-factor", type=float, default=DEFAULT_BRANCH_FACTOR, help="Share of runs a branch takes")
+    parser.add_argument("--rare-factor", type=float, default=DEFAULT_RARE_FACTOR, help="Share of runs a catch block takes")
+    parser.add_argument("--all", action="store_true", help="Also list guarded calls")
+    parser.add_argument("--fail-on", choices=SEVERITIES, help="Exit 1 if any unguarded call has this severity or worse")
+    parser.add_argument("--json", action="store_true", help="Print every call as JSON")
+    args = parser.parse_args()
+
+    try:
+        calls, summary = audit(args.root.resolve(), set(args.guard or DEFAULT_GUARDS), args.loop_factor,
+                               args.branch_factor, args.rare_factor, set(args.entry))
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    failing = []
+    if args.fail_on:
+        limit = SEVERITIES.index(args.fail_on)
+        failing = [c for c in calls if c["severity"] in SEVERITIES[:limit + 1]]
+
+    if args.json:
+        print(json.dumps({"summary": summary, "calls": calls}, indent=2))
+    else:
+        counts = summary["bySeverity"]
+        print(
+            f"=== Debug.Log audit: {summary['calls']} calls, {summary['guarded']} guarded; unguarded "
+            f"high={counts['high']} medium={counts['medium']} low={counts['low']} ==="
+        )
+        print(f"per-frame entries: {', '.join(summary['frameEntries'])}")
+        print(f"event handlers:    {', '.join(summary['eventHandlers']) or '-'}")
+        shown = calls if args.all else [c for c in calls if c["severity"] != "ok"]
+        if shown:
+            header = f"{'severity':<8} {'context':<19} {'estimate':>8}  {'cost':<18} {'location':<34} method"
+            print()
+            print(header)
+            print("-" * len(header))
+            for c in shown:
+                status = c["severity"] if not c["guard"] else f"ok:{c['guard']}"
+                print(f"{status:<8} {c['context']:<19} {c['estimate']:>8.3g}  {c['cost']:<18} {c['location']:<34} {c['method']}")
+        if failing:
+            print(f"\nFAILED: {len(failing)} unguarded call(s) at severity {args.fail_on} or worse", file=sys.stderr)
+    return 1 if failing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Serve live diag metrics from one or more followed Player.log files (localhost only)."""
+
+import argparse
+import asyncio
+import html
+import json
+import os
+import sys
+import time
+from collections import deque
+
+from player_log_report import DIAG_RE, parse_diag_fields
+
+DEFAULT_PORT = 8765
+DEFAULT_WINDOW = 20  # summaries; CSMTelemetry emits one every 30s
+POLL_SECONDS = 1.0
+READ_LIMIT_BYTES = 4 << 20
+RATE_FIELDS = {"triggerRate", "blockRate", "severeDropRate"}
+MAX_FIELDS = {"worstDropMs"}
+
+
+def to_number(value: str):
+    text = value.rstrip("%")
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return None
+
+
+class RunMetrics:
+    """Rolling aggregates over the most recent summaries of one mod run."""
+
+    def __init__(self, mod: str, run: str, window: int):
+        self.mod = mod
+        self.run = run
+        self.summaries = deque(maxlen=window)
+        self.summary_count = 0
+        self.started_at = None
+        self.ended = False
+        self.last_kpi = {}
+        self.last_update = None
+
+    def add_summary(self, fields):
+        numbers = {}
+        for key, value in fields.items():
+            number = to_number(value)
+            if number is not None:
+                numbers[key] = number
+        self.summaries.append(numbers)
+        self.summary_count += 1
+        self.last_update = time.time()
+
+    def snapshot(self):
+        sums = {}
+        maxima = {}
+        for numbers in self.summaries:
+            for key, number in numbers.items():
+                if key in RATE_FIELDS:
+                    continue
+                if key in MAX_FIELDS:
+                    maxima[key] = max(maxima.get(key, number), number)
+                else:
+                    sums[key] = sums.get(key, 0) + number
+
+        window = dict(sums)
+        window.update(maxima)
+        attempts = sums.get("triggerTry", 0)
+        if attempts:
+            window["triggerRate"] = round(sums.get("triggerOk", 0) * 100.0 / attempts, 1)
+        drops = sums.get("frameDrop", 0)
+        if drops:
+            window["severeDropRate"] = round(sums.get("severeDrop", 0) * 100.0 / drops, 1)
+
+        return {
+            "mod": self.mod,
+            "run": self.run,
+            "ended": self.ended,
+            "summaryCount": self.summary_count,
+            "windowSummaries": len(self.summaries),
+            "window": window,
+            "latest": self.summaries[-1] if self.summaries else {},
+            "kpi": self.last_kpi,
+            "lastUpdate": self.last_update,
+        }
+
+
+class LogTail:
+    """Follows one Player.log, parsing newly appended diag lines incrementally."""
+
+    def __init__(self, path: str, window: int, from_end: bool):
+        self.path = path
+        self.window = window
+        self.offset = None if from_end else 0
+        self.partial = b""
+        self.runs = {}
+        self.current = {}
+        self.error = None
+        self.lines_seen = 0
+
+    def _read_new(self):
+        size = os.path.getsize(self.path)
+        if self.offset is None:
+            self.offset = size
+        if size < self.offset:
+            # Log was truncated/replaced by a new game session.
+            self.offset = 0
+            self.partial = b""
+        if size == self.offset:
+            return b""
+        with open(self.path, "rb") as handle:
+            handle.seek(self.offset)
+            data = handle.read(READ_LIMIT_BYTES)
+        self.offset += len(data)
+        return data
+
+    def feed(self, data: bytes):
+        data = self.partial + data
+        lines = data.split(b"\n")
+        self.partial = lines.pop()
+        for raw in lines:
+            self.lines_seen += 1
+            if b"diag" not in raw:
+                continue
+            match = DIAG_RE.search(raw.decode("utf-8", errors="replace"))
+            if not match:
+                continue
+            mod, event, tail = match.groups()
+            fields = parse_diag_fields(mod, event, tail)
+            run = fields.get("run", "none")
+            key = (mod, run)
+            metrics = self.runs.get(key)
+            if metrics is None:
+                metrics = self.runs[key] = RunMetrics(mod, run, self.window)
+            if event == "session_start":
+                metrics.started_at = time.time()
+                self.current[mod] = key
+            elif event == "summary":
+                metrics.add_summary(fields)
+                self.current.setdefault(mod, key)
+            elif event == "session_kpi":
+                metrics.last_kpi = fields
+            elif event == "session_end":
+                metrics.ended = True
+
+    async def follow(self, poll_seconds: float):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                # File I/O runs in the executor so a slow disk/share stalls only this log.
+                data = await loop.run_in_executor(None, self._read_new)
+                self.error = None
+                if data:
+                    self.feed(data)
+                    if len(data) >= READ_LIMIT_BYTES:
+                        continue
+            except OSError as exc:
+                self.error = str(exc)
+            await asyncio.sleep(poll_seconds)
+
+    def snapshot(self):
+        return {
+            "path": self.path,
+            "offset": self.offset or 0,
+            "linesSeen": self.lines_seen,
+            "error": self.error,
+            "current": {mod: self.runs[key].snapshot() for mod, key in self.current.items()},
+        }
+
+
+def render_html(snapshot, refresh_seconds: int) -> str:
+    rows = []
+    for log in snapshot["logs"]:
+        path = html.escape(log["path"])
+        if log["error"]:
+            rows.append(f"<tr><td>{path}</td><td colspan='8'>error: {html.escape(log['error'])}</td></tr>")
+        elif not log["current"]:
+            rows.append(f"<tr><td>{path}</td><td colspan='8'>waiting for diag evt=summary</td></tr>")
+        for mod, run in sorted(log["current"].items()):
+            window = run["window"]
+            rate = window.get("triggerRate", run["latest"].get("triggerRate"))
+            cells = [
+                path,
+                html.escape(mod),
+                html.escape(run["run"]) + (" (ended)" if run["ended"] else ""),
+                f"{run['summaryCount']} ({run['windowSummaries']} in window)",
+                "n/a" if rate is None else f"{rate}%",
+                str(window.get("frameDrop", "n/a")),
+                str(window.get("severeDrop", "n/a")),
+                str(window.get("worstDropMs", "n/a")),
+                str(window.get("errors", "n/a")),
+            ]
+            rows.append("<tr>" + "".join(f"<td>{cell}</td>" for cell in cells) + "</tr>")
+
+    return (
+        "<!doctype html><html><head><meta charset='utf-8'>"
+        f"<meta http-equiv='refresh' content='{refresh_seconds}'>"
+        "<title>Diag Dashboard</title>"
+        "<style>body{font-family:sans-serif}table{border-collapse:collapse}"
+        "td,th{border:1px solid #ccc;padding:4px 8px}th{background:#D9E2F3}</style>"
+        "</head><body><h1>Player.log Diagnostics (live)</h1>"
+        "<table><tr><th>Log</th><th>Mod</th><th>Run</th><th>Summaries</th><th>triggerRate</th>"
+        "<th>frameDrop</th><th>severeDrop</th><th>worstDropMs</th><th>errors</th></tr>"
+        + "".join(rows)
+        + "</table><p><a href='/metrics.json'>metrics.json</a></p></body></html>"
+    )
+
+
+class Dashboard:
+    def __init__(self, tails, refresh_seconds: int):
+        self.tails = tails
+        self.refresh_seconds = refresh_seconds
+
+    def snapshot(self):
+        return {"generatedAt": time.time(), "logs": [tail.snapshot() for tail in self.tails]}
+
+    async def handle(self, reader, writer):
+        try:
+            request = await asyncio.wait_for(reader.readline(), timeout=5)
+            while (await asyncio.wait_for(reader.readline(), timeout=5)) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request.decode("latin-1").split()
+            path = parts[1].split("?", 1)[0] if len(parts) >= 2 else "/"
+
+            if parts and parts[0] != "GET":
+                status, content_type, body = "405 Method Not Allowed", "text/plain", b"GET only\n"
+            elif path == "/metrics.json":
+                status, content_type = "200 OK", "application/json"
+                body = json.dumps(self.snapshot(), indent=2).encode("utf-8")
+            elif path in ("/", "/index.html"):
+                status, content_type = "200 OK", "text/html; charset=utf-8"
+                body = render_html(self.snapshot(), self.refresh_seconds).encode("utf-8")
+            else:
+                status, content_type, body = "404 Not Found", "text/plain", b"not found\n"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                "Cache-Control: no-store\r\nConnection: close\r\n\r\n".encode("latin-1")
+                + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(args):
+    tails = [LogTail(path, args.window, args.from_end) for path in args.log_paths]
+    dashboard = Dashboard(tails, args.refresh)
+    followers = [asyncio.create_task(tail.follow(args.poll)) for tail in tails]
+    server = await asyncio.start_server(dashboard.handle, "127.0.0.1", args.port)
+    print(f"Serving http://127.0.0.1:{args.port}/ for {len(tails)} log(s). Ctrl+C to stop.")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        for task in followers:
+            task.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Live dashboard for diag evt=summary lines in Player.log")
+    parser.add_argument("log_paths", nargs="+", help="Player.log path(s) to follow (one per game instance)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"Local port (default {DEFAULT_PORT})")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="Summaries per rolling window")
+    parser.add_argument("--poll", type=float, default=POLL_SECONDS, help="Seconds between file polls")
+    parser.add_argument("--refresh", type=int, default=5, help="HTML auto-refresh interval in seconds")
+    parser.add_argument("--from-end", action="store_true", help="Ignore existing content, only follow new lines")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""Byte-offset sidecar index for random access into a plain Player.log.
+
+`<log>.runidx` (JSON) records, for every run id and mod, the line number and byte offset
+of its session_start, each summary, session_totals, session_kpi and session_end line,
+plus a sparse table with the offset of every `line_step`-th line:
+
+    {"version", "lineStep", "source": {"size", "mtime"},
+     "indexed": {"bytes", "lines", "head", "tail"},
+     "lines": [[line, offset], ...],
+     "runs": {run: {mod: {"session_start": [line, offset], "summary": [[line, offset], ...],
+                          "session_totals": ..., "session_kpi": ..., "session_end": ...}}}}
+
+An index is current when the log's size and mtime match. Otherwise it is checked
+against the log: "head" is a SHA-1 of the first DIGEST_BYTES and "tail" of the
+DIGEST_BYTES before the indexed end. If both still match, the log only grew, and
+indexing resumes at the indexed end. If either differs (Unity rewrites Player.log
+on every launch), the index is rebuilt. Only complete lines (ending in a newline)
+are indexed.
+
+Compressed logs cannot be seeked and are rejected. Compact archives (log_archive.py)
+are rejected for build/runs; `show` reads them through log_archive instead, with
+context counted in archived (tagged) lines since untagged lines are not stored.
+
+    log_index.py build Player.log [--line-step N]
+    log_index.py runs Player.log
+    log_index.py show Player.log run=abcd1234|line=N [-C 2]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import zlib
+
+import log_archive
+from player_log_report import MODS, detect_compression
+
+INDEX_SUFFIX = ".runidx"
+INDEX_VERSION = 1
+DEFAULT_LINE_STEP = 4096
+DIGEST_BYTES = 4096
+DEFAULT_CONTEXT = 2
+INDEXED_EVENTS = ("session_start", "summary", "session_totals", "session_kpi", "session_end")
+REPEATED_EVENTS = {"summary"}
+DIAG_BYTES_RE = re.compile(rb"\[(DOT|CSM|EIP|IDM)\]\s+diag\s+evt=([a-z_]+)\s+run=(\S+)")
+DIAG_TEXT_RE = re.compile(DIAG_BYTES_RE.pattern.decode("ascii"))
+
+
+def index_path(log_path: str) -> str:
+    return log_path + INDEX_SUFFIX
+
+
+def source_stamp(path: str):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+def _digest(handle, start: int, end: int) -> str:
+    handle.seek(start)
+    return hashlib.sha1(handle.read(max(0, end - start))).hexdigest()
+
+
+def read_index(log_path: str):
+    try:
+        with open(index_path(log_path), "r", encoding="utf-8") as handle:
+            index = json.load(handle)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def index_state(index, log_path: str) -> str:
+    """"current", "grown" (indexed prefix unchanged) or "stale" for `index` against the log."""
+    if index is None:
+        return "stale"
+    stamp = source_stamp(log_path)
+    if index["source"] == stamp:
+        return "current"
+    indexed = index["indexed"]
+    if stamp["size"] < indexed["bytes"]:
+        return "stale"
+    with open(log_path, "rb") as handle:
+        if _digest(handle, 0, min(DIGEST_BYTES, indexed["bytes"])) != indexed["head"]:
+            return "stale"
+        if _digest(handle, max(0, indexed["bytes"] - DIGEST_BYTES), indexed["bytes"]) != indexed["tail"]:
+            return "stale"
+    return "grown"
+
+
+def _empty_index(line_step: int):
+    return {
+        "version": INDEX_VERSION,
+        "lineStep": line_step,
+        "source": {},
+        "indexed": {"bytes": 0, "lines": 0, "head": "", "tail": ""},
+        "lines": [[1, 0]],
+        "runs": {},
+    }
+
+
+def _scan(handle, index):
+    """Index complete lines from index["indexed"]["bytes"] onwards, in place."""
+    line_step = index["lineStep"]
+    offset = index["indexed"]["bytes"]
+    line = index["indexed"]["lines"]
+    table = index["lines"]
+    runs = index["runs"]
+    handle.seek(offset)
+    for raw in handle:
+        if not raw.endswith(b"\n"):
+            break  # the game is still writing this line
+        line += 1
+        if (line - 1) % line_step == 0 and line > table[-1][0]:
+            table.append([line, offset])
+        if b"diag" in raw:
+            match = DIAG_BYTES_RE.search(raw)
+            if match:
+                event = match.group(2).decode("ascii")
+                if event in INDEXED_EVENTS:
+                    mod = match.group(1).decode("ascii")
+                    run = match.group(3).decode("utf-8", errors="replace")
+                    entry = runs.setdefault(run, {}).setdefault(mod, {})
+                    if event in REPEATED_EVENTS:
+                        entry.setdefault(event, []).append([line, offset])
+                    else:
+                        entry[event] = [line, offset]
+        offset += len(raw)
+    index["indexed"]["bytes"] = offset
+    index["indexed"]["lines"] = line
+
+
+def update_index(log_path: str, line_step: int = DEFAULT_LINE_STEP, write: bool = True):
+    """(index, status) with status "current", "extended", "rebuilt" or "built"; writes the sidecar."""
+    if log_archive.is_archive(log_path):
+        raise ValueError(f"{log_path} is a compact archive; the byte-offset index is only supported for plain logs")
+    if detect_compression(log_path) is not None:
+        raise ValueError(f"{log_path} is compressed; only plain logs can be indexed for seeking")
+    existing = read_index(log_path)
+    state = index_state(existing, log_path)
+    if state == "current" and existing["lineStep"] == line_step:
+        return existing, "current"
+    if state == "grown" and existing["lineStep"] == line_step:
+        index, status = existing, "extended"
+    else:
+        index, status = _empty_index(line_step), "rebuilt" if existing else "built"
+
+    stamp = source_stamp(log_path)
+    with open(log_path, "rb") as handle:
+        _scan(handle, index)
+        end = index["indexed"]["bytes"]
+        index["indexed"]["head"] = _digest(handle, 0, min(DIGEST_BYTES, end))
+        index["indexed"]["tail"] = _digest(handle, max(0, end - DIGEST_BYTES), end)
+    index["source"] = stamp
+
+    if write:
+        path = index_path(log_path)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as handle:
+            json.dump(index, handle, separators=(",", ":"))
+        os.replace(tmp, path)
+    return index, status
+
+
+def seek_line(handle, index, line: int) -> int:
+    """Position `handle` at the start of `line` via the sparse table; returns the line reached."""
+    table = index["lines"]
+    lo, hi = 0, len(table) - 1
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if table[mid][0] <= line:
+            lo = mid
+        else:
+            hi = mid - 1
+    current, offset = table[lo]
+    handle.seek(offset)
+    while current < line:
+        if not handle.readline():
+            break
+        current += 1
+    return current
+
+
+def run_lines(index, run: str):
+    """Sorted line numbers of every indexed event of `run` (all mods)."""
+    lines = []
+    for entry in index["runs"].get(run, {}).values():
+        for event, value in entry.items():
+            if event in REPEATED_EVENTS:
+                lines.extend(item[0] for item in value)
+            else:
+                lines.append(value[0])
+    return sorted(lines)
+
+
+def latest_starts(index, mods=MODS):
+    """{mod: (line, offset, run)} of the last session_start per mod."""
+    latest = {}
+    for run, by_mod in index["runs"].items():
+        for mod, entry in by_mod.items():
+            start = entry.get("session_start")
+            if mod in mods and start and (mod not in latest or start[0] > latest[mod][0]):
+                latest[mod] = (start[0], start[1], run)
+    return latest
+
+
+def context_lines(log_path: str, index, targets, context: int = DEFAULT_CONTEXT):
+    """Yield (line number, text, is_target) for each target line with `context` lines around it."""
+    ranges = []
+    for target in sorted(set(targets)):
+        start, end = max(1, target - context), target + context
+        if ranges and start <= ranges[-1][1] + 1:
+            ranges[-1][1] = max(ranges[-1][1], end)
+        else:
+            ranges.append([start, end])
+    wanted = set(targets)
+    with open(log_path, "rb") as handle:
+        for start, end in ranges:
+            line = seek_line(handle, index, start)
+            while line <= end:
+                raw = handle.readline()
+                if not raw:
+                    return
+                yield line, raw.decode("utf-8", errors="replace").rstrip("\r\n"), line in wanted
+                line += 1
+
+
+def parse_target(spec: str, index):
+    """Target line numbers for `run=ID` or `line=N`."""
+    key, _, value = spec.partition("=")
+    if key == "line" and value.isdigit():
+        return [int(value)]
+    if key == "run" and value:
+        lines = run_lines(index, value)
+        if not lines:
+            raise ValueError(f"run {value} is not in the index")
+        return lines
+    raise ValueError(f"expected run=<id> or line=<number>, got '{spec}'")
+
+
+def archive_context_lines(archive_path: str, spec: str, context: int = DEFAULT_CONTEXT):
+    """Like context_lines for a compact archive; `context` counts archived lines around each target."""
+    key, _, value = spec.partition("=")
+    if not (key == "line" and value.isdigit()) and not (key == "run" and value):
+        raise ValueError(f"expected run=<id> or line=<number>, got '{spec}'")
+    block_filter = log_archive.context_block_filter(
+        archive_path, run=value if key == "run" else None, line=int(value) if key == "line" else None, context=context
+    )
+    rows = list(log_archive.iter_text_lines(archive_path, block_filter))
+    targets = []
+    for position, (line, text) in enumerate(rows):
+        if key == "line":
+            if line == int(value):
+                targets.append(position)
+        else:
+            match = DIAG_TEXT_RE.search(text)
+            if match and match.group(3) == value and match.group(2) in INDEXED_EVENTS:
+                targets.append(position)
+    if not targets:
+        what = f"line {value} (only tagged lines are archived)" if key == "line" else f"run {value}"
+        raise ValueError(f"{what} is not in the archive")
+    wanted = set(targets)
+    shown = sorted({p for t in targets for p in range(max(0, t - context), min(len(rows), t + context + 1))})
+    for position in shown:
+        line, text = rows[position]
+        yield line, text, position in wanted
+
+
+def _print_rows(rows) -> None:
+    previous = None
+    for line, text, is_target in rows:
+        if previous is not None and line != previous + 1:
+            print("--")
+        print(f"{line:>9}{':' if is_target else '-'} {text}")
+        previous = line
+
+
+def print_context(log_path: str, index, spec: str, context: int = DEFAULT_CONTEXT) -> None:
+    _print_rows(context_lines(log_path, index, parse_target(spec, index), context))
+
+
+def print_archive_context(archive_path: str, spec: str, context: int = DEFAULT_CONTEXT) -> None:
+    _print_rows(archive_context_lines(archive_path, spec, context))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Byte-offset index for seeking into a plain Player.log")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("build", help="Create or incrementally update <log>.runidx")
+    build.add_argument("log_path", help="Path to a plain Player.log")
+    build.add_argument("--line-step", type=int, default=DEFAULT_LINE_STEP, help="Lines between sparse table entries")
+
+    runs = sub.add_parser("runs", help="List indexed runs per mod")
+    runs.add_argument("log_path", help="Path to a plain Player.log")
+
+    show = sub.add_parser("show", help="Print a run's indexed events or a line, with context")
+    show.add_argument("log_path", help="Path to a plain Player.log")
+    show.add_argument("target", help="run=<id> or line=<number>")
+    show.add_argument("-C", "--context", type=int, default=DEFAULT_CONTEXT, help="Lines of context around each match")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "show" and log_archive.is_archive(args.log_path):
+            print_archive_context(args.log_path, args.target, max(0, args.context))
+            return 0
+        if args.command == "build":
+            line_step = max(1, args.line_step)
+        else:
+            line_step = (read_index(args.log_path) or {}).get("lineStep", DEFAULT_LINE_STEP)
+        index, status = update_index(args.log_path, line_step)
+        if args.command == "build":
+            print(
+                f"{status}: {index_path(args.log_path)} lines={index['indexed']['lines']} "
+                f"runs={len(index['runs'])} offsets={len(index['lines'])}"
+            )
+        elif args.command == "runs":
+            for run, by_mod in index["runs"].items():
+                for mod, entry in by_mod.items():
+                    start = entry.get("session_start", [None])[0]
+                    end = entry.get("session_end", [None])[0]
+                    print(f"{mod:<4} run={run} start_line={start or '-'} end_line={end or '-'} "
+                          f"summaries={len(entry.get('summary', []))}")
+        else:
+            print_context(args.log_path, index, args.target, max(0, args.context))
+        return 0
+    except (OSError, ValueError, zlib.error) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""Sweep the damage/intensity/DOT/thrown multiplier grid against every preset timeScale.
+
+TriggerSlow computes
+
+    combined  = damageType * intensity * DOT * thrown
+    timeScale = Mathf.Clamp(timeScale / combined, 0.01, 1)   (when combined != 1)
+
+Damage type, DOT and thrown multipliers come from DamageMultiplierProvider; the
+intensity multiplier is Lerp(1, IntensityScalingMax, impact) with the max from
+IntensityMaxProvider (or 1.0 when scaling is off). The whole grid is multiplied out
+once in float32, reduced to its distinct combined values, and evaluated against all
+trigger x intensity timeScales in one broadcast:
+
+    ceiling   combined <= timeScale: result clamps to 1.0 (no slow-mo at all)
+    floor     combined >= timeScale / 0.01: result clamps to 0.01
+    distinct  how many different time scales the grid can actually produce
+
+A zero multiplier blocks the trigger before the division (DamageTypeDisabled,
+DOTKillDisabled, ThrownWeaponDisabled); those grid points are counted separately.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+
+import numpy as np
+
+from cs_source import CSM_OPTIONS, evaluate_float_provider, read_source
+from preset_model import PresetModel
+
+EFFECTIVE_MIN = np.float32(0.01)
+EFFECTIVE_MAX = np.float32(1.0)
+DEFAULT_IMPACT_STEPS = 11
+
+
+class MultiplierGrid:
+    """Provider values for each multiplier, parsed from CSMModOptions.cs."""
+
+    def __init__(self, options_text: str, impact_steps: int = DEFAULT_IMPACT_STEPS):
+        self.damage = np.asarray(evaluate_float_provider(options_text, "DamageMultiplierProvider"), dtype=np.float32)
+        self.intensity_max = np.asarray(evaluate_float_provider(options_text, "IntensityMaxProvider"), dtype=np.float32)
+        self.impacts = np.linspace(0.0, 1.0, max(2, impact_steps), dtype=np.float32)
+
+    @classmethod
+    def from_sources(cls, impact_steps: int = DEFAULT_IMPACT_STEPS) -> "MultiplierGrid":
+        return cls(read_source(CSM_OPTIONS), impact_steps)
+
+    def intensity_multipliers(self):
+        """Scaling off (1.0) plus Lerp(1, max, impact) for every max x impact."""
+        lerp = 1.0 + (self.intensity_max[:, None] - 1.0) * self.impacts[None, :]
+        return np.concatenate([[np.float32(1.0)], lerp.astype(np.float32).reshape(-1)])
+
+    def combined(self):
+        """Distinct non-zero combined multipliers with their grid counts, plus the blocked count."""
+        intensity = self.intensity_multipliers()
+        d = self.damage[:, None, None, None]
+        i = intensity[None, :, None, None]
+        o = self.damage[None, None, :, None]  # DOTMultiplier uses DamageMultiplierProvider
+        w = self.damage[None, None, None, :]  # ThrownMultiplier too
+        combined = (((d * i).astype(np.float32) * o).astype(np.float32) * w).astype(np.float32)
+        blocked = (d == 0) | (o == 0) | (w == 0)
+        blocked = np.broadcast_to(blocked, combined.shape)
+        values, counts = np.unique(combined[~blocked], return_counts=True)
+        return values, counts, int(blocked.sum()), combined.size
+
+
+def effective(timescale, combined):
+    """TriggerSlow's clamp, broadcast over any shapes of timeScale and combined multiplier."""
+    timescale = np.asarray(timescale, dtype=np.float32)
+    combined = np.asarray(combined, dtype=np.float32)
+    scaled = np.clip((timescale / combined).astype(np.float32), EFFECTIVE_MIN, EFFECTIVE_MAX)
+    return np.where(combined == np.float32(1.0), timescale, scaled)
+
+
+def sweep(model: PresetModel, grid: MultiplierGrid):
+    """Clamp statistics per (trigger, intensity) over the whole multiplier grid."""
+    values, counts, blocked, total = grid.combined()
+    timescale = model.timescale_ti.astype(np.float32)  # (T, I)
+    result = effective(timescale[..., None], values[None, None, :])  # (T, I, U)
+    weights = counts / counts.sum()
+    at_ceiling = result >= EFFECTIVE_MAX
+    at_floor = result <= EFFECTIVE_MIN
+    distinct = np.array([[len(np.unique(result[t, i])) for i in range(result.shape[1])] for t in range(result.shape[0])])
+    return {
+        "timeScale": timescale,
+        "ceilingAt": timescale,  # combined <= timeScale -> 1.0
+        "floorAt": timescale / EFFECTIVE_MIN,  # combined >= timeScale / 0.01 -> 0.01
+        "ceilingShare": (at_ceiling * weights).sum(axis=-1),
+        "floorShare": (at_floor * weights).sum(axis=-1),
+        "distinct": distinct,
+        "combinedValues": len(values),
+        "combinedRange": (float(values.min()), float(values.max())),
+        "blockedShare": blocked / total,
+        "gridSize": total,
+    }
+
+
+def collapse_runs(options, results):
+    """Group consecutive option values that produce the same result: [(first, last, result)]."""
+    runs = []
+    for option, value in zip(options, results):
+        if runs and runs[-1][2] == value:
+            runs[-1][1] = option
+        else:
+            runs.append([option, option, value])
+    return [tuple(run) for run in runs]
+
+
+def single_axis(model: PresetModel, grid: MultiplierGrid, intensity: str):
+    """Per trigger, options of one multiplier (others neutral) that collapse onto a clamp bound.
+
+    Damage type, DOT and thrown share DamageMultiplierProvider, so they collapse the same
+    way; intensity scaling is shown at full impact (intensity = 1).
+    """
+    timescale = model.timescale_ti[:, model.index("intensity", intensity)].astype(np.float32)
+    axes = {
+        "Damage/DOT/Thrown": [float(v) for v in grid.damage if v > 0],
+        "Intensity Max": [float(v) for v in grid.intensity_max],
+    }
+    rows = []
+    for t, trigger in enumerate(model.triggers):
+        for axis, options in axes.items():
+            results = effective(timescale[t], np.asarray(options, dtype=np.float32))
+            ceiling = [o for o, r in zip(options, results) if r >= EFFECTIVE_MAX]
+            floor = [o for o, r in zip(options, results) if r <= EFFECTIVE_MIN]
+            merged = [(a, b) for a, b, _ in collapse_runs(options, [float(r) for r in results]) if a != b]
+            rows.append({
+                "trigger": trigger,
+                "multiplier": axis,
+                "timeScale": float(timescale[t]),
+                "ceilingOptions": ceiling,
+                "floorOptions": floor,
+                "mergedRuns": merged,
+            })
+    return rows
+
+
+def format_options(options) -> str:
+    if not options:
+        return "-"
+    if len(options) == 1:
+        return f"{options[0]:g}x"
+    return f"{options[0]:g}x-{options[-1]:g}x ({len(options)})"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Where the multiplier clamp kicks in for each trigger and intensity")
+    parser.add_argument("--impact-steps", type=int, default=DEFAULT_IMPACT_STEPS,
+                        help="Impact intensity samples between 0 and 1 for intensity scaling")
+    parser.add_argument("--intensity", default="Default", help="Intensity preset for the single-multiplier table")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        model = PresetModel.from_sources()
+        grid = MultiplierGrid.from_sources(args.impact_steps)
+        model.index("intensity", args.intensity)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    stats = sweep(model, grid)
+    axis_rows = single_axis(model, grid, args.intensity)
+
+    if args.json:
+        presets = []
+        for t, trigger in enumerate(model.triggers):
+            for i, intensity in enumerate(model.intensities):
+                presets.append({
+                    "trigger": trigger,
+                    "intensity": intensity,
+                    "timeScale": float(stats["timeScale"][t, i]),
+                    "floorAt": float(stats["floorAt"][t, i]),
+                    "ceilingShare": float(stats["ceilingShare"][t, i]),
+                    "floorShare": float(stats["floorShare"][t, i]),
+                    "distinct": int(stats["distinct"][t, i]),
+                })
+        print(json.dumps({
+            "gridSize": stats["gridSize"],
+            "blockedShare": stats["blockedShare"],
+            "combinedValues": stats["combinedValues"],
+            "combinedRange": stats["combinedRange"],
+            "presets": presets,
+            "singleMultiplier": axis_rows,
+        }, indent=2))
+        return 0
+
+    low, high = stats["combinedRange"]
+    print(
+        f"=== Multiplier sweep: {stats['gridSize']:,} grid points, {stats['blockedShare'] * 100:.1f}% blocked by a 0x "
+        f"multiplier, {stats['combinedValues']:,} distinct combined values ({low:g}x-{high:g}x) ==="
+    )
+    header = f"{'trigger':<14} {'intensity':<10} {'scale':>6} {'floor at':>9} {'at 1.0':>7} {'at 0.01':>8} {'distinct':>9}"
+    print(header)
+    print("-" * len(header))
+    for t, trigger in enumerate(model.triggers):
+        for i, intensity in enumerate(model.intensities):
+            print(
+                f"{trigger:<14} {intensity:<10} {stats['timeScale'][t, i]:>6.2f} {stats['floorAt'][t, i]:>8.1f}x "
+                f"{stats['ceilingShare'][t, i] * 100:>6.1f}% {stats['floorShare'][t, i] * 100:>7.1f}% "
+                f"{stats['distinct'][t, i]:>9}"
+            )
+    print()
+    print(f"Single multiplier (others 1.0x, intensity preset {args.intensity}):")
+    for row in axis_rows:
+        print(
+            f"  {row['trigger']:<14} {row['multiplier']:<18} -> 1.0x: {format_options(row['ceilingOptions']):<18} "
+            f"-> 0.01x: {format_options(row['floorOptions'])}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,13 +2,48 @@
 """Summarize latest structured diagnostics from Blade & Sorcery Player.log."""
 
 import argparse
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
 import re
 import sys
+import threading
+import zipfile
+import zlib
 from collections import defaultdict
 
+import telemetry_schema
+
 MODS = ("DOT", "CSM", "EIP", "IDM")
+MOD_TAGS = tuple(f"[{mod}]" for mod in MODS)
 DIAG_RE = re.compile(r"\[(DOT|CSM|EIP|IDM)\]\s+diag\s+evt=([a-z_]+)\s*(.*)")
 KV_RE = re.compile(r"([A-Za-z0-9_]+)=([^\s]+)")
+SESSION_START_RE = re.compile(rb"\[(DOT|CSM|EIP|IDM)\]\s+diag\s+evt=session_start\b")
+
+# Line flags: low bits mark which mod tags appear, high bits mark signal words.
+SIGNAL_ERROR = 1 << len(MODS)
+SIGNAL_WARNING = 1 << (len(MODS) + 1)
+SIGNAL_EXCEPTION = 1 << (len(MODS) + 2)
+MOD_MASK = SIGNAL_ERROR - 1
+
+COMPRESSION_MAGIC = (
+    (b"\x1f\x8b", "gzip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"PK\x03\x04", "zip"),
+)
+ZIP_LOG_NAMES = ("player.log", "player-prev.log")
+READ_CHUNK_BYTES = 1 << 20
+READ_AHEAD_CHUNKS = 8
+
+# Per-event parsers compiled from telemetry_schema.json (CSMTelemetry.cs field order):
+# FIELD_PARSERS return {key: text} dicts, RECORD_DECODERS typed __slots__ records.
+SCHEMA = telemetry_schema.load_schema()
+FIELD_PARSERS = telemetry_schema.compile_parsers(SCHEMA) if SCHEMA else {}
+RECORD_DECODERS = telemetry_schema.compile_records(SCHEMA) if SCHEMA else {}
 
 
 def parse_key_values(tail: str):
@@ -18,53 +53,382 @@ def parse_key_values(tail: str):
     return data
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Summarize latest mod telemetry runs from Player.log")
-    parser.add_argument("log_path", help="Path to Player.log")
-    args = parser.parse_args()
+def parse_diag_fields(mod: str, event: str, tail: str):
+    """Fields of one diag line: the compiled schema parser when it matches, else the generic scan."""
+    parser = FIELD_PARSERS.get((mod, event))
+    if parser is not None:
+        fields = parser(tail)
+        if fields is not None:
+            return fields
+    return parse_key_values(tail)
 
-    try:
-        with open(args.log_path, "r", encoding="utf-8", errors="replace") as handle:
-            lines = handle.readlines()
-    except OSError as exc:
-        print(f"error: failed to read log file: {exc}", file=sys.stderr)
-        return 2
 
-    events_by_mod = defaultdict(list)
-    signal_counts = {mod: {"error": 0, "warning": 0, "exception": 0} for mod in MODS}
+def decode_diag_fields(mod: str, event: str, tail: str):
+    """A typed DiagRecord for known events, else the same dict parse_diag_fields returns."""
+    decoder = RECORD_DECODERS.get((mod, event))
+    if decoder is not None:
+        record = decoder(tail)
+        if record is not None:
+            return record
+    return parse_diag_fields(mod, event, tail)
+
+
+def field_text(fields, key: str, default=None):
+    """A field as logged, from either a DiagRecord or a {key: text} dict."""
+    if isinstance(fields, telemetry_schema.DiagRecord):
+        return fields.text(key, default)
+    return fields.get(key, default)
+
+
+def schema_keys(mod: str, event: str):
+    """Field names the schema lists for a mod's event (without run), or None if not covered."""
+    if not SCHEMA or SCHEMA.get("mod") != mod or event not in SCHEMA["events"]:
+        return None
+    return [field["name"] for field in SCHEMA["events"][event]["fields"] if field["name"] != "run"]
+
+
+def new_signal_counts():
+    return {mod: {"error": 0, "warning": 0, "exception": 0} for mod in MODS}
+
+
+def line_flags(line: str) -> int:
+    flags = 0
+    for bit, tag in enumerate(MOD_TAGS):
+        if tag in line:
+            flags |= 1 << bit
+    if not flags:
+        return 0
+    lower = line.lower()
+    if "error" in lower:
+        flags |= SIGNAL_ERROR
+    if "warning" in lower or "warn" in lower:
+        flags |= SIGNAL_WARNING
+    if "exception" in lower:
+        flags |= SIGNAL_EXCEPTION
+    return flags
+
+
+def apply_signal_flags(flags: int, signal_counts) -> None:
+    if not flags & ~MOD_MASK:
+        return
+    for bit, mod in enumerate(MODS):
+        if not flags & (1 << bit):
+            continue
+        counts = signal_counts[mod]
+        if flags & SIGNAL_ERROR:
+            counts["error"] += 1
+        if flags & SIGNAL_WARNING:
+            counts["warning"] += 1
+        if flags & SIGNAL_EXCEPTION:
+            counts["exception"] += 1
 
-    for index, raw_line in enumerate(lines):
-        line = raw_line.strip()
 
-        for mod in MODS:
-            tag = f"[{mod}]"
-            if tag not in line:
-                continue
-            lower = line.lower()
-            if "error" in lower:
-                signal_counts[mod]["error"] += 1
-            if "warning" in lower or "warn" in lower:
-                signal_counts[mod]["warning"] += 1
-            if "exception" in lower:
-                signal_counts[mod]["exception"] += 1
+def make_event(line_number: int, event: str, fields, raw: str):
+    return {
+        "line": line_number,
+        "event": event,
+        "run": fields.get("run", "none"),
+        "fields": fields,
+        "raw": raw,
+    }
+
+
+def scan_lines(lines, start_line: int = 1, events_by_mod=None, signal_counts=None, records: bool = True):
+    """Collect diag events and log signal counts from an iterable of raw lines.
+
+    With `records`, known CSM events carry typed DiagRecord fields; otherwise every event
+    gets a {key: text} dict.
+    """
+    decode = decode_diag_fields if records else parse_diag_fields
+    if events_by_mod is None:
+        events_by_mod = defaultdict(list)
+    if signal_counts is None:
+        signal_counts = new_signal_counts()
+
+    for index, raw_line in enumerate(lines, start=start_line):
+        line = raw_line.strip()
+        flags = line_flags(line)
+        if not flags:
+            continue
+        apply_signal_flags(flags, signal_counts)
 
         match = DIAG_RE.search(line)
         if not match:
             continue
 
         mod, event, tail = match.groups()
-        fields = parse_key_values(tail)
-        events_by_mod[mod].append(
-            {
-                "line": index + 1,
-                "event": event,
-                "run": fields.get("run", "none"),
-                "fields": fields,
-                "raw": line,
-            }
-        )
+        events_by_mod[mod].append(make_event(index, event, decode(mod, event, tail), line))
+
+    return events_by_mod, signal_counts
+
+
+def detect_compression(path: str):
+    with open(path, "rb") as handle:
+        head = handle.read(8)
+    for magic, kind in COMPRESSION_MAGIC:
+        if head.startswith(magic):
+            return kind
+    return None
+
+
+def pick_zip_member(bundle: zipfile.ZipFile, member: str = None) -> str:
+    names = [info.filename for info in bundle.infolist() if not info.is_dir()]
+    if member:
+        if member in names:
+            return member
+        matches = [name for name in names if os.path.basename(name).lower() == member.lower()]
+        if matches:
+            return matches[0]
+        raise ValueError(f"zip has no member '{member}' (members: {', '.join(names) or 'none'})")
+
+    for wanted in ZIP_LOG_NAMES:
+        matches = [name for name in names if os.path.basename(name).lower() == wanted]
+        if matches:
+            return matches[0]
+    logs = [name for name in names if name.lower().endswith(".log")]
+    if len(logs) == 1:
+        return logs[0]
+    raise ValueError(f"cannot pick a log from zip, use --member (members: {', '.join(names) or 'none'})")
+
+
+class _ZipMemberStream(io.RawIOBase):
+    """Keeps the ZipFile open for as long as one of its members is being read."""
+
+    def __init__(self, bundle: zipfile.ZipFile, member: str):
+        self._bundle = bundle
+        self._member = bundle.open(member)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        data = self._member.read(len(buffer))
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self._member.close()
+            self._bundle.close()
+        super().close()
+
+
+def open_log_binary(path: str, member: str = None):
+    """Open a plain, gzip, bz2, xz or zip-bundled log as a streaming binary file."""
+    kind = detect_compression(path)
+    if kind == "gzip":
+        return gzip.open(path, "rb")
+    if kind == "bz2":
+        return bz2.open(path, "rb")
+    if kind == "xz":
+        return lzma.open(path, "rb")
+    if kind == "zip":
+        bundle = zipfile.ZipFile(path)
+        try:
+            name = pick_zip_member(bundle, member)
+        except ValueError:
+            bundle.close()
+            raise
+        return io.BufferedReader(_ZipMemberStream(bundle, name), READ_CHUNK_BYTES)
+    return open(path, "rb")
+
+
+class BackgroundReader(io.RawIOBase):
+    """Reads (and so decompresses) a binary stream on a worker thread.
 
+    Chunks are handed over through a bounded queue, so inflation of the next
+    chunks overlaps with parsing of the current one without buffering the
+    whole file.
+    """
+
+    def __init__(self, source, chunk_size: int = READ_CHUNK_BYTES, read_ahead: int = READ_AHEAD_CHUNKS):
+        self._source = source
+        self._chunk_size = chunk_size
+        self._chunks = queue.Queue(maxsize=max(1, read_ahead))
+        self._pending = memoryview(b"")
+        self._done = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._pump, name="log-decompress", daemon=True)
+        self._thread.start()
+
+    def _pump(self):
+        try:
+            while not self._stop.is_set():
+                chunk = self._source.read(self._chunk_size)
+                if not chunk:
+                    break
+                self._chunks.put(chunk)
+            self._chunks.put(None)
+        except Exception as exc:  # surfaced to the reading thread
+            self._chunks.put(exc)
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        while not self._pending:
+            if self._done:
+                return 0
+            item = self._chunks.get()
+            if item is None:
+                self._done = True
+                return 0
+            if isinstance(item, Exception):
+                self._done = True
+                raise item
+            self._pending = memoryview(item)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            while self._thread.is_alive():
+                try:
+                    self._chunks.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            self._source.close()
+        super().close()
+
+
+def open_log_text(path: str, member: str = None, background: bool = False):
+    """Open any supported log input as a text stream of lines."""
+    binary = open_log_binary(path, member)
+    if background:
+        binary = io.BufferedReader(BackgroundReader(binary), READ_CHUNK_BYTES)
+    return io.TextIOWrapper(binary, encoding="utf-8", errors="replace")
+
+
+def load_log(path: str, member: str = None, background: bool = False, records: bool = True):
+    """Scan a Player.log (compressed, zipped, or a compact archive) into events and signal counts."""
+    import log_archive
+
+    if log_archive.is_archive(path):
+        return log_archive.load_archive(path)
+
+    with open_log_text(path, member, background) as handle:
+        return scan_lines(handle, records=records)
+
+
+def read_latest_tail(path: str, mods=MODS, limit_bytes: int = None, block_size: int = READ_CHUNK_BYTES):
+    """Read a plain log backwards from EOF until the last session_start of every mod in `mods` is seen.
+
+    Returns (lines, start_line, info): the tail's lines in file order, the line number of
+    the first one (1 when the whole file was read, otherwise negative, counted back from
+    the last line), and {"bytesRead", "size", "found", "complete"}. Stops early after
+    `limit_bytes`; the partial first line of the last block read is then dropped.
+    """
+    pending = set(mods)
+    tail = []  # raw lines, last line first
+    with open(path, "rb") as handle:
+        size = handle.seek(0, os.SEEK_END)
+        whole_file = size == 0
+        pos = size
+        carry = b""
+        while pos > 0 and pending and (limit_bytes is None or size - pos < limit_bytes):
+            step = min(block_size, pos, limit_bytes - (size - pos) if limit_bytes is not None else pos)
+            pos -= step
+            handle.seek(pos)
+            parts = (handle.read(step) + carry).split(b"\n")
+            if pos:
+                carry = parts.pop(0)  # may continue in the previous block
+            for raw in reversed(parts):
+                tail.append(raw)
+                if b"session_start" in raw:
+                    match = SESSION_START_RE.search(raw)
+                    if match:
+                        pending.discard(match.group(1).decode("ascii"))
+                        if not pending:
+                            break
+            else:
+                whole_file = pos == 0
+
+    if size and tail and tail[0] == b"":
+        tail.pop(0)  # the file ends with a newline
+    lines = b"\n".join(reversed(tail)).decode("utf-8", errors="replace").split("\n") if tail else []
+    info = {
+        "bytesRead": size - pos,
+        "size": size,
+        "found": sorted(set(mods) - pending),
+        "complete": not pending,
+    }
+    return lines, 1 if whole_file else -len(lines), info
+
+
+def load_latest(path: str, mods=MODS, limit_bytes: int = None, records: bool = True, use_index: bool = False):
+    """Like load_log, but only over the tail read_latest_tail finds; (events, signals, scope note).
+
+    With `use_index`, the <log>.runidx sidecar (log_index.py, updated first) gives the byte
+    offset of each mod's last session_start, so the tail is read forward from there and
+    keeps absolute line numbers.
+    """
+    import log_archive
+
+    if log_archive.is_archive(path):
+        starts = log_archive.latest_starts(path, mods)
+        if starts:
+            line = min(starts.values())
+            events_by_mod, signal_counts = log_archive.load_archive(
+                path, block_filter=lambda block: block["last_line"] >= line, start_line=line
+            )
+            scope = f"from line {line} (archive blocks selected with the {log_archive.INDEX_SUFFIX} index)"
+            missing = sorted(set(mods) - set(starts))
+            if missing:
+                scope += f"; no session_start archived for {', '.join(missing)}"
+            return events_by_mod, signal_counts, scope
+        events_by_mod, signal_counts = log_archive.load_archive(path)
+        return events_by_mod, signal_counts, "whole archive (no current index or no session_start found)"
+
+    if detect_compression(path) is not None:
+        events_by_mod, signal_counts = load_log(path, records=records)
+        return events_by_mod, signal_counts, "whole log (compressed input cannot be read backwards)"
+
+    if use_index:
+        import log_index
+
+        index, status = log_index.update_index(path)
+        starts = log_index.latest_starts(index, mods)
+        if starts:
+            line, offset, _ = min(starts.values())
+            with open(path, "rb") as handle:
+                handle.seek(offset)
+                text = io.TextIOWrapper(handle, encoding="utf-8", errors="replace")
+                events_by_mod, signal_counts = scan_lines(text, start_line=line, records=records)
+            scope = (
+                f"from line {line} (byte {offset} of {index['source']['size']}, "
+                f"{log_index.INDEX_SUFFIX} index {status})"
+            )
+            missing = sorted(set(mods) - set(starts))
+            if missing:
+                scope += f"; no session_start indexed for {', '.join(missing)}"
+            return events_by_mod, signal_counts, scope
+
+    lines, start_line, info = read_latest_tail(path, mods, limit_bytes)
+    events_by_mod, signal_counts = scan_lines(lines, start_line=start_line, records=records)
+    if start_line == 1:
+        return events_by_mod, signal_counts, "whole log (reverse scan reached the start)"
+    missing = sorted(set(mods) - set(info["found"]))
+    scope = (
+        f"last {len(lines)} lines ({info['bytesRead'] / 1048576:.1f} of {info['size'] / 1048576:.1f} MB, "
+        f"line numbers counted back from the end)"
+    )
+    if missing:
+        scope += f"; byte limit reached before a session_start for {', '.join(missing)}"
+    return events_by_mod, signal_counts, scope
+
+
+def format_line(line: int) -> str:
+    """A line number for the report; negative ones (a --latest tail without an index) count back from EOF."""
+    return str(line) if line > 0 else f"{line} (from end of log, -1 = last line)"
+
+
+def print_report(events_by_mod, signal_counts, scope: str = None) -> None:
     print("=== Player.log Diagnostics Report ===")
+    if scope:
+        print(f"scope: {scope}")
     for mod in MODS:
         events = events_by_mod.get(mod, [])
         if not events:
@@ -90,16 +454,16 @@ def main():
             fields = last_totals["fields"]
             print(
                 "  totals: "
-                f"uptimeSec={fields.get('uptimeSec', 'n/a')} "
-                f"summaryCount={fields.get('summaryCount', 'n/a')} "
-                f"errors={fields.get('errors', fields.get('errorCount', 'n/a'))}"
+                f"uptimeSec={field_text(fields, 'uptimeSec', 'n/a')} "
+                f"summaryCount={field_text(fields, 'summaryCount', 'n/a')} "
+                f"errors={field_text(fields, 'errors', field_text(fields, 'errorCount', 'n/a'))}"
             )
         else:
             print("  totals: missing")
 
         if last_kpi:
             fields = last_kpi["fields"]
-            important_keys = [
+            important_keys = schema_keys(mod, "session_kpi") or [
                 "triggerRate",
                 "blockRate",
                 "applyRate",
@@ -113,19 +477,112 @@ def main():
                 "severeDropRate",
                 "errors",
             ]
-            parts = [f"{key}={fields[key]}" for key in important_keys if key in fields]
+            parts = [f"{key}={field_text(fields, key)}" for key in important_keys if key in fields]
             print("  kpi: " + (" ".join(parts) if parts else "present (custom fields)"))
         else:
             print("  kpi: missing")
 
         if last_end:
-            print(f"  session_end_line: {last_end['line']}")
+            print(f"  session_end_line: {format_line(last_end['line'])}")
 
         counts = signal_counts[mod]
         print(
             f"  log_signals: errors={counts['error']} warnings={counts['warning']} exceptions={counts['exception']}"
         )
 
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize latest mod telemetry runs from Player.log")
+    parser.add_argument(
+        "log_path",
+        help="Path to Player.log, a .gz/.bz2/.xz/.zip of one, or a compact archive from log_archive.py",
+    )
+    parser.add_argument("--member", help="Log file to read inside a zip bundle (default: Player.log)")
+    parser.add_argument(
+        "--background-decompress",
+        action="store_true",
+        help="Decompress on a worker thread so inflation overlaps with parsing",
+    )
+    parser.add_argument(
+        "--text-fields",
+        action="store_true",
+        help="Keep every diag field as text instead of decoding known CSM events into typed records",
+    )
+    parser.add_argument(
+        "--latest",
+        action="store_true",
+        help="Read a plain log backwards only until the last session_start of each mod; "
+        "log_signals then cover that tail only",
+    )
+    parser.add_argument(
+        "--latest-mods",
+        default=",".join(MODS),
+        help="Comma-separated mods whose last session_start --latest waits for (default: all)",
+    )
+    parser.add_argument(
+        "--index",
+        action="store_true",
+        help="Create/update the <log>.runidx byte-offset sidecar and seek with it (--latest, --show-context)",
+    )
+    parser.add_argument(
+        "--show-context",
+        metavar="run=ID|line=N",
+        help="Print a run's indexed diag lines (or one line) with surrounding lines instead of the report; "
+        "on a compact archive, context is counted in archived lines",
+    )
+    parser.add_argument(
+        "-C",
+        "--context",
+        type=int,
+        default=2,
+        help="Lines of context for --show-context (default 2)",
+    )
+    parser.add_argument(
+        "--latest-limit-mb",
+        type=float,
+        help="Stop the --latest reverse scan after this many MB even if a mod's session_start was not found",
+    )
+    args = parser.parse_args()
+
+    mods = [mod.strip() for mod in args.latest_mods.split(",") if mod.strip()]
+    unknown = [mod for mod in mods if mod not in MODS]
+    if unknown:
+        parser.error(f"unknown mod(s) for --latest-mods: {', '.join(unknown)} (choose from {', '.join(MODS)})")
+
+    if args.latest and args.member:
+        parser.error("--latest cannot be combined with --member (zip members are read from the start)")
+
+    if args.show_context:
+        import log_archive
+        import log_index
+
+        try:
+            if log_archive.is_archive(args.log_path):
+                log_index.print_archive_context(args.log_path, args.show_context, max(0, args.context))
+            else:
+                index, _ = log_index.update_index(args.log_path, write=args.index)
+                log_index.print_context(args.log_path, index, args.show_context, max(0, args.context))
+        except (OSError, ValueError, zlib.error) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        return 0
+
+    scope = None
+    try:
+        if args.latest:
+            limit = int(args.latest_limit_mb * 1048576) if args.latest_limit_mb else None
+            events_by_mod, signal_counts, scope = load_latest(
+                args.log_path, mods, limit, records=not args.text_fields, use_index=args.index
+            )
+        else:
+            events_by_mod, signal_counts = load_log(
+                args.log_path, args.member, args.background_decompress, records=not args.text_fields
+            )
+    except (OSError, ValueError, EOFError, zipfile.BadZipFile, lzma.LZMAError) as exc:
+        print(f"error: failed to read log file: {exc}", file=sys.stderr)
+        return 2
+
+    print_report(events_by_mod, signal_counts, scope)
     return 0
 
 
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""Trend of every preset value across the git history of the C# sources.
+
+One `git log --raw` walk over the preset sources (plus manifest.json for the version
+label) gives the blob SHA of each file at every commit without checking anything out.
+Blob contents come from a single long-lived `git cat-file --batch` process, each blob
+is read at most once, and every distinct source snapshot is parsed into a PresetModel
+in parallel worker processes. The extracted values are cached per snapshot under
+_agent/.cache/preset_history, keyed by the blob SHAs, so a rerun only parses commits
+that are new since the last one.
+
+Rows of the trend table are values such as `BasicKill.timeScale.Default`; columns are
+ModVersions (the last commit of each version), or every commit that changed a value
+with `--by commit`. Only values that change somewhere in history are shown unless
+`--all` is given.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from cs_source import CSM_MANAGER, CSM_OPTIONS, ROOT, TRIGGER_TYPE
+from preset_model import CSM_VISIBILITY, PresetModel
+
+AGENT_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = AGENT_DIR / ".cache" / "preset_history"
+CACHE_VERSION = 2
+NULL_SHA = "0" * 40
+
+# PresetModel.from_texts key -> path in the repo.
+SOURCES = {
+    "manager": CSM_MANAGER.relative_to(ROOT).as_posix(),
+    "options": CSM_OPTIONS.relative_to(ROOT).as_posix(),
+    "trigger": TRIGGER_TYPE.relative_to(ROOT).as_posix(),
+    "visibility": CSM_VISIBILITY.relative_to(ROOT).as_posix(),
+}
+MANIFEST = "manifest.json"
+
+
+class BlobReader:
+    """One `git cat-file --batch` process; blobs are requested by SHA over its stdin."""
+
+    def __init__(self, repo: Path):
+        self.proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=repo,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.reads = 0
+
+    def read_object(self, name: str):
+        """(sha, contents) for any object name such as `<rev>:<path>`; (None, None) if missing."""
+        self.proc.stdin.write(name.encode("utf-8") + b"\n")
+        self.proc.stdin.flush()
+        header = self.proc.stdout.readline().decode("utf-8").split()
+        if len(header) == 2 and header[1] in ("missing", "ambiguous"):
+            return None, None
+        if len(header) != 3:
+            raise ValueError(f"git cat-file: {' '.join(header) or 'no output'}")
+        data = self.proc.stdout.read(int(header[2]))
+        self.proc.stdout.read(1)  # trailing newline
+        self.reads += 1
+        return header[0], data
+
+    def read(self, sha: str) -> bytes:
+        found, data = self.read_object(sha)
+        if found is None:
+            raise ValueError(f"git cat-file: {sha} missing")
+        return data
+
+    def close(self):
+        if self.proc.stdin:
+            self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def walk_history(repo: Path, rev: str):
+    """Commits (oldest first) touching the tracked files, with each file's blob SHA at that commit."""
+    paths = list(SOURCES.values()) + [MANIFEST]
+    out = subprocess.run(
+        ["git", "log", "--first-parent", "--reverse", "--raw", "--no-abbrev", "--no-renames",
+         "--format=%x00%H%x09%ad%x09%s", "--date=short", rev, "--", *paths],
+        cwd=repo, capture_output=True, text=True, check=True,
+    ).stdout
+
+    blobs = {path: None for path in paths}
+    commits = []
+    for line in out.splitlines():
+        if line.startswith("\0"):
+            sha, date, subject = line[1:].split("\t", 2)
+            commits.append({"commit": sha, "date": date, "subject": subject, "blobs": dict(blobs)})
+        elif line.startswith(":") and commits:
+            meta, path = line.split("\t", 1)
+            new_sha = meta.split()[3]
+            blobs[path] = None if new_sha == NULL_SHA else new_sha
+            commits[-1]["blobs"][path] = blobs[path]
+    return commits
+
+
+def snapshot_key(blobs) -> str:
+    raw = f"{CACHE_VERSION}|" + "|".join(f"{name}={blobs.get(path)}" for name, path in SOURCES.items())
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def extract_values(texts):
+    """Flat {name: value} of every preset value in one source snapshot (runs in a worker)."""
+    try:
+        model = PresetModel.from_texts(texts)
+    except (KeyError, ValueError, IndexError) as exc:
+        return {"error": f"{type(exc).__name__}: {exc}", "values": {}}
+
+    values = {}
+    tables = (
+        ("timeScale", model.timescale_ti, model.intensities),
+        ("chance", model.chance_tc, model.chance_presets),
+        ("cooldown", model.cooldown_tk, model.cooldown_presets),
+        ("duration", model.duration_td, model.duration_presets),
+    )
+    for t, trigger in enumerate(model.triggers):
+        for field, array, labels in tables:
+            for p, label in enumerate(labels):
+                values[f"{trigger}.{field}.{label}"] = round(float(array[t, p]), 6)
+    values["transition.rampPercent"] = round(float(model.ramp_percent), 6)
+    for axis, label in model.defaults.items():
+        values[f"default.{axis}"] = label
+    return {"error": None, "values": values}
+
+
+def load_snapshots(reader: BlobReader, commits, cache_dir: Path, jobs: int, use_cache: bool = True):
+    """Extracted values per snapshot key, parsing only snapshots missing from the cache."""
+    results = {}
+    pending = {}
+    for commit in commits:
+        key = snapshot_key(commit["blobs"])
+        commit["key"] = key
+        if key in results or key in pending:
+            continue
+        cache_file = cache_dir / f"{key}.json"
+        if use_cache and cache_file.exists():
+            results[key] = json.loads(cache_file.read_text(encoding="utf-8"))
+        else:
+            pending[key] = commit["blobs"]
+
+    if pending:
+        texts = {}
+        contents = {}
+        for key, blobs in pending.items():
+            missing = [path for path in SOURCES.values() if blobs.get(path) is None]
+            if missing:
+                results[key] = {"error": f"missing {', '.join(missing)}", "values": {}}
+                continue
+            for path in SOURCES.values():
+                sha = blobs[path]
+                if sha not in contents:
+                    contents[sha] = reader.read(sha).decode("utf-8-sig", errors="replace")
+            texts[key] = {name: contents[blobs[path]] for name, path in SOURCES.items()}
+
+        keys = list(texts)
+        jobs = max(1, min(jobs, len(keys)))
+        if jobs == 1:
+            extracted = [extract_values(texts[key]) for key in keys]
+        else:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                extracted = list(pool.map(extract_values, (texts[key] for key in keys)))
+        results.update(zip(keys, extracted))
+
+        if use_cache:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            for key in pending:
+                cache_file = cache_dir / f"{key}.json"
+                tmp = cache_file.with_suffix(".tmp")
+                tmp.write_text(json.dumps(results[key]), encoding="utf-8")
+                os.replace(tmp, cache_file)
+    return results, len(pending)
+
+
+def read_versions(reader: BlobReader, commits):
+    """ModVersion from manifest.json at each commit (short SHA when it cannot be read)."""
+    versions = {}
+    for commit in commits:
+        sha = commit["blobs"].get(MANIFEST)
+        if sha not in versions:
+            try:
+                versions[sha] = json.loads(reader.read(sha).decode("utf-8-sig"))["ModVersion"] if sha else None
+            except (ValueError, KeyError):
+                versions[sha] = None
+        commit["version"] = versions[sha] or commit["commit"][:8]
+
+
+def build_columns(commits, snapshots, by: str):
+    """Trend columns: last commit per version, or every commit whose values changed."""
+    columns = []
+    previous = None
+    for commit in commits:
+        snapshot = snapshots[commit["key"]]
+        column = dict(commit, label=commit["version"], error=snapshot["error"], values=snapshot["values"])
+        if by == "version":
+            if columns and columns[-1]["label"] == column["label"]:
+                columns[-1] = column
+            else:
+                columns.append(column)
+        elif column["values"] != previous:
+            column["label"] = f"{commit['version']}@{commit['commit'][:7]}"
+            columns.append(column)
+        previous = column["values"]
+    return columns
+
+
+def trend_rows(columns, show_all: bool):
+    names = []
+    seen = set()
+    for column in columns:
+        for name in column["values"]:
+            if name not in seen:
+                seen.add(name)
+                names.append(name)
+    rows = []
+    for name in names:
+        values = [column["values"].get(name) for column in columns if not column["error"]]
+        if show_all or len(set(map(str, values))) > 1:
+            rows.append((name, [column["values"].get(name) for column in columns]))
+    return rows
+
+
+def format_value(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:g}"
+    return str(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Preset values across the git history of the C# sources")
+    parser.add_argument("rev", nargs="?", default="HEAD", help="Revision or range to walk (default HEAD)")
+    parser.add_argument("--by", choices=("version", "commit"), default="version",
+                        help="One column per ModVersion, or per commit that changed a value")
+    parser.add_argument("--all", action="store_true", help="Show values that never changed too")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for parsing")
+    parser.add_argument("--repo", type=Path, default=ROOT, help="Repository root")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Extracted snapshot cache")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every snapshot and do not write the cache")
+    parser.add_argument("--json", action="store_true", help="Print the trend as JSON")
+    args = parser.parse_args()
+
+    try:
+        commits = walk_history(args.repo, args.rev)
+        if not commits:
+            print("No commits touch the preset sources.", file=sys.stderr)
+            return 1
+        with BlobReader(args.repo) as reader:
+            read_versions(reader, commits)
+            snapshots, parsed = load_snapshots(reader, commits, args.cache_dir, args.jobs, not args.no_cache)
+            blob_reads = reader.reads
+    except (OSError, ValueError, subprocess.CalledProcessError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    columns = build_columns(commits, snapshots, args.by)
+    rows = trend_rows(columns, args.all)
+
+    if args.json:
+        print(json.dumps({
+            "commits": len(commits),
+            "snapshots": len(snapshots),
+            "parsed": parsed,
+            "columns": [
+                {key: column[key] for key in ("label", "version", "commit", "date", "subject", "error")}
+                for column in columns
+            ],
+            "values": {name: values for name, values in rows},
+        }, indent=2))
+        return 0
+
+    print(
+        f"=== Preset history: {len(commits)} commits, {len(snapshots)} distinct snapshots "
+        f"({parsed} parsed, {blob_reads} blobs read, {len(snapshots) - parsed} cached) ==="
+    )
+    for column in columns:
+        status = f"error: {column['error']}" if column["error"] else column["subject"]
+        print(f"  {column['label']:<16} {column['commit'][:8]} {column['date']}  {status}")
+    print()
+    if not rows:
+        print("No preset value changed across these versions." if len(columns) > 1 else "Only one version; use --all.")
+        return 0
+
+    name_width = max(len(name) for name, _ in rows)
+    widths = [max(len(column["label"]), 6) for column in columns]
+    header = f"{'value':<{name_width}}  " + "  ".join(f"{c['label']:>{w}}" for c, w in zip(columns, widths))
+    print(header)
+    print("-" * len(header))
+    for name, values in rows:
+        cells = "  ".join(f"{format_value(v):>{w}}" for v, w in zip(values, widths))
+        print(f"{name:<{name_width}}  {cells}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,317 @@
+"""Preset tables parsed from the C# sources, evaluated as one NumPy tensor.
+
+Axes (in order): trigger, intensity, chance, cooldown, duration, transition, profile.
+Every per-axis table is parsed once; the full combination space is produced with
+broadcasting, so a workbook sheet or a simulator sweep is just a slice.
+
+Values follow what the mod applies at runtime, clamped to the Mathf.Clamp ranges of
+GetCustomValues (parsed into `value_ranges`):
+    timeScale   GetPresetValues(intensity, trigger), 0.01..1
+    chance      GetPresetChanceValue (ChancePreset.Off = 1.0), 0..1
+    cooldown    GetPresetCooldownValue (CooldownPreset.Off = 0), 0..300
+    duration    GetPresetDurationValue, 0.1..60
+    easing      duration * TransitionRampPercent unless the transition is Off
+    enabled     trigger toggles written by ApplyTriggerProfile
+"""
+
+from __future__ import annotations
+
+import re
+from pathlib import Path
+
+import numpy as np
+
+from cs_source import (
+    CSM_MANAGER,
+    CSM_OPTIONS,
+    ROOT,
+    TRIGGER_TYPE,
+    extract_method_block,
+    normalize_default,
+    parse_enum,
+    parse_modoptions,
+    read_source,
+)
+
+CSM_VISIBILITY = ROOT / "Core" / "CSMModOptionVisibility.cs"
+
+AXES = ("trigger", "intensity", "chance", "cooldown", "duration", "transition", "profile")
+DEFAULT_RAMP_PERCENT = 0.20
+# GetCustomValues' Mathf.Clamp ranges, for sources where a clamp cannot be parsed.
+DEFAULT_VALUE_RANGES = {"Chance": (0.0, 1.0), "TimeScale": (0.01, 1.0), "Duration": (0.1, 60.0), "Cooldown": (0.0, 300.0)}
+
+FLOAT_RE = r"([0-9]*\.?[0-9]+)f?"
+
+# ModOption fields holding the selected preset for each axis.
+AXIS_SETTINGS = {
+    "intensity": "CurrentPreset",
+    "chance": "ChancePresetSetting",
+    "cooldown": "CooldownPresetSetting",
+    "duration": "DurationPresetSetting",
+    "transition": "TransitionPresetSetting",
+    "profile": "TriggerProfile",
+}
+
+
+def _float(text: str) -> float:
+    return float(text.rstrip("f"))
+
+
+def parse_value_ranges(options_text: str):
+    """(min, max) per TriggerCustomValues member from the Mathf.Clamp calls in GetCustomValues."""
+    ranges = dict(DEFAULT_VALUE_RANGES)
+    try:
+        body = extract_method_block(options_text, r"public\s+static\s+TriggerCustomValues\s+GetCustomValues\s*\(")
+    except ValueError:
+        return ranges
+    clamp = rf"values\.(\w+)\s*=\s*Mathf\.Clamp\(\s*values\.\w+\s*,\s*{FLOAT_RE}\s*,\s*{FLOAT_RE}\s*\)"
+    for member, low, high in re.findall(clamp, body):
+        ranges[member] = (_float(low), _float(high))
+    return ranges
+
+
+def parse_preset_values(manager_text: str, triggers: list[str], intensities: list[str]):
+    """Parse GetPresetValues into base chance/duration/cooldown and per-intensity timeScale."""
+    block = extract_method_block(manager_text, r"public\s+static\s+void\s+GetPresetValues\s*\(")
+    switch_at = block.find("switch")
+    defaults = {}
+    for var in ("chance", "timeScale", "duration", "cooldown"):
+        m = re.search(rf"\b{var}\s*=\s*{FLOAT_RE};", block[:switch_at])
+        defaults[var] = _float(m.group(1)) if m else 0.0
+
+    case_matches = list(re.finditer(r"case\s+TriggerType\.(\w+)\s*:", block))
+    base = {trigger: dict(defaults) for trigger in triggers}
+    timescale = {trigger: {preset: defaults["timeScale"] for preset in intensities} for trigger in triggers}
+    for idx, match in enumerate(case_matches):
+        trigger = match.group(1)
+        end = case_matches[idx + 1].start() if idx + 1 < len(case_matches) else len(block)
+        body = block[match.end() : end]
+        pre_switch = body.split("switch", 1)[0]
+        values = base.setdefault(trigger, dict(defaults))
+        for var in ("chance", "timeScale", "duration", "cooldown"):
+            m = re.search(rf"\b{var}\s*=\s*{FLOAT_RE};", pre_switch)
+            if m:
+                values[var] = _float(m.group(1))
+        per_preset = timescale.setdefault(trigger, {})
+        for preset in intensities:
+            per_preset[preset] = values["timeScale"]
+        for case in re.finditer(r"case\s+CSMModOptions\.Preset\.(\w+)\s*:\s*timeScale\s*=\s*" + FLOAT_RE, body):
+            per_preset[case.group(1)] = _float(case.group(2))
+    return base, timescale
+
+
+def parse_preset_table(options_text: str, method_name: str, enum_name: str, triggers: list[str], presets: list[str]):
+    """Parse a `GetPreset*Value(trigger)` method into `{trigger: {preset: value}}`.
+
+    Handles the shapes used in CSMModOptions: an early `if (preset == X.Off) return v;`,
+    grouped `case TriggerType.A: case TriggerType.B:` labels, a flat `return v;` for a
+    whole trigger group, nested `case Enum.P: return v;` entries, and the trailing
+    fallback `return v;` for anything not matched.
+    """
+    block = extract_method_block(options_text, rf"public\s+static\s+float\s+{re.escape(method_name)}\s*\(")
+    returns = re.findall(r"return\s+" + FLOAT_RE + r"\s*;", block)
+    fallback = _float(returns[-1]) if returns else 0.0
+
+    overrides = {
+        m.group(1): _float(m.group(2))
+        for m in re.finditer(rf"if\s*\(\s*preset\s*==\s*{enum_name}\.(\w+)\s*\)\s*return\s+{FLOAT_RE}\s*;", block)
+    }
+
+    table = {trigger: {preset: fallback for preset in presets} for trigger in triggers}
+    labels = list(re.finditer(r"case\s+TriggerType\.(\w+)\s*:", block))
+    group = []
+    for idx, match in enumerate(labels):
+        group.append(match.group(1))
+        end = labels[idx + 1].start() if idx + 1 < len(labels) else len(block)
+        body = block[match.end() : end]
+        if not body.strip():
+            continue  # fall-through label, shares the next body
+        nested = {
+            m.group(1): _float(m.group(2))
+            for m in re.finditer(rf"case\s+{enum_name}\.(\w+)\s*:\s*return\s+{FLOAT_RE}\s*;", body)
+        }
+        flat = None
+        if not nested:
+            m = re.search(r"return\s+" + FLOAT_RE + r"\s*;", body)
+            flat = _float(m.group(1)) if m else None
+        for trigger in group:
+            row = table.setdefault(trigger, {preset: fallback for preset in presets})
+            for preset in presets:
+                if flat is not None:
+                    row[preset] = flat
+                elif preset in nested:
+                    row[preset] = nested[preset]
+        group = []
+
+    for preset, value in overrides.items():
+        for row in table.values():
+            row[preset] = value
+    return table
+
+
+def parse_trigger_profiles(visibility_text: str, triggers: list[str], profiles: list[str]):
+    """Parse ApplyTriggerProfile into `{profile: {trigger: enabled}}`."""
+    block = extract_method_block(visibility_text, r"private\s+bool\s+ApplyTriggerProfile\s*\(")
+    var_to_trigger = {
+        m.group(2): m.group(1)
+        for m in re.finditer(r"SetTriggerEnabled\(\s*TriggerType\.(\w+)\s*,\s*(\w+)\s*\)", block)
+    }
+    result = {profile: {trigger: True for trigger in triggers} for profile in profiles}
+    cases = list(re.finditer(r"case\s+CSMModOptions\.TriggerProfilePreset\.(\w+)\s*:", block))
+    for idx, match in enumerate(cases):
+        end = cases[idx + 1].start() if idx + 1 < len(cases) else len(block)
+        body = block[match.end() : end].split("break;", 1)[0]
+        disabled = set()
+        for assignment in re.finditer(r"([\w\s=]+?)=\s*false\s*;", body):
+            disabled.update(name.strip() for name in assignment.group(1).split("=") if name.strip())
+        row = result.setdefault(match.group(1), {trigger: True for trigger in triggers})
+        for var in disabled:
+            if var in var_to_trigger:
+                row[var_to_trigger[var]] = False
+    return result
+
+
+class PresetModel:
+    """Parsed preset tables plus the broadcast tensor over every preset axis."""
+
+    def __init__(self, manager_text: str, options_text: str, trigger_text: str, visibility_text: str):
+        self.triggers = parse_enum(trigger_text, "TriggerType")
+        # Explicit enum values double as priority: AlreadyActive blocks (int)type <= (int)active.
+        values = dict(re.findall(r"\b(\w+)\s*=\s*(\d+)\s*,?", trigger_text))
+        self.trigger_values = {trigger: int(values.get(trigger, idx)) for idx, trigger in enumerate(self.triggers)}
+        self.intensities = parse_enum(options_text, "Preset")
+        self.chance_presets = parse_enum(options_text, "ChancePreset")
+        self.cooldown_presets = parse_enum(options_text, "CooldownPreset")
+        self.duration_presets = parse_enum(options_text, "DurationPreset")
+        self.transitions = parse_enum(options_text, "TransitionPreset")
+        self.profiles = parse_enum(options_text, "TriggerProfilePreset")
+
+        m = re.search(r"TransitionRampPercent\s*=\s*" + FLOAT_RE, options_text)
+        self.ramp_percent = _float(m.group(1)) if m else DEFAULT_RAMP_PERCENT
+        self.value_ranges = parse_value_ranges(options_text)
+
+        self.base, self.intensity_table = parse_preset_values(manager_text, self.triggers, self.intensities)
+        self.chance_table = parse_preset_table(
+            options_text, "GetPresetChanceValue", "ChancePreset", self.triggers, self.chance_presets
+        )
+        self.cooldown_table = parse_preset_table(
+            options_text, "GetPresetCooldownValue", "CooldownPreset", self.triggers, self.cooldown_presets
+        )
+        self.duration_table = parse_preset_table(
+            options_text, "GetPresetDurationValue", "DurationPreset", self.triggers, self.duration_presets
+        )
+        self.profile_table = parse_trigger_profiles(visibility_text, self.triggers, self.profiles)
+
+        self.axes = {
+            "trigger": self.triggers,
+            "intensity": self.intensities,
+            "chance": self.chance_presets,
+            "cooldown": self.cooldown_presets,
+            "duration": self.duration_presets,
+            "transition": self.transitions,
+            "profile": self.profiles,
+        }
+        self.defaults = self._parse_defaults(options_text)
+        self._build_arrays()
+
+    @classmethod
+    def from_sources(cls, root: Path = ROOT) -> "PresetModel":
+        root = Path(root)
+        return cls(
+            read_source(root / CSM_MANAGER.relative_to(ROOT)),
+            read_source(root / CSM_OPTIONS.relative_to(ROOT)),
+            read_source(root / TRIGGER_TYPE.relative_to(ROOT)),
+            read_source(root / CSM_VISIBILITY.relative_to(ROOT)),
+        )
+
+    @classmethod
+    def from_texts(cls, texts: dict) -> "PresetModel":
+        """Build from `{"manager", "options", "trigger", "visibility"}` source strings (e.g. from git history)."""
+        return cls(texts["manager"], texts["options"], texts["trigger"], texts["visibility"])
+
+    def _parse_defaults(self, options_text: str):
+        """Default label per preset axis, from the ModOption field initializers."""
+        fields = {option["fieldName"]: option for option in parse_modoptions(options_text)}
+        defaults = {}
+        for axis, field in AXIS_SETTINGS.items():
+            labels = self.axes[axis]
+            option = fields.get(field)
+            value = normalize_default(option["fieldValue"], option["fieldType"]) if option else ""
+            compact = value.replace(" ", "")
+            defaults[axis] = compact if compact in labels else ("Default" if "Default" in labels else labels[0])
+        return defaults
+
+    def _matrix(self, table, columns):
+        return np.array([[table[trigger][column] for column in columns] for trigger in self.triggers], dtype=np.float64)
+
+    def _build_arrays(self):
+        # Per-axis tables: one row per trigger.
+        ranges = self.value_ranges
+        self.timescale_ti = np.clip(self._matrix(self.intensity_table, self.intensities), *ranges["TimeScale"])
+        self.chance_tc = np.clip(self._matrix(self.chance_table, self.chance_presets), *ranges["Chance"])
+        self.cooldown_tk = np.clip(self._matrix(self.cooldown_table, self.cooldown_presets), *ranges["Cooldown"])
+        self.duration_td = np.clip(self._matrix(self.duration_table, self.duration_presets), *ranges["Duration"])
+        self.ramp_x = np.array([0.0 if name == "Off" else self.ramp_percent for name in self.transitions])
+        self.enabled_tp = np.array(
+            [[self.profile_table[profile][trigger] for profile in self.profiles] for trigger in self.triggers],
+            dtype=bool,
+        )
+
+    @property
+    def shape(self):
+        return tuple(len(self.axes[axis]) for axis in AXES)
+
+    def _expand(self, array, axes):
+        """Reshape a per-axis table so it broadcasts against the full AXES order."""
+        shape = [1] * len(AXES)
+        for axis, size in zip(axes, array.shape):
+            shape[AXES.index(axis)] = size
+        return array.reshape(shape)
+
+    def tensor(self):
+        """Return every derived field broadcast to the full preset space (read-only views)."""
+        shape = self.shape
+        timescale = self._expand(self.timescale_ti, ("trigger", "intensity"))
+        chance = self._expand(self.chance_tc, ("trigger", "chance"))
+        cooldown = self._expand(self.cooldown_tk, ("trigger", "cooldown"))
+        duration = self._expand(self.duration_td, ("trigger", "duration"))
+        ramp = self._expand(self.ramp_x, ("transition",))
+        enabled = self._expand(self.enabled_tp, ("trigger", "profile"))
+
+        easing = duration * ramp
+        # StartSlowMotion: global cooldown = duration + easing, trigger cooldown adds the preset cooldown.
+        busy = duration + easing
+        cycle = busy + cooldown
+        fields = {
+            "timeScale": timescale,
+            "chance": chance,
+            "cooldown": cooldown,
+            "duration": duration,
+            "easing": easing,
+            "busy": busy,
+            "cycle": cycle,
+            "enabled": enabled,
+            "effectiveChance": chance * enabled,
+        }
+        return {name: np.broadcast_to(value, shape) for name, value in fields.items()}
+
+    def index(self, axis: str, label: str) -> int:
+        return self.axes[axis].index(label)
+
+    def select(self, field: str, **labels):
+        """Slice one tensor field by axis labels, e.g. `select("chance", chance="Rare")`."""
+        array = self.tensor()[field]
+        key = tuple(
+            self.index(axis, labels[axis]) if axis in labels else slice(None) for axis in AXES
+        )
+        return array[key]
+
+    def preset_values(self, trigger: str, intensity: str, chance: str, cooldown: str, duration: str):
+        """Scalar view of one combination, mirroring what ApplyAllPresets would write."""
+        t = self.index("trigger", trigger)
+        return {
+            "chance": float(self.chance_tc[t, self.index("chance", chance)]),
+            "timeScale": float(self.timescale_ti[t, self.index("intensity", intensity)]),
+            "duration": float(self.duration_td[t, self.index("duration", duration)]),
+            "cooldown": float(self.cooldown_tk[t, self.index("cooldown", cooldown)]),
+        }
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""Replay the combat events recorded in a Player.log against alternative preset configurations.
+
+The debug lines written by EventHooks (DebugLogging on) are turned into an event stream
+once: kills with their damage type, intensity, DOT/thrown flags, last-enemy flag and hit
+part, non-lethal slices, parries, last stands and player deaths. The stream is cached
+next to the other _agent caches, keyed by the log's path, size and mtime.
+
+Player.log lines carry no timestamps. The only clock in the log is the `now=` field of
+`SlowMo config` lines, so event times are interpolated between those anchors (by event
+order) and extrapolated with --event-gap seconds per event outside them. A log without
+any successful slow-mo is spaced purely by --event-gap.
+
+Each configuration is replayed through a deterministic model of TriggerSlow and
+StartSlowMotion (same gates and cascade as trigger_sim.py). Chance rolls are drawn once
+per event and stage from --seed and shared by every configuration, so differences
+between rows come from the presets, not from the dice. Configurations are spread over
+worker processes.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from player_log_report import open_log_text
+from preset_model import AXES, PresetModel
+from trigger_sim import (
+    REASONS,
+    add_multiplier_arguments,
+    expand_combos,
+    format_combo,
+    preset_arrays,
+)
+
+AGENT_DIR = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = AGENT_DIR / ".cache" / "replay"
+CACHE_VERSION = 1
+DEFAULT_EVENT_GAP = 2.0
+DEFAULT_SEED = 1968
+
+# DamageType -> index into --damage-mult (Pierce, Slash, Blunt, Elemental); others are 1.0x.
+DAMAGE_GROUPS = {"Pierce": 0, "Slash": 1, "Blunt": 2, "Energy": 3, "Fire": 3, "Lightning": 3}
+
+# At most this many TriggerSlow calls come from one event (LastEnemy + kill cascade).
+ROLLS_PER_EVENT = 4
+
+KILL_RE = re.compile(r"\[CSM\] CreatureKill event: ")
+KILL_SKIP_RE = re.compile(r"\[CSM\] Kill skipped - not player kill")
+PLAYER_DIED_RE = re.compile(r"\[CSM\] Player died, cancelling slow motion")
+DOT_KILL_RE = re.compile(r"\[CSM\] DOT kill detected")
+KILL_DAMAGE_RE = re.compile(r"\[CSM\] Kill damage: type=(\w+) intensity=([0-9.]+)")
+THROWN_RE = re.compile(r"\[CSM\] Thrown weapon kill detected")
+LAST_ENEMY_RE = re.compile(r"\[CSM\] Last enemy of wave killed")
+HIT_PART_RE = re.compile(r"\[CSM\] Hit part: \S+ isHeadOrNeck=(True|False) isSliced=(True|False)")
+SLICE_IGNORED_RE = re.compile(r"\[CSM\] (?:Decapitation|Dismemberment) ignored \(already handled\)")
+NON_LETHAL_RE = re.compile(r"\[CSM\] Non-lethal (decapitation|dismemberment) detected")
+DAMAGE_INPUT_RE = re.compile(r"\[CSM\] Damage input: damageType=(\w+) \([^)]*\), intensity=([0-9.]+)")
+PARRY_RE = re.compile(r"\[CSM\] Parry detected via ")
+LAST_STAND_RE = re.compile(r"\[CSM\] Last Stand triggered!")
+ATTEMPT_RE = re.compile(r"\[CSM\] TriggerSlow\((Parry|LastStand)\) enabled=")
+CONFIG_RE = re.compile(r"\[CSM\] SlowMo config: .* now=([0-9.]+)")
+START_RE = re.compile(r"\[CSM\] SlowMo START: (\w+)")
+ELAPSED_RE = re.compile(r"\[CSM\] SlowMo elapsed(?: \(cancel\))?: ([0-9.]+)s")
+PRESETS_RE = re.compile(
+    r"presets Intensity=(\w+), Chance=(\w+), Cooldown=(\w+), Duration=(\w+)"
+)
+
+
+def new_event(kind: str, line: int, **fields):
+    event = {
+        "kind": kind,  # kill, slice, parry, last_stand, cancel
+        "line": line,
+        "trigger": None,  # slice events: Decapitation / Dismemberment
+        "damage": "Unknown",
+        "intensity": 0.0,
+        "status": False,
+        "thrown": False,
+        "lastEnemy": False,
+        "head": False,
+        "sliced": False,
+        "newSlice": True,
+        "anchor": None,
+    }
+    event.update(fields)
+    return event
+
+
+def extract_events(lines):
+    """Parse debug lines into an event list plus what the recorded session actually did."""
+    events = []
+    recorded = {"starts": {}, "slowedSeconds": 0.0, "presets": None}
+    current = None  # event still collecting detail lines
+    attempted = False  # a TriggerSlow line has been seen for `current`
+
+    for line_number, line in enumerate(lines, 1):
+        if "[CSM]" not in line:
+            continue
+
+        if KILL_RE.search(line):
+            current = new_event("kill", line_number)
+            events.append(current)
+            attempted = False
+            continue
+        if PARRY_RE.search(line):
+            current = new_event("parry", line_number)
+            events.append(current)
+            attempted = False
+            continue
+        if LAST_STAND_RE.search(line):
+            current = new_event("last_stand", line_number)
+            events.append(current)
+            attempted = False
+            continue
+        match = NON_LETHAL_RE.search(line)
+        if match:
+            trigger = "Decapitation" if match.group(1) == "decapitation" else "Dismemberment"
+            current = new_event("slice", line_number, trigger=trigger)
+            events.append(current)
+            attempted = False
+            continue
+        match = PRESETS_RE.search(line)
+        if match:
+            recorded["presets"] = dict(zip(("intensity", "chance", "cooldown", "duration"), match.groups()))
+        match = ATTEMPT_RE.search(line)
+        if match:
+            # The TryPush/Damage Harmony patches call TriggerSlow without a detection line.
+            kind = "parry" if match.group(1) == "Parry" else "last_stand"
+            if current is None or current["kind"] != kind or attempted:
+                current = new_event(kind, line_number)
+                events.append(current)
+            attempted = True
+            continue
+
+        match = CONFIG_RE.search(line)
+        if match:
+            if current is not None:
+                current["anchor"] = float(match.group(1))
+            continue
+        match = START_RE.search(line)
+        if match:
+            starts = recorded["starts"]
+            starts[match.group(1)] = starts.get(match.group(1), 0) + 1
+            continue
+        match = ELAPSED_RE.search(line)
+        if match:
+            recorded["slowedSeconds"] += float(match.group(1))
+            continue
+        if PLAYER_DIED_RE.search(line):
+            # OnCreatureKill logs the player's own CreatureKill line just before this one.
+            if current is not None and current["kind"] == "kill":
+                current.update(kind="cancel")
+            else:
+                current = new_event("cancel", line_number)
+                events.append(current)
+            continue
+
+        if current is None:
+            continue
+        if current["kind"] == "kill":
+            if KILL_SKIP_RE.search(line):
+                events.pop()
+                current = None
+            elif DOT_KILL_RE.search(line):
+                current["status"] = True
+            elif THROWN_RE.search(line):
+                current["thrown"] = True
+            elif LAST_ENEMY_RE.search(line):
+                current["lastEnemy"] = True
+            elif SLICE_IGNORED_RE.search(line):
+                current["newSlice"] = False
+            else:
+                match = KILL_DAMAGE_RE.search(line) or HIT_PART_RE.search(line)
+                if match and match.re is KILL_DAMAGE_RE:
+                    current["damage"] = match.group(1)
+                    current["intensity"] = float(match.group(2))
+                elif match:
+                    current["head"] = match.group(1) == "True"
+                    current["sliced"] = match.group(2) == "True"
+        elif current["kind"] == "slice":
+            match = DAMAGE_INPUT_RE.search(line)
+            if match:
+                current["damage"] = match.group(1)
+                current["intensity"] = float(match.group(2))
+
+    return events, recorded
+
+
+def assign_times(events, gap: float):
+    """Give every event a time from the `SlowMo config now=` anchors (see module docstring)."""
+    anchors = []
+    offset = 0.0
+    for idx, event in enumerate(events):
+        if event["anchor"] is None:
+            continue
+        t = event["anchor"] + offset
+        if anchors and t < anchors[-1][1]:
+            # unscaledTime went backwards: a new game launch appended to the same log.
+            previous_idx, previous_t = anchors[-1]
+            offset += previous_t + gap * (idx - previous_idx) - t
+            t = previous_t + gap * (idx - previous_idx)
+        anchors.append((idx, t))
+
+    positions = np.arange(len(events), dtype=np.float64)
+    if not anchors:
+        times = positions * gap
+    else:
+        xs = np.array([idx for idx, _ in anchors], dtype=np.float64)
+        ys = np.array([t for _, t in anchors])
+        times = np.interp(positions, xs, ys)
+        times = np.where(positions < xs[0], ys[0] - gap * (xs[0] - positions), times)
+        times = np.where(positions > xs[-1], ys[-1] + gap * (positions - xs[-1]), times)
+    for event, t in zip(events, times):
+        event["time"] = float(t)
+    return len(anchors)
+
+
+def cache_key(path: Path) -> str:
+    stat = path.stat()
+    raw = f"{CACHE_VERSION}|{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def load_events(path: Path, cache_dir: Path, use_cache: bool = True):
+    """Extracted events for `path`, from the cache when the log has not changed."""
+    cache_file = cache_dir / f"{cache_key(path)}.json"
+    if use_cache and cache_file.exists():
+        return json.loads(cache_file.read_text(encoding="utf-8")), True
+
+    with open_log_text(str(path)) as handle:
+        events, recorded = extract_events(handle)
+    data = {"source": str(path), "events": events, "recorded": recorded}
+    if use_cache:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data), encoding="utf-8")
+        os.replace(tmp, cache_file)
+    return data, False
+
+
+# Worker state, set once per process by `init_worker`.
+_EVENTS = None
+_ROLLS = None
+_TRIGGERS = None
+_PRIORITY = None
+_MULTIPLIERS = None
+
+
+def init_worker(events, rolls, triggers, priority, multipliers):
+    global _EVENTS, _ROLLS, _TRIGGERS, _PRIORITY, _MULTIPLIERS
+    _EVENTS = events
+    _ROLLS = rolls
+    _TRIGGERS = triggers
+    _PRIORITY = priority
+    _MULTIPLIERS = multipliers
+
+
+def replay(table):
+    """Run the recorded events through one configuration; `table` holds per-trigger preset values."""
+    damage_mult, dot_mult, thrown_mult, intensity_max = _MULTIPLIERS
+    t_index = {name: idx for idx, name in enumerate(_TRIGGERS)}
+    n_triggers = len(_TRIGGERS)
+
+    global_cd_end = 0.0
+    trigger_cd_end = [0.0] * n_triggers
+    active_type = -1
+    active_end = 0.0
+    easing_end = 0.0
+    last_scale = 1.0
+    starts = [0] * n_triggers
+    reasons = [0] * len(REASONS)
+    active_seconds = 0.0
+    easing_seconds = 0.0
+    scale_seconds = 0.0
+
+    for event_idx, event in enumerate(_EVENTS):
+        now = event["time"]
+        kind = event["kind"]
+
+        if kind == "cancel":
+            # CancelSlowMotion restores the time scale at once; cooldowns stay as they were.
+            if active_type >= 0 and now < active_end:
+                active_seconds -= active_end - now
+                scale_seconds -= (active_end - now) * last_scale
+                easing_seconds -= easing_end - active_end
+                active_end = easing_end = now
+            continue
+
+        if kind == "kill":
+            # EventHooks.OnCreatureKill; a sliced part already handled by IsNewSlice ends the cascade.
+            stages = ["LastEnemy"] if event["lastEnemy"] else []
+            head, sliced = event["head"], event["sliced"]
+            if head and sliced:
+                if event["newSlice"]:
+                    stages += ["Decapitation", "Critical"]
+            elif head:
+                stages += ["Critical", "BasicKill"]
+            elif sliced:
+                if event["newSlice"]:
+                    stages += ["Dismemberment", "BasicKill"]
+            else:
+                stages.append("BasicKill")
+        elif kind == "slice":
+            stages = [event["trigger"]]
+        else:
+            stages = ["Parry" if kind == "parry" else "LastStand"]
+
+        for stage_idx, trigger in enumerate(stages):
+            t = t_index[trigger]
+            chance, base_scale, duration, cooldown, easing, enabled = table[t]
+            from_kill = kind == "kill"
+            typed = kind in ("kill", "slice")
+            status = from_kill and event["status"]
+            thrown = from_kill and event["thrown"]
+            group = DAMAGE_GROUPS.get(event["damage"]) if typed else None
+            type_mult = damage_mult[group] if group is not None else 1.0
+
+            if status and dot_mult <= 0.0:
+                reason = "DOTKillDisabled"
+            elif thrown and thrown_mult <= 0.0:
+                reason = "ThrownWeaponDisabled"
+            elif type_mult <= 0.0:
+                reason = "DamageTypeDisabled"
+            elif not enabled:
+                reason = "TriggerDisabled"
+            elif now < global_cd_end:
+                reason = "GlobalCooldown"
+            elif now < trigger_cd_end[t]:
+                reason = "TriggerCooldown"
+            elif active_type >= 0 and now < active_end and _PRIORITY[t] <= _PRIORITY[active_type]:
+                reason = "AlreadyActive"
+            elif now >= active_end and now < easing_end:
+                reason = "EasingOut"
+            elif chance < 1.0 and _ROLLS[event_idx][stage_idx] > chance:
+                reason = "ChanceFailed"
+            else:
+                reason = "Success"
+            reasons[REASONS.index(reason)] += 1
+            if reason != "Success":
+                continue
+
+            if active_type >= 0 and now < active_end:
+                active_seconds -= active_end - now
+                scale_seconds -= (active_end - now) * last_scale
+                easing_seconds -= easing_end - active_end
+
+            intensity = min(max(event["intensity"], 0.0), 1.0) if typed else 0.0
+            multiplier = type_mult * (1.0 + (intensity_max - 1.0) * intensity)
+            multiplier *= (dot_mult if status else 1.0) * (thrown_mult if thrown else 1.0)
+            scale = base_scale
+            if multiplier != 1.0:
+                scale = min(max(scale / multiplier, 0.01), 1.0)
+            last_scale = min(max(scale, 0.005), 1.0)
+
+            active_type = t
+            active_end = now + duration
+            easing_end = active_end + easing
+            global_cd_end = now + duration + easing
+            trigger_cd_end[t] = global_cd_end + cooldown
+            starts[t] += 1
+            active_seconds += duration
+            easing_seconds += easing
+            scale_seconds += duration * last_scale
+            break
+
+    return {
+        "slowmos": sum(starts),
+        "byTrigger": {name: starts[t] for t, name in enumerate(_TRIGGERS) if starts[t]},
+        "slowedSeconds": active_seconds,
+        "easingSeconds": easing_seconds,
+        "meanTimeScale": scale_seconds / active_seconds if active_seconds else 1.0,
+        "reasons": {REASONS[r]: count for r, count in enumerate(reasons) if count},
+    }
+
+
+def config_tables(model: PresetModel, combos):
+    """Per-combination rows of (chance, timeScale, duration, cooldown, easing, enabled) per trigger."""
+    arrays = preset_arrays(model, combos)
+    fields = ("chance", "timeScale", "duration", "cooldown", "easing", "enabled")
+    tables = []
+    for c in range(len(combos)):
+        tables.append(
+            [
+                tuple(float(arrays[name][c, t]) if name != "enabled" else bool(arrays[name][c, t]) for name in fields)
+                for t in range(len(model.triggers))
+            ]
+        )
+    return tables
+
+
+def print_results(source, events, anchors, recorded, results, model: PresetModel):
+    kinds = {}
+    for event in events:
+        kinds[event["kind"]] = kinds.get(event["kind"], 0) + 1
+    span = events[-1]["time"] - events[0]["time"] if events else 0.0
+    print("=== Preset replay ===")
+    print(f"Source: {source}")
+    print(
+        f"Events: {len(events)} ("
+        + ", ".join(f"{kind}={count}" for kind, count in sorted(kinds.items()))
+        + f"), time anchors={anchors}, span={span:.0f}s"
+    )
+    recorded_total = sum(recorded["starts"].values())
+    presets = recorded["presets"]
+    label = " ".join(f"{axis}={value}" for axis, value in presets.items()) if presets else "unknown presets"
+    print(
+        f"Recorded: slowmos={recorded_total} slowed={recorded['slowedSeconds']:.1f}s ({label}) "
+        + " ".join(f"{name}={count}" for name, count in sorted(recorded["starts"].items()))
+    )
+    print()
+    header = f"{'configuration':<48} {'slowmos':>7} {'slowed s':>9} {'easing s':>9} {'scale':>6}  by trigger"
+    print(header)
+    print("-" * len(header))
+    for combo, result in results:
+        by_trigger = " ".join(f"{name}={count}" for name, count in result["byTrigger"].items())
+        print(
+            f"{format_combo(combo, model):<48} {result['slowmos']:>7} {result['slowedSeconds']:>9.1f} "
+            f"{result['easingSeconds']:>9.1f} {result['meanTimeScale']:>6.3f}  {by_trigger}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded CSM combat events against preset configurations")
+    parser.add_argument("log", type=Path, help="Player.log with CSM debug logging (plain, gz, bz2, xz or zip)")
+    for axis in AXES[1:]:
+        parser.add_argument(f"--{axis}", help=f"{axis.capitalize()} preset(s), comma-separated or 'all'")
+    add_multiplier_arguments(parser)
+    parser.add_argument("--event-gap", type=float, default=DEFAULT_EVENT_GAP,
+                        help="Seconds between events outside the SlowMo config time anchors")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="Seed for the shared chance rolls")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--cache-dir", type=Path, default=DEFAULT_CACHE_DIR, help="Extracted event cache")
+    parser.add_argument("--no-cache", action="store_true", help="Re-extract events and do not write the cache")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        model = PresetModel.from_sources()
+        combos = expand_combos(model, {axis: getattr(args, axis) for axis in AXES[1:]})
+        data, cached = load_events(args.log, args.cache_dir, not args.no_cache)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    events = data["events"]
+    anchors = assign_times(events, args.event_gap)
+    rolls = np.random.default_rng(args.seed).random((len(events), ROLLS_PER_EVENT)).tolist()
+    multipliers = (tuple(args.damage_mult), args.dot_mult, args.thrown_mult, args.intensity_max)
+    priority = [model.trigger_values[name] for name in model.triggers]
+    init_args = (events, rolls, list(model.triggers), priority, multipliers)
+    tables = config_tables(model, combos)
+
+    jobs = max(1, min(args.jobs, len(tables)))
+    if jobs == 1:
+        init_worker(*init_args)
+        outcomes = [replay(table) for table in tables]
+    else:
+        chunk = max(1, len(tables) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=init_args) as pool:
+            outcomes = list(pool.map(replay, tables, chunksize=chunk))
+    results = list(zip(combos, outcomes))
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "source": data["source"],
+                    "cached": cached,
+                    "events": len(events),
+                    "timeAnchors": anchors,
+                    "recorded": data["recorded"],
+                    "results": [dict(result, presets=combo) for combo, result in results],
+                },
+                indent=2,
+            )
+        )
+    else:
+        print_results(data["source"], events, anchors, data["recorded"], results, model)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,140 @@
+"""Small dependency-graph runner with a timeline and resumable completion state.
+
+Steps whose dependencies are complete run in parallel on a thread pool. After every
+successful step the completed set is written to a state file; a later run with the same
+fingerprint (e.g. tag + commit) treats those steps as done and resumes from the first
+one that failed or never ran. Per-step wall times go to a JSON timeline.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+
+class Step:
+    def __init__(self, name: str, action, deps=(), description: str = ""):
+        self.name = name
+        self.action = action
+        self.deps = tuple(deps)
+        self.description = description or name
+
+
+def _check_graph(steps):
+    names = {step.name for step in steps}
+    if len(names) != len(steps):
+        raise ValueError("Duplicate step names")
+    for step in steps:
+        missing = [dep for dep in step.deps if dep not in names]
+        if missing:
+            raise ValueError(f"Step {step.name} depends on unknown step(s): {', '.join(missing)}")
+    done, remaining = set(), list(steps)
+    while remaining:
+        ready = [step for step in remaining if all(dep in done for dep in step.deps)]
+        if not ready:
+            raise ValueError(f"Dependency cycle among: {', '.join(step.name for step in remaining)}")
+        done.update(step.name for step in ready)
+        remaining = [step for step in remaining if step.name not in done]
+
+
+def _write_json(path: Path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_state(state_path: Path, fingerprint: str):
+    """Completed step names from a previous run with the same fingerprint."""
+    if not state_path.exists():
+        return set()
+    try:
+        state = json.loads(state_path.read_text(encoding="utf-8"))
+    except ValueError:
+        return set()
+    return set(state.get("done", [])) if state.get("fingerprint") == fingerprint else set()
+
+
+def run_graph(steps, state_path: Path, timeline_path: Path, fingerprint: str,
+              restart: bool = False, skip=(), jobs: int | None = None, log=print) -> bool:
+    """Run `steps`; returns True when every step is done. Never raises for a failing step."""
+    _check_graph(steps)
+    by_name = {step.name: step for step in steps}
+    done = set() if restart else load_state(state_path, fingerprint) & set(by_name)
+    records = {step.name: {"name": step.name, "deps": list(step.deps), "status": "pending"} for step in steps}
+    for name in done:
+        records[name]["status"] = "resumed"
+    for name in skip:
+        if name in records and name not in done:
+            records[name]["status"] = "skipped"
+    completed = set(done) | {name for name in skip if name in records}
+
+    started = time.time()
+    origin = time.perf_counter()
+    failed = False
+
+    def save_state():
+        _write_json(state_path, {"fingerprint": fingerprint, "done": sorted(done)})
+
+    def execute(step):
+        record = records[step.name]
+        record["start"] = round(time.perf_counter() - origin, 3)
+        log(f"--- [{step.name}] {step.description}")
+        try:
+            step.action()
+        finally:
+            record["end"] = round(time.perf_counter() - origin, 3)
+            record["seconds"] = round(record["end"] - record["start"], 3)
+
+    with ThreadPoolExecutor(max_workers=jobs or len(steps)) as pool:
+        running = {}
+        while True:
+            if not failed:
+                for step in steps:
+                    if (records[step.name]["status"] == "pending" and step.name not in running.values()
+                            and all(dep in completed for dep in step.deps)):
+                        records[step.name]["status"] = "running"
+                        running[pool.submit(execute, step)] = step.name
+            if not running:
+                break
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.exception()
+                if error is None:
+                    records[name]["status"] = "done"
+                    completed.add(name)
+                    done.add(name)
+                    save_state()
+                else:
+                    failed = True
+                    records[name]["status"] = "failed"
+                    records[name]["error"] = "".join(traceback.format_exception_only(type(error), error)).strip()
+                    log(f"!!! [{name}] failed: {records[name]['error']}")
+
+    for record in records.values():
+        if record["status"] == "pending":
+            record["status"] = "blocked"
+    save_state()
+    _write_json(timeline_path, {
+        "fingerprint": fingerprint,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "wallSeconds": round(time.perf_counter() - origin, 3),
+        "steps": [records[step.name] for step in steps],
+    })
+    return all(records[name]["status"] in ("done", "resumed", "skipped") for name in records)
+
+
+def format_timeline(timeline_path: Path) -> str:
+    data = json.loads(timeline_path.read_text(encoding="utf-8"))
+    lines = [f"{'step':<10} {'status':<8} {'start':>7} {'seconds':>8}"]
+    for record in data["steps"]:
+        start = f"{record['start']:.2f}" if "start" in record else "-"
+        seconds = f"{record['seconds']:.2f}" if "seconds" in record else "-"
+        lines.append(f"{record['name']:<10} {record['status']:<8} {start:>7} {seconds:>8}")
+    lines.append(f"total wall time {data['wallSeconds']:.2f}s")
+    return "\n".join(lines)
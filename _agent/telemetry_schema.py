@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Schema of the `[CSM] diag evt=` lines, extracted from CSMTelemetry.cs, and parsers built from it.
+
+Every Debug.Log call in Core/CSMTelemetry.cs whose first operand starts with
+"[CSM] diag evt=" is split at its top-level `+` operands into an ordered field list:
+
+    " key=" + expr                   field `key`; type from expr
+    " key=" + x.ToString("F1") + "%"  type float, format F1, unit %
+    " key=literal"                   constant field (e.g. deferredQueue=off)
+    " key=" + FormatTop(map)         top-N list, `reason:count|...` or `none`
+
+Types of plain identifiers come from their declarations in CSMTelemetry.cs or, for
+`CSMModOptions.X`, CSMModOptions.cs. The schema is written to telemetry_schema.json;
+`--check` exits 1 when the committed copy no longer matches the C# source.
+
+compile_parsers() turns each event's field list into one anchored regex
+(`run=(\S*) uptimeSec=(\S*) ...`) whose groups are zipped with the field names, about
+twice as fast as the generic key=value findall on the wide summary lines. A parser
+returns None when a line does not match (older builds, edited fields), so callers fall
+back to the generic scan.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+
+from cs_source import tokenize
+
+AGENT_DIR = Path(__file__).resolve().parent
+ROOT = AGENT_DIR.parent
+TELEMETRY_SOURCE = "Core/CSMTelemetry.cs"
+OPTIONS_SOURCE = "Configuration/CSMModOptions.cs"
+SCHEMA_PATH = AGENT_DIR / "telemetry_schema.json"
+SCHEMA_VERSION = 1
+
+DIAG_PREFIX = re.compile(r"^\[(\w+)\] diag evt=")
+LITERAL_KEY_RE = re.compile(r"(?:^|\s)([A-Za-z0-9_]+)=")
+DECLARED_TYPES = {"int": "int", "long": "int", "float": "float", "double": "float", "bool": "bool", "string": "str"}
+
+
+def _literal(text: str) -> str:
+    body = text[1:-1]
+    return body.replace('\\"', '"').replace("\\\\", "\\")
+
+
+def _operands(tokens):
+    """Split an argument list at top-level `+` into operand token lists."""
+    operands, current, depth = [], [], 0
+    for tok in tokens:
+        if tok.kind == "op" and tok.text in ("(", "["):
+            depth += 1
+        elif tok.kind == "op" and tok.text in (")", "]"):
+            depth -= 1
+        if tok.kind == "op" and tok.text == "+" and depth == 0:
+            operands.append(current)
+            current = []
+        else:
+            current.append(tok)
+    operands.append(current)
+    return operands
+
+
+def _declared_type(name: str, qualifier: str | None, sources) -> str:
+    text = sources[OPTIONS_SOURCE] if qualifier == "CSMModOptions" else sources[TELEMETRY_SOURCE]
+    match = re.search(rf"\b({'|'.join(DECLARED_TYPES)})\s+{re.escape(name)}\b", text)
+    return DECLARED_TYPES[match.group(1)] if match else "str"
+
+
+def _value_spec(parts, sources):
+    """Type, format and unit of one field from its operands (literal str or token list)."""
+    exprs = [part for part in parts if not isinstance(part, str)]
+    literals = "".join(part for part in parts if isinstance(part, str))
+    if not exprs:
+        return {"type": "const", "value": literals}
+    spec = {}
+    texts = [t.text for t in exprs[0]]
+    if len(exprs) > 1:
+        spec["type"] = "str"
+    elif texts and texts[0] == "FormatTop":
+        spec["type"] = "top"
+    elif len(texts) >= 4 and texts[-4:-1] == ["ToString", "(", texts[-2]] and texts[-1] == ")" and texts[-2].startswith('"'):
+        spec["type"] = "float"
+        spec["format"] = _literal(texts[-2])
+    elif all(t == "." or t[:1].isalpha() or t[:1] == "_" for t in texts):
+        qualifier = texts[-3] if len(texts) >= 3 else None
+        spec["type"] = _declared_type(texts[-1], qualifier, sources)
+    else:
+        spec["type"] = "str"
+    if literals:
+        spec["unit"] = literals
+    return spec
+
+
+def extract_schema(sources):
+    """{"mod", "events": {event: {"source", "fields": [{name, type, ...}]}}} from the C# sources."""
+    tokens = tokenize(sources[TELEMETRY_SOURCE])
+    events = {}
+    mod = None
+    for i in range(len(tokens) - 3):
+        if not (tokens[i].text == "Debug" and tokens[i + 1].text == "." and tokens[i + 2].text.startswith("Log")
+                and tokens[i + 3].text == "("):
+            continue
+        depth, end = 0, i + 3
+        for end in range(i + 3, len(tokens)):
+            if tokens[end].kind == "op" and tokens[end].text == "(":
+                depth += 1
+            elif tokens[end].kind == "op" and tokens[end].text == ")":
+                depth -= 1
+                if depth == 0:
+                    break
+        operands = _operands(tokens[i + 4:end])
+        first = operands[0]
+        if len(first) != 1 or first[0].kind != "string" or first[0].holes is not None:
+            continue
+        head = DIAG_PREFIX.match(_literal(first[0].text))
+        if not head:
+            continue
+        mod = head.group(1)
+
+        fields, current = [], None
+        for operand in operands:
+            if len(operand) == 1 and operand[0].kind == "string" and operand[0].holes is None:
+                text = _literal(operand[0].text)
+                pos = 0
+                for match in LITERAL_KEY_RE.finditer(text):
+                    if current is not None and match.start() > pos:
+                        current["parts"].append(text[pos:match.start()])
+                    current = {"name": match.group(1), "parts": []}
+                    fields.append(current)
+                    pos = match.end()
+                if current is not None and pos < len(text):
+                    current["parts"].append(text[pos:])
+            elif current is not None:
+                current["parts"].append(operand)
+        event = next(f for f in fields if f["name"] == "evt")
+        event_name = "".join(p for p in event["parts"] if isinstance(p, str)).strip()
+        events[event_name] = {
+            "source": f"{TELEMETRY_SOURCE}:{tokens[i].line}",
+            "fields": [dict(name=f["name"], **_value_spec(f["parts"], sources)) for f in fields if f["name"] != "evt"],
+        }
+    if not events:
+        raise ValueError(f"No diag evt= log calls found in {TELEMETRY_SOURCE}")
+    return {"version": SCHEMA_VERSION, "mod": mod, "events": events}
+
+
+def read_sources(root: Path = ROOT):
+    return {rel: (root / rel).read_text(encoding="utf-8-sig") for rel in (TELEMETRY_SOURCE, OPTIONS_SOURCE)}
+
+
+def render(schema) -> str:
+    return json.dumps(schema, indent=2) + "\n"
+
+
+def compile_event_parser(event: str, fields):
+    """A function tail -> {field: value} (or None on mismatch) specialised to one event's field order."""
+    names = tuple(field["name"] for field in fields)
+    match = re.compile(" ".join(f"{re.escape(name)}=(\\S*)" for name in names)).fullmatch
+
+    def parse(tail):
+        found = match(tail)
+        return dict(zip(names, found.groups())) if found else None
+
+    parse.__name__ = f"parse_{event}"
+    return parse
+
+
+def compile_parsers(schema):
+    """{(mod, event): parser} for every event in `schema`."""
+    return {(schema["mod"], event): compile_event_parser(event, spec["fields"]) for event, spec in schema["events"].items()}
+
+
+class DiagRecord:
+    """Typed fields of one known diag event; reads like the {key: text} dicts of the generic path.
+
+    `_values` holds the matched text of every field (units stripped); each field name is a
+    property that converts its text on access, so decoding does no per-field work.
+    """
+
+    __slots__ = ("_values",)
+    event = ""
+    names: tuple[str, ...] = ()
+    specs: dict = {}
+    positions: dict = {}
+
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self.specs else default
+
+    def __getitem__(self, key):
+        if key not in self.specs:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key):
+        return key in self.specs
+
+    def keys(self):
+        return self.names
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in self.names]
+
+    def text(self, key, default=None):
+        """A field exactly as CSMTelemetry wrote it (`54.9%`, `True`), or `default` if absent."""
+        if key not in self.specs:
+            return default
+        return self._values[self.positions[key]] + self.specs[key].get("unit", "")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.names)})"
+
+
+# Group pattern per field type; a value of the wrong shape fails the match, so the line
+# falls back to the generic scan instead of failing later on access.
+VALUE_PATTERNS = {"int": r"(-?\d+)", "float": r"(-?\d+(?:\.\d+)?)", "bool": r"(True|False)"}
+ANY_VALUE = r"(\S*)"
+
+
+def _is_true(value):
+    return value == "True"
+
+
+def _field_property(position: int, convert):
+    if convert is None:
+        return property(lambda record: record._values[position])
+    return property(lambda record: convert(record._values[position]))
+
+
+def compile_event_record(event: str, fields):
+    """(record class, decoder tail -> record or None) for one event.
+
+    The decoder is one anchored match whose group patterns check each field's type; the
+    record keeps the matched text and converts int/float/bool fields when they are read.
+    That makes decoding cheaper than building the {key: text} dict of compile_event_parser,
+    and text() always gives back what the game wrote.
+    """
+    names = tuple(field["name"] for field in fields)
+    specs = {field["name"]: field for field in fields}
+    converters = {"int": int, "float": float, "bool": _is_true}
+    namespace = {"__slots__": (), "event": event, "names": names, "specs": specs,
+                 "positions": {name: position for position, name in enumerate(names)}}
+    for position, field in enumerate(fields):
+        namespace[field["name"]] = _field_property(position, converters.get(field["type"]))
+    cls = type(f"Diag_{event}", (DiagRecord,), namespace)
+    # Units are matched outside the group, so `triggerRate=54.9%` captures `54.9`.
+    match = re.compile(" ".join(f"{re.escape(field['name'])}={VALUE_PATTERNS.get(field['type'], ANY_VALUE)}"
+                                f"{re.escape(field.get('unit', ''))}" for field in fields)).fullmatch
+    new = object.__new__
+    store = DiagRecord._values.__set__
+
+    def decode(tail):
+        found = match(tail)
+        if found is None:
+            return None
+        record = new(cls)
+        store(record, found.groups())
+        return record
+
+    decode.__name__ = f"decode_{event}"
+    return cls, decode
+
+
+def compile_records(schema):
+    """{(mod, event): decoder} returning DiagRecord subclasses for every event in `schema`."""
+    return {(schema["mod"], event): compile_event_record(event, spec["fields"])[1]
+            for event, spec in schema["events"].items()}
+
+
+def load_schema(path: Path = SCHEMA_PATH):
+    """The committed schema, or None when it is missing, unreadable or from another version."""
+    try:
+        schema = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return schema if schema.get("version") == SCHEMA_VERSION else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Extract the diag evt= line schema from CSMTelemetry.cs")
+    parser.add_argument("--root", type=Path, default=ROOT, help="Repository root")
+    parser.add_argument("--output", type=Path, default=SCHEMA_PATH, help="Schema file to write")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if the schema file is stale")
+    parser.add_argument("--print", action="store_true", help="Print event -> fields instead of writing")
+    args = parser.parse_args()
+
+    try:
+        schema = extract_schema(read_sources(args.root))
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    if args.print:
+        for event, spec in schema["events"].items():
+            fields = []
+            for field in spec["fields"]:
+                detail = field["type"] + (f":{field['format']}" if "format" in field else "") + field.get("unit", "")
+                fields.append(f"{field['name']}={field['value']}" if field["type"] == "const" else f"{field['name']}({detail})")
+            print(f"{event} [{spec['source']}]: {' '.join(fields)}")
+        return 0
+
+    text = render(schema)
+    current = args.output.read_text(encoding="utf-8") if args.output.exists() else None
+    counts = ", ".join(f"{event}={len(spec['fields'])}" for event, spec in schema["events"].items())
+    if args.check:
+        if current != text:
+            print(f"Stale telemetry schema: {args.output.name} (run telemetry_schema.py)", file=sys.stderr)
+            return 1
+        print(f"Telemetry schema up to date ({counts})")
+        return 0
+    if current != text:
+        args.output.write_text(text, encoding="utf-8", newline="\n")
+    print(f"Wrote {args.output.name} ({counts}; {'changed' if current != text else 'unchanged'})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
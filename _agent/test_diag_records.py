@@ -0,0 +1,67 @@
+"""Parity checks between the typed DiagRecord path and the {key: text} path of player_log_report.
+
+    python -m unittest discover -s _agent -p "test_*.py"
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import telemetry_schema
+from gen_player_log import generate
+from player_log_report import DIAG_RE, MODS, decode_diag_fields, parse_diag_fields, parse_key_values
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_report(*args):
+    return subprocess.run([sys.executable, "player_log_report.py", *args], cwd=AGENT_DIR, capture_output=True, text=True)
+
+
+class DiagRecordParityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.log_path = os.path.join(cls.tmp.name, "Player.log")
+        generate(cls.log_path, 256 * 1024, 5, list(MODS), 3, (20, 60), 12, 0.02)
+        with open(cls.log_path, encoding="utf-8") as handle:
+            cls.diag = [match.groups() for match in map(DIAG_RE.search, handle) if match]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_records_keep_logged_text(self):
+        decoded = 0
+        for mod, event, tail in self.diag:
+            tail = tail.strip()
+            record = decode_diag_fields(mod, event, tail)
+            if not isinstance(record, telemetry_schema.DiagRecord):
+                continue
+            decoded += 1
+            logged = parse_key_values(tail)
+            self.assertEqual(list(record.keys()), list(logged), tail)
+            for key, value in logged.items():
+                self.assertEqual(record.text(key), value, f"{event} {key}")
+        self.assertGreater(decoded, 0)
+
+    def test_records_match_field_parsers(self):
+        for mod, event, tail in self.diag:
+            tail = tail.strip()
+            record = decode_diag_fields(mod, event, tail)
+            if isinstance(record, telemetry_schema.DiagRecord):
+                fields = parse_diag_fields(mod, event, tail)
+                self.assertEqual({key: record.text(key) for key in record.keys()}, fields, tail)
+
+    def test_report_matches_text_fields(self):
+        records = run_report(self.log_path)
+        text = run_report(self.log_path, "--text-fields")
+        self.assertEqual(records.returncode, 0, records.stderr)
+        self.assertIn("kpi: ", records.stdout)
+        self.assertEqual(records.stdout, text.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""Checks the golden vectors against the C# preset lookups CSM.Tests goes through.
+
+PresetVectorTests assigns the CSV's chance/cooldown/duration cells to the *PresetSetting
+fields, which ParsePreset resolves through BuildPresetMap (option labels and values,
+case-insensitive). These tests resolve each cell the same way, so a cell that would fall
+back to Default in C# fails here too.
+
+    python -m unittest discover -s _agent -p "test_*.py"
+"""
+
+import csv
+import re
+import unittest
+
+import numpy as np
+
+import gen_test_vectors
+from cs_source import CSM_OPTIONS, parse_preset_options, read_source
+from preset_model import PresetModel
+
+EXPECTED = {"chance": ("expChance", "chance_tc"), "cooldown": ("expCooldown", "cooldown_tk"),
+            "duration": ("expDuration", "duration_td")}
+
+
+class PresetVectorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.options_text = read_source(CSM_OPTIONS)
+        cls.model = PresetModel.from_sources()
+        with open(gen_test_vectors.OUTPUT_DIR / gen_test_vectors.PRESET_FILE, encoding="utf-8") as handle:
+            cls.rows = list(csv.DictReader(line for line in handle if not line.startswith("#")))
+
+    def preset_map(self, enum):
+        """BuildPresetMap without aliases: label and value -> member, case-insensitive."""
+        found = {}
+        for label, value, member in re.findall(
+            rf'new\s+PresetOption<{enum}>\(\s*"([^"]*)"\s*,\s*"([^"]*)"\s*,\s*\w+\.(\w+)\s*\)', self.options_text
+        ):
+            found[label.casefold()] = member
+            found[value.casefold()] = member
+        return found
+
+    def test_committed_vectors_are_current(self):
+        files = gen_test_vectors.build(self.model, self.options_text)
+        path = gen_test_vectors.OUTPUT_DIR / gen_test_vectors.PRESET_FILE
+        self.assertEqual(path.read_text(encoding="utf-8"), files[gen_test_vectors.PRESET_FILE])
+
+    def test_every_option_value_is_written(self):
+        options = parse_preset_options(self.options_text)
+        for axis, enum in gen_test_vectors.SETTING_ENUMS.items():
+            self.assertEqual(sorted(options[enum]), sorted(self.model.axes[axis]), enum)
+
+    def test_setting_cells_resolve_to_their_preset(self):
+        for axis, enum in gen_test_vectors.SETTING_ENUMS.items():
+            lookup = self.preset_map(enum)
+            column, table = EXPECTED[axis]
+            values = getattr(self.model, table).astype(np.float32)
+            for row in self.rows:
+                member = lookup.get(row[axis].casefold())
+                self.assertIsNotNone(member, f"{axis}={row[axis]!r} would fall back to Default in ParsePreset")
+                trigger = self.model.triggers.index(row["trigger"])
+                expected = values[trigger, self.model.axes[axis].index(member)]
+                self.assertEqual(row[column], gen_test_vectors.fmt(expected), f"{row['trigger']} {axis}={row[axis]}")
+
+
+if __name__ == "__main__":
+    unittest.main()
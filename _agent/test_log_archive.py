@@ -0,0 +1,72 @@
+"""Round-trip checks for log_archive: compact a generated log, read it back, use and invalidate the index.
+
+    python -m unittest discover -s _agent -p "test_*.py"
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import log_archive
+import log_index
+from gen_player_log import generate
+from player_log_report import MODS, load_log
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_tool(*args):
+    return subprocess.run([sys.executable, *args], cwd=AGENT_DIR, capture_output=True, text=True)
+
+
+def without_scope(report: str):
+    return [line for line in report.splitlines() if not line.startswith("scope:")]
+
+
+class ArchiveRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.log_path = os.path.join(self.tmp.name, "Player.log")
+        self.archive_path = self.log_path + ".csmlog"
+        generate(self.log_path, 256 * 1024, 11, list(MODS), 3, (20, 60), 12, 0.02)
+        log_archive.compact_log(self.log_path, self.archive_path, block_records=64)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_archive_matches_plain_log(self):
+        self.assertEqual(log_archive.load_archive(self.archive_path), load_log(self.log_path, records=False))
+
+    def test_text_lines_match_plain_log(self):
+        with open(self.log_path, encoding="utf-8") as handle:
+            lines = handle.read().split("\n")
+        archived = list(log_archive.iter_text_lines(self.archive_path))
+        self.assertTrue(archived)
+        for line, text in archived:
+            self.assertEqual(text, lines[line - 1].strip())
+
+    def test_index_finds_latest_starts(self):
+        self.assertIsNotNone(log_archive.read_index(self.archive_path))
+        index, _ = log_index.update_index(self.log_path, write=False)
+        expected = {mod: start[0] for mod, start in log_index.latest_starts(index, MODS).items()}
+        self.assertEqual(log_archive.latest_starts(self.archive_path, MODS), expected)
+
+    def test_stale_index_is_ignored(self):
+        stat = os.stat(self.archive_path)
+        os.utime(self.archive_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(log_archive.read_index(self.archive_path))
+        self.assertIsNone(log_archive.latest_starts(self.archive_path, MODS))
+        self.assertEqual(log_archive.load_archive(self.archive_path), load_log(self.log_path, records=False))
+
+    def test_latest_archive_matches_indexed_plain_log(self):
+        plain = run_tool("player_log_report.py", self.log_path, "--latest", "--index")
+        archived = run_tool("player_log_report.py", self.archive_path, "--latest")
+        self.assertEqual(archived.returncode, 0, archived.stderr)
+        self.assertIn("[CSM] run=", plain.stdout)
+        self.assertEqual(without_scope(archived.stdout), without_scope(plain.stdout))
+
+
+if __name__ == "__main__":
+    unittest.main()
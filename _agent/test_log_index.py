@@ -0,0 +1,68 @@
+"""Checks for log_index and player_log_report --show-context on plain logs and compact archives.
+
+    python -m unittest discover -s _agent -p "test_*.py"
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import log_archive
+import log_index
+from gen_player_log import generate
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_tool(*args):
+    return subprocess.run([sys.executable, *args], cwd=AGENT_DIR, capture_output=True, text=True)
+
+
+class ShowContextTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.log_path = os.path.join(cls.tmp.name, "Player.log")
+        cls.archive_path = cls.log_path + ".csmlog"
+        generate(cls.log_path, 256 * 1024, 7, ["CSM", "DOT"], 2, (20, 60), 12, 0.02)
+        log_archive.compact_log(cls.log_path, cls.archive_path)
+        index, _ = log_index.update_index(cls.log_path, write=False)
+        cls.run_id, by_mod = next(iter(index["runs"].items()))
+        cls.start_line = next(iter(by_mod.values()))["session_start"][0]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_update_index_rejects_archive(self):
+        with self.assertRaisesRegex(ValueError, "compact archive"):
+            log_index.update_index(self.archive_path, write=False)
+
+    def test_show_context_plain_log(self):
+        result = run_tool("player_log_report.py", self.log_path, "--show-context", f"run={self.run_id}", "-C", "0")
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn(f"{self.start_line:>9}: ", result.stdout)
+        self.assertIn(f"evt=session_start run={self.run_id}", result.stdout)
+
+    def test_show_context_archive_matches_plain_log(self):
+        plain = run_tool("player_log_report.py", self.log_path, "--show-context", f"run={self.run_id}", "-C", "0")
+        archived = run_tool("player_log_report.py", self.archive_path, "--show-context", f"run={self.run_id}", "-C", "0")
+        self.assertEqual(archived.returncode, 0, archived.stderr)
+        targets = [line.split(":", 1)[0] for line in archived.stdout.splitlines() if line != "--"]
+        self.assertEqual(targets, [line.split(":", 1)[0] for line in plain.stdout.splitlines() if line != "--"])
+
+    def test_show_context_archive_unknown_run(self):
+        result = run_tool("player_log_report.py", self.archive_path, "--show-context", "run=missing")
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("run missing is not in the archive", result.stderr)
+
+    def test_index_build_rejects_archive(self):
+        result = run_tool("log_index.py", "build", self.archive_path)
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("index is only supported for plain logs", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
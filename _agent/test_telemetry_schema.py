@@ -0,0 +1,60 @@
+"""Checks that telemetry_schema --check catches drift between CSMTelemetry.cs and the schema file.
+
+    python -m unittest discover -s _agent -p "test_*.py"
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import telemetry_schema
+
+AGENT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def run_schema(*args):
+    return subprocess.run([sys.executable, "telemetry_schema.py", *args], cwd=AGENT_DIR, capture_output=True, text=True)
+
+
+class SchemaCheckTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        for rel in (telemetry_schema.TELEMETRY_SOURCE, telemetry_schema.OPTIONS_SOURCE):
+            (self.root / rel).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(telemetry_schema.ROOT / rel, self.root / rel)
+        self.output = self.root / "telemetry_schema.json"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_committed_schema_is_current(self):
+        result = run_schema("--check", "--root", str(self.root), "--output", str(telemetry_schema.SCHEMA_PATH))
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_check_fails_after_source_change(self):
+        source = self.root / telemetry_schema.TELEMETRY_SOURCE
+        text = source.read_text(encoding="utf-8-sig")
+        self.assertIn('" worstDropMs="', text)
+        source.write_text(text.replace('" worstDropMs="', '" worstFrameDropMs="'), encoding="utf-8")
+
+        result = run_schema("--check", "--root", str(self.root), "--output", str(telemetry_schema.SCHEMA_PATH))
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("Stale telemetry schema", result.stderr)
+
+        self.assertEqual(run_schema("--root", str(self.root), "--output", str(self.output)).returncode, 0)
+        self.assertIn('"worstFrameDropMs"', self.output.read_text(encoding="utf-8"))
+        result = run_schema("--check", "--root", str(self.root), "--output", str(self.output))
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+    def test_check_fails_without_schema_file(self):
+        result = run_schema("--check", "--root", str(self.root), "--output", str(self.output))
+        self.assertEqual(result.returncode, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
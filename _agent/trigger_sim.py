@@ -0,0 +1,406 @@
+#!/usr/bin/env python3
+"""Monte Carlo reference model of CSMManager.TriggerSlow, batched across streams with NumPy.
+
+Each stream is one synthetic play session: a Poisson stream of kills, parries and
+last-stand events. Kills go through the same cascade as EventHooks.OnCreatureKill
+(LastEnemy -> Decapitation -> Critical -> Dismemberment -> BasicKill, stopping at the
+first success). Every attempt runs TriggerSlow's gates in source order:
+
+    DOT multiplier <= 0 (status kills), thrown multiplier <= 0 (thrown kills),
+    damage-type multiplier <= 0, trigger disabled, global cooldown, trigger cooldown,
+    AlreadyActive ((int)type <= (int)active type), EasingOut, chance roll.
+
+A success mirrors StartSlowMotion: easing = duration * TransitionRampPercent (unless
+the transition is Off), global cooldown ends at now + duration + easing, trigger
+cooldown at that point + cooldown. EndSlowMotion only runs on the next frame after the
+end time, so a per-start frame delay is sampled; that delay is what makes
+AlreadyActive and EasingOut reachable at all.
+
+All streams advance one event per step, so millions of events cost a few hundred
+vectorised steps. Every combination sees the same sessions, chance rolls and frame
+delays for a given --seed, so differences between combinations are not sampling noise.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import sys
+
+import numpy as np
+
+from preset_model import AXES, PresetModel
+
+REASONS = (
+    "Success",
+    "DOTKillDisabled",
+    "ThrownWeaponDisabled",
+    "DamageTypeDisabled",
+    "TriggerDisabled",
+    "GlobalCooldown",
+    "TriggerCooldown",
+    "AlreadyActive",
+    "EasingOut",
+    "ChanceFailed",
+)
+SUCCESS = REASONS.index("Success")
+
+KILL_CASCADE = ("LastEnemy", "Decapitation", "Critical", "Dismemberment", "BasicKill")
+DAMAGE_TYPES = ("Pierce", "Slash", "Blunt", "Elemental")
+
+# Event mix defaults, tuned to look like a wave-based arena session.
+DEFAULT_KILLS_PER_MIN = 6.0
+DEFAULT_PARRIES_PER_MIN = 3.0
+DEFAULT_LAST_STANDS_PER_MIN = 0.05
+DEFAULT_KILL_MIX = {"last_enemy": 0.15, "head": 0.3, "sliced": 0.25, "status": 0.05, "thrown": 0.1}
+DEFAULT_DAMAGE_MIX = (0.35, 0.4, 0.2, 0.05)
+DEFAULT_FRAME_SECONDS = 1.0 / 72.0
+# Chance rolls drawn per event: one per cascade stage that can run (Dismemberment
+# reuses Decapitation's slot, they never both run for one kill).
+ROLL_STAGES = 4
+
+
+class SimConfig:
+    """Runtime settings that are not preset axes (CSMModOptions multipliers, event mix)."""
+
+    def __init__(self, **kwargs):
+        self.minutes = kwargs.get("minutes", 30.0)
+        self.kills_per_min = kwargs.get("kills_per_min", DEFAULT_KILLS_PER_MIN)
+        self.parries_per_min = kwargs.get("parries_per_min", DEFAULT_PARRIES_PER_MIN)
+        self.last_stands_per_min = kwargs.get("last_stands_per_min", DEFAULT_LAST_STANDS_PER_MIN)
+        self.kill_mix = dict(DEFAULT_KILL_MIX, **kwargs.get("kill_mix", {}))
+        self.damage_mix = np.asarray(kwargs.get("damage_mix", DEFAULT_DAMAGE_MIX), dtype=np.float64)
+        self.damage_mult = np.asarray(kwargs.get("damage_mult", (1.0, 1.0, 1.0, 1.0)), dtype=np.float64)
+        self.dot_mult = kwargs.get("dot_mult", 1.0)  # GetDOTMultiplier() is 1.0 when DOT is not installed
+        self.thrown_mult = kwargs.get("thrown_mult", 1.0)
+        self.intensity_max = kwargs.get("intensity_max", 1.0)  # 1.0 = IntensityScalingEnabled off
+        self.frame_seconds = kwargs.get("frame_seconds", DEFAULT_FRAME_SECONDS)
+
+
+def preset_arrays(model: PresetModel, combos):
+    """Per-combination `(C, T)` arrays for chance/timeScale/duration/cooldown/easing/enabled."""
+    tensor = model.tensor()
+    rows = {name: [] for name in ("chance", "timeScale", "duration", "cooldown", "easing", "enabled")}
+    for combo in combos:
+        key = (slice(None),) + tuple(model.index(axis, combo[axis]) for axis in AXES[1:])
+        for name in rows:
+            rows[name].append(tensor[name][key])
+    return {name: np.stack(values) for name, values in rows.items()}
+
+
+def make_events(rng, streams: int, cfg: SimConfig):
+    """Event times and attributes, shape `(streams, steps)`; padded events have time = inf."""
+    total_rate = (cfg.kills_per_min + cfg.parries_per_min + cfg.last_stands_per_min) / 60.0
+    horizon = cfg.minutes * 60.0
+    expected = total_rate * horizon
+    steps = max(1, int(expected + 6.0 * np.sqrt(expected) + 10))
+
+    gaps = rng.exponential(1.0 / total_rate, size=(streams, steps))
+    times = np.cumsum(gaps, axis=1)
+    times[times >= horizon] = np.inf
+
+    weights = np.array([cfg.kills_per_min, cfg.parries_per_min, cfg.last_stands_per_min])
+    kind = rng.choice(3, size=(streams, steps), p=weights / weights.sum())
+    mix = cfg.kill_mix
+    return {
+        "time": times,
+        "kind": kind,  # 0 kill, 1 parry, 2 last stand
+        "last_enemy": rng.random((streams, steps)) < mix["last_enemy"],
+        "head": rng.random((streams, steps)) < mix["head"],
+        "sliced": rng.random((streams, steps)) < mix["sliced"],
+        "status": rng.random((streams, steps)) < mix["status"],
+        "thrown": rng.random((streams, steps)) < mix["thrown"],
+        "damage": rng.choice(len(DAMAGE_TYPES), size=(streams, steps), p=cfg.damage_mix / cfg.damage_mix.sum()),
+        "intensity": rng.random((streams, steps)),
+        "rolls": rng.random((streams, steps, ROLL_STAGES)),
+        "frame": rng.random((streams, steps)),
+    }
+
+
+def simulate(model: PresetModel, combos, streams: int, cfg: SimConfig, seed: int):
+    """Run `streams` sessions per combination; return one result dict per combination."""
+    results = simulate_tables(model, preset_arrays(model, combos), streams, cfg, seed)
+    for combo, result in zip(combos, results):
+        result["presets"] = dict(combo)
+    return results
+
+
+def simulate_tables(model: PresetModel, presets, streams: int, cfg: SimConfig, seed: int):
+    """Simulate explicit `(C, T)` preset arrays (see `preset_arrays`), one result per row.
+
+    Every row replays the same `streams` sessions (events, chance rolls and frame
+    delays all come from `seed`), so rows differ only by their settings.
+    """
+    rng = np.random.default_rng(seed)
+    n_combos = len(presets["chance"])
+    n_triggers = len(model.triggers)
+    total = n_combos * streams
+    combo_of = np.repeat(np.arange(n_combos), streams)
+    horizon = cfg.minutes * 60.0
+
+    t_index = {name: idx for idx, name in enumerate(model.triggers)}
+    priority = np.array([model.trigger_values[name] for name in model.triggers])
+
+    # Per-stream manager state (CSMManager fields).
+    global_cd_end = np.zeros(total)
+    trigger_cd_end = np.zeros((total, n_triggers))
+    active_type = np.full(total, -1)
+    active_end = np.zeros(total)  # frame on which EndSlowMotion runs
+    easing_end = np.zeros(total)  # end of the ease-out transition
+    has_easing = np.zeros(total, dtype=bool)
+
+    active_seconds = np.zeros(total)
+    easing_seconds = np.zeros(total)
+    scale_seconds = np.zeros(total)  # sum of timeScale * active seconds
+    last_scale = np.ones(total)
+    attempts = np.zeros((total, n_triggers, len(REASONS)), dtype=np.int64)
+    events = {name: np.tile(value, (n_combos,) + (1,) * (value.ndim - 1))
+              for name, value in make_events(rng, streams, cfg).items()}
+    steps = events["time"].shape[1]
+    rows = np.arange(total)
+
+    def attempt(mask, trigger, step, stage=0):
+        """Run TriggerSlow(trigger) for every stream in `mask`; return the success mask."""
+        idx = rows[mask]
+        if idx.size == 0:
+            return np.zeros(total, dtype=bool)
+        t = t_index[trigger]
+        combo = combo_of[idx]
+        now = events["time"][idx, step]
+        is_kill = trigger in KILL_CASCADE
+        status = events["status"][idx, step] & is_kill
+        thrown = events["thrown"][idx, step] & is_kill
+        damage_mult = cfg.damage_mult[events["damage"][idx, step]] if is_kill else np.ones(idx.size)
+
+        reason = np.full(idx.size, SUCCESS)
+        pending = np.ones(idx.size, dtype=bool)
+
+        def block(condition, name):
+            hit = pending & condition
+            reason[hit] = REASONS.index(name)
+            pending[hit] = False
+
+        block(status & (cfg.dot_mult <= 0.0), "DOTKillDisabled")
+        block(thrown & (cfg.thrown_mult <= 0.0), "ThrownWeaponDisabled")
+        block(damage_mult <= 0.0, "DamageTypeDisabled")
+        block(~presets["enabled"][combo, t], "TriggerDisabled")
+        block(now < global_cd_end[idx], "GlobalCooldown")
+        block(now < trigger_cd_end[idx, t], "TriggerCooldown")
+        active = (active_type[idx] >= 0) & (now < active_end[idx])
+        block(active & (priority[t] <= priority[np.maximum(active_type[idx], 0)]), "AlreadyActive")
+        easing_out = has_easing[idx] & (now >= active_end[idx]) & (now < easing_end[idx])
+        block(easing_out, "EasingOut")
+        chance = presets["chance"][combo, t]
+        roll = events["rolls"][idx, step, stage]
+        block((chance < 1.0) & (roll > chance), "ChanceFailed")
+
+        np.add.at(attempts, (idx, t, reason), 1)
+
+        ok = idx[pending]
+        if ok.size:
+            now_ok = now[pending]
+            combo_ok = combo_of[ok]
+            duration = presets["duration"][combo_ok, t]
+            easing = presets["easing"][combo_ok, t]
+            cooldown = presets["cooldown"][combo_ok, t]
+
+            # A higher-priority trigger replaces an active one: drop the unplayed remainder.
+            overridden = (active_type[ok] >= 0) & (now_ok < active_end[ok])
+            remaining = np.where(overridden, active_end[ok] - now_ok, 0.0)
+            active_seconds[ok] -= remaining
+            scale_seconds[ok] -= remaining * np.where(overridden, last_scale[ok], 0.0)
+            easing_seconds[ok] -= np.where(overridden & has_easing[ok], easing_end[ok] - active_end[ok], 0.0)
+
+            multiplier = damage_mult[pending] * (1.0 + (cfg.intensity_max - 1.0) * events["intensity"][ok, step])
+            multiplier *= np.where(status[pending], cfg.dot_mult, 1.0) * np.where(thrown[pending], cfg.thrown_mult, 1.0)
+            scale = presets["timeScale"][combo_ok, t]
+            scale = np.where(multiplier != 1.0, np.clip(scale / multiplier, 0.01, 1.0), scale)
+            scale = np.clip(scale, 0.005, 1.0)
+
+            frame_delay = events["frame"][ok, step] * cfg.frame_seconds
+            active_type[ok] = t
+            active_end[ok] = now_ok + duration + frame_delay
+            has_easing[ok] = easing > 0.0
+            easing_end[ok] = active_end[ok] + easing
+            global_cd_end[ok] = now_ok + duration + easing
+            trigger_cd_end[ok, t] = now_ok + duration + easing + cooldown
+            last_scale[ok] = scale
+
+            active_seconds[ok] += active_end[ok] - now_ok
+            scale_seconds[ok] += (active_end[ok] - now_ok) * scale
+            easing_seconds[ok] += easing
+
+        success = np.zeros(total, dtype=bool)
+        success[ok] = True
+        return success
+
+    for step in range(steps):
+        valid = np.isfinite(events["time"][:, step])
+        if not valid.any():
+            break
+        kind = events["kind"][:, step]
+
+        kills = valid & (kind == 0)
+        done = np.zeros(total, dtype=bool)
+        head = events["head"][:, step]
+        sliced = events["sliced"][:, step]
+        done |= attempt(kills & events["last_enemy"][:, step], "LastEnemy", step)
+        done |= attempt(kills & ~done & head & sliced, "Decapitation", step, 1)
+        done |= attempt(kills & ~done & head, "Critical", step, 2)
+        # IsNewSlice already consumed the part for a head/neck slice, so the handler returns here.
+        done |= kills & head & sliced
+        done |= attempt(kills & ~done & sliced, "Dismemberment", step, 1)
+        attempt(kills & ~done, "BasicKill", step, 3)
+
+        attempt(valid & (kind == 1), "Parry", step)
+        attempt(valid & (kind == 2), "LastStand", step)
+
+    # Clip the final slow-mo / ease-out that runs past the end of the session.
+    overrun = np.maximum(active_end - horizon, 0.0) * (active_type >= 0)
+    active_seconds -= overrun
+    scale_seconds -= overrun * last_scale
+    ease_start = np.maximum(active_end, horizon)
+    easing_seconds -= np.where(has_easing, np.clip(easing_end - ease_start, 0.0, None), 0.0)
+
+    results = []
+    for c in range(n_combos):
+        sel = combo_of == c
+        counts = attempts[sel].sum(axis=0)  # (T, reasons)
+        total_attempts = int(counts.sum())
+        successes = int(counts[:, SUCCESS].sum())
+        minutes = cfg.minutes * int(sel.sum())
+        active = float(active_seconds[sel].sum())
+        by_reason = counts.sum(axis=0)
+        results.append(
+            {
+                "streams": int(sel.sum()),
+                "minutes": minutes,
+                "attempts": total_attempts,
+                "successes": successes,
+                "triggersPerMinute": successes / minutes if minutes else 0.0,
+                "attemptsPerMinute": total_attempts / minutes if minutes else 0.0,
+                "dutyCycle": active / (minutes * 60.0) if minutes else 0.0,
+                "easingDutyCycle": float(easing_seconds[sel].sum()) / (minutes * 60.0) if minutes else 0.0,
+                "meanTimeScale": float(scale_seconds[sel].sum()) / active if active else 1.0,
+                "reasons": {
+                    REASONS[r]: int(by_reason[r]) for r in range(len(REASONS)) if by_reason[r]
+                },
+                "byTrigger": {
+                    trigger: {
+                        "attempts": int(counts[t].sum()),
+                        "successes": int(counts[t, SUCCESS]),
+                    }
+                    for t, trigger in enumerate(model.triggers)
+                    if counts[t].sum()
+                },
+            }
+        )
+    return results
+
+
+def expand_combos(model: PresetModel, selections):
+    """Cartesian product of the chosen labels per axis (`all` expands to every label)."""
+    axes = AXES[1:]
+    choices = []
+    for axis in axes:
+        wanted = selections.get(axis) or model.defaults[axis]
+        labels = model.axes[axis] if wanted == "all" else [label.strip() for label in wanted.split(",")]
+        unknown = [label for label in labels if label not in model.axes[axis]]
+        if unknown:
+            raise ValueError(f"unknown {axis} preset(s): {', '.join(unknown)} (known: {', '.join(model.axes[axis])})")
+        choices.append(labels)
+    return [dict(zip(axes, values)) for values in itertools.product(*choices)]
+
+
+def format_combo(combo, model: PresetModel) -> str:
+    changed = [f"{axis}={label}" for axis, label in combo.items() if label != model.defaults[axis]]
+    return " ".join(changed) or "defaults"
+
+
+def print_results(results, model: PresetModel):
+    print("=== TriggerSlow Monte Carlo ===")
+    for result in results:
+        attempts = result["attempts"] or 1
+        print(f"\n[{format_combo(result['presets'], model)}] streams={result['streams']} minutes={result['minutes']:.0f}")
+        print(
+            f"  triggers/min={result['triggersPerMinute']:.2f} attempts/min={result['attemptsPerMinute']:.2f} "
+            f"slowmo={result['dutyCycle'] * 100:.1f}% easing={result['easingDutyCycle'] * 100:.1f}% "
+            f"meanTimeScale={result['meanTimeScale']:.3f}"
+        )
+        reasons = sorted(result["reasons"].items(), key=lambda item: item[1], reverse=True)
+        print("  results: " + " ".join(f"{name}={count * 100.0 / attempts:.1f}%" for name, count in reasons))
+        per_trigger = " ".join(
+            f"{name}={stats['successes']}/{stats['attempts']}" for name, stats in result["byTrigger"].items()
+        )
+        print(f"  by trigger (ok/try): {per_trigger}")
+
+
+def parse_mult_list(text: str):
+    values = [float(value) for value in text.split(",")]
+    if len(values) != len(DAMAGE_TYPES):
+        raise argparse.ArgumentTypeError(f"expected {len(DAMAGE_TYPES)} values ({','.join(DAMAGE_TYPES)})")
+    return values
+
+
+def add_multiplier_arguments(parser: argparse.ArgumentParser):
+    """CSMModOptions multiplier options (damage type, DOT, thrown, intensity scaling)."""
+    parser.add_argument("--damage-mult", type=parse_mult_list, default=(1.0, 1.0, 1.0, 1.0),
+                        help="Pierce,Slash,Blunt,Elemental multipliers (0 disables that type)")
+    parser.add_argument("--dot-mult", type=float, default=1.0, help="DOT multiplier (1.0 when DOT is not installed)")
+    parser.add_argument("--thrown-mult", type=float, default=1.0, help="Thrown weapon multiplier")
+    parser.add_argument("--intensity-max", type=float, default=1.0,
+                        help="IntensityScalingMax (1.0 = intensity scaling off)")
+
+
+def add_sim_arguments(parser: argparse.ArgumentParser):
+    """Event-mix and multiplier options shared by the simulator front ends."""
+    parser.add_argument("--streams", type=int, default=2000, help="Sessions simulated per preset combination")
+    parser.add_argument("--minutes", type=float, default=30.0, help="Length of each session in minutes")
+    parser.add_argument("--seed", type=int, default=1968, help="Random seed")
+    parser.add_argument("--kills-per-min", type=float, default=DEFAULT_KILLS_PER_MIN)
+    parser.add_argument("--parries-per-min", type=float, default=DEFAULT_PARRIES_PER_MIN)
+    parser.add_argument("--last-stands-per-min", type=float, default=DEFAULT_LAST_STANDS_PER_MIN)
+    add_multiplier_arguments(parser)
+    parser.add_argument("--fps", type=float, default=72.0, help="Frame rate used for EndSlowMotion latency")
+
+
+def sim_config_from_args(args) -> SimConfig:
+    return SimConfig(
+        minutes=args.minutes,
+        kills_per_min=args.kills_per_min,
+        parries_per_min=args.parries_per_min,
+        last_stands_per_min=args.last_stands_per_min,
+        damage_mult=args.damage_mult,
+        dot_mult=args.dot_mult,
+        thrown_mult=args.thrown_mult,
+        intensity_max=args.intensity_max,
+        frame_seconds=1.0 / args.fps if args.fps > 0 else 0.0,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate TriggerSlow gating for preset combinations")
+    for axis in AXES[1:]:
+        parser.add_argument(f"--{axis}", help=f"{axis.capitalize()} preset(s), comma-separated or 'all'")
+    add_sim_arguments(parser)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    try:
+        model = PresetModel.from_sources()
+        combos = expand_combos(model, {axis: getattr(args, axis) for axis in AXES[1:]})
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    results = simulate(model, combos, max(1, args.streams), sim_config_from_args(args), args.seed)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results, model)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
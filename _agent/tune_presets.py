@@ -0,0 +1,366 @@
+#!/usr/bin/env python3
+"""Search per-trigger custom values for a target slow-motion budget.
+
+At runtime GetTriggerConfig always reads the per-trigger custom fields (presets only
+write into them), so the search space is those fields: every candidate picks one value
+per (trigger, field) from the provider the in-game menu offers (CustomChanceProvider,
+CustomCooldownProvider, CustomDurationProvider, CustomTimeScaleProvider). The starting
+point is the ModOption defaults in CSMModOptions.cs.
+
+Candidates are scored with trigger_sim's Monte Carlo model. Every candidate sees the
+same sessions (common random numbers), so a better score is a better configuration,
+not a luckier draw. The score is
+
+    |duty - target| / target + penalty * sum(max(0, failed share - max block))
+
+where the sum runs over the --protect triggers and "failed share" is the fraction of
+their TriggerSlow calls that did not start a slow-mo. Batches are split across a
+process pool and every evaluated configuration is memoised.
+
+Methods: `coord` (coordinate descent over --grid-points values per field), `random`
+(uniform samples) and `grid` (full product, refused above --max-evals).
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from cs_source import CSM_OPTIONS, evaluate_float_provider, extract_method_block, parse_modoptions, read_source
+from preset_model import PresetModel
+from trigger_sim import SimConfig, add_sim_arguments, sim_config_from_args, simulate_tables
+
+# TriggerCustomValues member -> (CLI name, provider feeding its ModOption).
+FIELDS = {
+    "Chance": ("chance", "CustomChanceProvider"),
+    "Cooldown": ("cooldown", "CustomCooldownProvider"),
+    "Duration": ("duration", "CustomDurationProvider"),
+    "TimeScale": ("timescale", "CustomTimeScaleProvider"),
+}
+DEFAULT_FIELDS = "chance,cooldown"
+DEFAULT_TARGET = 0.15
+DEFAULT_PROTECT = "Critical,Decapitation"
+DEFAULT_MAX_BLOCK = 0.25
+DEFAULT_PENALTY = 2.0
+DEFAULT_STREAMS = 300
+
+
+def parse_custom_fields(options_text: str):
+    """Map trigger -> {member: field name or literal} from GetCustomValues."""
+    block = extract_method_block(options_text, r"public\s+static\s+TriggerCustomValues\s+GetCustomValues\s*\(")
+    mapping = {}
+    for case in re.finditer(r"case\s+TriggerType\.(\w+)\s*:(.*?)break;", block, re.S):
+        mapping[case.group(1)] = dict(re.findall(r"values\.(\w+)\s*=\s*([\w.]+);", case.group(2)))
+    return mapping
+
+
+def modoption_attribute(options_text: str, field: str) -> str:
+    """The `[ModOption(...)]` line declaring `field`."""
+    match = re.search(rf"(\[ModOption\(.*\)\])[ \t]*\r?\n\s*public\s+static\s+float\s+{re.escape(field)}\s*=", options_text)
+    if not match:
+        raise ValueError(f"No [ModOption] attribute found for {field}")
+    return match.group(1)
+
+
+def with_default_index(attribute: str, idx: int) -> str:
+    """`attribute` with its `defaultValueIndex` set to `idx`."""
+    if re.search(r"\bdefaultValueIndex\s*=", attribute):
+        return re.sub(r"\bdefaultValueIndex\s*=\s*\d+", f"defaultValueIndex = {idx}", attribute)
+    return attribute[:-2] + f", defaultValueIndex = {idx})]"
+
+
+class SearchSpace:
+    """Tunable (trigger, member) dimensions with their provider values and defaults."""
+
+    def __init__(self, model: PresetModel, options_text: str, fields, triggers):
+        self.model = model
+        options = {opt["fieldName"]: opt for opt in parse_modoptions(options_text)}
+        custom = parse_custom_fields(options_text)
+        providers = {provider: evaluate_float_provider(options_text, provider) for _, provider in FIELDS.values()}
+
+        self.base = {}  # trigger -> {member: value}
+        self.easing = {}
+        self.dims = []  # (trigger, member, field name, values)
+        self.attributes = {}  # field name -> its [ModOption(...)] line
+        self.start = []
+        for trigger in model.triggers:
+            members = custom.get(trigger, {})
+            values = {}
+            for member, (cli_name, provider) in FIELDS.items():
+                source = members.get(member, "")
+                if source in options:
+                    values[member] = float(options[source]["fieldValue"].rstrip("f"))
+                    if cli_name in fields and trigger in triggers:
+                        choices = providers[provider]
+                        self.dims.append((trigger, member, source, choices))
+                        self.attributes[source] = modoption_attribute(options_text, source)
+                        self.start.append(int(np.argmin(np.abs(np.asarray(choices) - values[member]))))
+                else:
+                    values[member] = float(source.rstrip("f")) if source else 1.0
+            self.base[trigger] = values
+            easing = members.get("Easing", "")
+            self.easing[trigger] = strip_default(options[easing]["fieldValue"]) if easing in options else "Off"
+        self.start = tuple(self.start)
+
+    def values(self, candidate):
+        """Per-trigger member values for a candidate (tuple of value indices)."""
+        result = {trigger: dict(values) for trigger, values in self.base.items()}
+        for (trigger, member, _, choices), idx in zip(self.dims, candidate):
+            result[trigger][member] = choices[idx]
+        return result
+
+    def arrays(self, candidates, profile: str):
+        """`(C, T)` arrays in the layout `trigger_sim.simulate_tables` expects."""
+        model = self.model
+        enabled = model.enabled_tp[:, model.index("profile", profile)]
+        rows = {name: [] for name in ("chance", "timeScale", "duration", "cooldown", "easing", "enabled")}
+        for candidate in candidates:
+            values = self.values(candidate)
+            row = [values[trigger] for trigger in model.triggers]
+            ramp = [0.0 if self.easing[trigger] == "Off" else model.ramp_percent for trigger in model.triggers]
+            clipped = {member: np.clip([v[member] for v in row], *model.value_ranges[member])
+                       for member in ("Chance", "TimeScale", "Duration", "Cooldown")}
+            rows["chance"].append(clipped["Chance"])
+            rows["timeScale"].append(clipped["TimeScale"])
+            rows["duration"].append(clipped["Duration"])
+            rows["cooldown"].append(clipped["Cooldown"])
+            rows["easing"].append(clipped["Duration"] * np.asarray(ramp))
+            rows["enabled"].append(enabled)
+        return {name: np.stack(value) for name, value in rows.items()}
+
+    def grid_indices(self, dim: int, points: int):
+        """Evenly spaced value indices for one dimension, always including the start value."""
+        count = len(self.dims[dim][3])
+        picked = set(np.linspace(0, count - 1, min(points, count)).round().astype(int).tolist())
+        picked.add(self.start[dim])
+        return sorted(picked)
+
+
+def strip_default(value: str) -> str:
+    value = value.strip()
+    return value[1:-1] if value.startswith('"') and value.endswith('"') else value
+
+
+# Worker state, set once per process by `init_worker`.
+_MODEL = None
+_CFG = None
+
+
+def init_worker(model: PresetModel, cfg: SimConfig):
+    global _MODEL, _CFG
+    _MODEL = model
+    _CFG = cfg
+
+
+def evaluate_batch(job):
+    arrays, streams, seed = job
+    return simulate_tables(_MODEL, arrays, streams, _CFG, seed)
+
+
+class Evaluator:
+    """Scores candidates through a process pool, memoising every configuration."""
+
+    def __init__(self, space: SearchSpace, args, cfg: SimConfig):
+        self.space = space
+        self.args = args
+        self.cfg = cfg
+        self.protect = [name.strip() for name in args.protect.split(",") if name.strip()]
+        self.memo = {}
+        self.pool = None
+        if args.jobs > 1:
+            self.pool = ProcessPoolExecutor(max_workers=args.jobs, initializer=init_worker, initargs=(space.model, cfg))
+        else:
+            init_worker(space.model, cfg)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def score(self, result) -> float:
+        args = self.args
+        error = abs(result["dutyCycle"] - args.target) / args.target
+        penalty = 0.0
+        for trigger in self.protect:
+            stats = result["byTrigger"].get(trigger)
+            if stats and stats["attempts"]:
+                failed = 1.0 - stats["successes"] / stats["attempts"]
+                penalty += max(0.0, failed - args.max_block)
+        return error + args.penalty * penalty
+
+    def evaluate(self, candidates):
+        """Return `(score, result)` for each candidate, simulating only the unseen ones."""
+        missing = list(dict.fromkeys(c for c in candidates if c not in self.memo))
+        if missing:
+            jobs = max(1, self.args.jobs)
+            size = max(1, -(-len(missing) // jobs))
+            batches = [missing[i : i + size] for i in range(0, len(missing), size)]
+            work = [
+                (self.space.arrays(batch, self.args.profile), self.args.streams, self.args.seed) for batch in batches
+            ]
+            outputs = self.pool.map(evaluate_batch, work) if self.pool else map(evaluate_batch, work)
+            for batch, results in zip(batches, outputs):
+                for candidate, result in zip(batch, results):
+                    self.memo[candidate] = (self.score(result), result)
+        return [self.memo[c] for c in candidates]
+
+
+def search_coord(space: SearchSpace, evaluator: Evaluator, args):
+    best = space.start
+    best_score = evaluator.evaluate([best])[0][0]
+    for _ in range(args.rounds):
+        improved = False
+        for dim in range(len(space.dims)):
+            if len(evaluator.memo) >= args.max_evals:
+                return best
+            candidates = []
+            for idx in space.grid_indices(dim, args.grid_points):
+                candidate = list(best)
+                candidate[dim] = idx
+                candidates.append(tuple(candidate))
+            for candidate, (score, _) in zip(candidates, evaluator.evaluate(candidates)):
+                if score < best_score - 1e-12:
+                    best, best_score, improved = candidate, score, True
+        if not improved:
+            break
+    return best
+
+
+def search_random(space: SearchSpace, evaluator: Evaluator, args):
+    rng = np.random.default_rng(args.seed + 1)
+    candidates = [space.start]
+    while len(candidates) < args.max_evals:
+        candidates.append(tuple(int(rng.integers(len(choices))) for _, _, _, choices in space.dims))
+    scored = evaluator.evaluate(candidates)
+    return min(zip(candidates, scored), key=lambda item: item[1][0])[0]
+
+
+def search_grid(space: SearchSpace, evaluator: Evaluator, args):
+    axes = [space.grid_indices(dim, args.grid_points) for dim in range(len(space.dims))]
+    size = int(np.prod([len(axis) for axis in axes])) if axes else 1
+    if size > args.max_evals:
+        raise ValueError(f"grid has {size} configurations (> --max-evals {args.max_evals}); use coord or random")
+    candidates = [tuple(c) for c in itertools.product(*axes)]
+    scored = evaluator.evaluate(candidates)
+    return min(zip(candidates, scored), key=lambda item: item[1][0])[0]
+
+
+SEARCHES = {"coord": search_coord, "random": search_random, "grid": search_grid}
+
+
+def format_float(value: float) -> str:
+    return f"{value:g}f"
+
+
+def preset_block(space: SearchSpace, candidate) -> str:
+    """C# `[ModOption]` attributes (defaultValueIndex = provider index) and initialisers for the tuned fields."""
+    lines = []
+    current = None
+    for (trigger, member, field, choices), idx in zip(space.dims, candidate):
+        if trigger != current:
+            if current is not None:
+                lines.append("")
+            lines.append(f"        // {trigger}")
+            current = trigger
+        lines.append(f"        {with_default_index(space.attributes[field], idx)}")
+        lines.append(f"        public static float {field} = {format_float(choices[idx])};")
+    return "\n".join(lines)
+
+
+def summarize(label: str, score: float, result) -> str:
+    per_trigger = " ".join(
+        f"{name}={stats['successes']}/{stats['attempts']}" for name, stats in result["byTrigger"].items()
+    )
+    return (
+        f"{label}: score={score:.4f} slowmo={result['dutyCycle'] * 100:.1f}% "
+        f"triggers/min={result['triggersPerMinute']:.2f}\n  by trigger (ok/try): {per_trigger}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search per-trigger custom values for a slow-motion duty cycle")
+    parser.add_argument("--method", choices=sorted(SEARCHES), default="coord", help="Search strategy")
+    parser.add_argument("--fields", default=DEFAULT_FIELDS,
+                        help=f"Fields to tune: {', '.join(name for name, _ in FIELDS.values())} (default {DEFAULT_FIELDS})")
+    parser.add_argument("--triggers", help="Triggers to tune (default: all)")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET, help="Target slow-mo duty cycle (0..1)")
+    parser.add_argument("--protect", default=DEFAULT_PROTECT, help="Triggers that should rarely be blocked")
+    parser.add_argument("--max-block", type=float, default=DEFAULT_MAX_BLOCK,
+                        help="Allowed failed share for protected triggers before the penalty applies")
+    parser.add_argument("--penalty", type=float, default=DEFAULT_PENALTY, help="Weight of the protection penalty")
+    parser.add_argument("--profile", default="All", help="TriggerProfilePreset deciding which triggers are enabled")
+    parser.add_argument("--grid-points", type=int, default=9, help="Values tried per field by coord and grid")
+    parser.add_argument("--rounds", type=int, default=4, help="Coordinate descent rounds")
+    parser.add_argument("--max-evals", type=int, default=2000, help="Upper bound on evaluated configurations")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON")
+    add_sim_arguments(parser)
+    parser.set_defaults(streams=DEFAULT_STREAMS)
+    args = parser.parse_args()
+
+    if args.target <= 0.0:
+        print("error: --target must be > 0", file=sys.stderr)
+        return 2
+    try:
+        model = PresetModel.from_sources()
+        options_text = read_source(CSM_OPTIONS)
+        known = {cli for cli, _ in FIELDS.values()}
+        fields = {name.strip().lower() for name in args.fields.split(",") if name.strip()}
+        if fields - known:
+            raise ValueError(f"unknown field(s): {', '.join(sorted(fields - known))}")
+        triggers = set(model.triggers)
+        if args.triggers:
+            triggers = {name.strip() for name in args.triggers.split(",") if name.strip()}
+            if triggers - set(model.triggers):
+                raise ValueError(f"unknown trigger(s): {', '.join(sorted(triggers - set(model.triggers)))}")
+        model.index("profile", args.profile)
+        space = SearchSpace(model, options_text, fields, triggers)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if not space.dims:
+        print("error: nothing to tune for the selected fields/triggers", file=sys.stderr)
+        return 2
+
+    evaluator = Evaluator(space, args, sim_config_from_args(args))
+    try:
+        best = SEARCHES[args.method](space, evaluator, args)
+        (start_score, start_result), (best_score, best_result) = evaluator.evaluate([space.start, best])
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        evaluator.close()
+
+    if args.json:
+        tuned = {f"{trigger}.{member}": space.values(best)[trigger][member] for trigger, member, _, _ in space.dims}
+        print(
+            json.dumps(
+                {
+                    "method": args.method,
+                    "evaluated": len(evaluator.memo),
+                    "start": {"score": start_score, "result": start_result},
+                    "best": {"score": best_score, "result": best_result, "values": tuned},
+                    "block": preset_block(space, best),
+                },
+                indent=2,
+            )
+        )
+        return 0
+
+    print(f"=== Preset tuning ({args.method}, {len(evaluator.memo)} configurations, target {args.target * 100:.0f}%) ===")
+    print(summarize("Start", start_score, start_result))
+    print(summarize("Best ", best_score, best_result))
+    print()
+    print(preset_block(space, best))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
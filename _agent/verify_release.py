@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Verify the release zips against builds/ and write the checksum manifest published with them.
+
+Checks, all streamed in fixed-size chunks (no whole-file reads, nothing extracted):
+
+    version    root manifest.json, builds/CSM-<variant>/CSM/manifest.json and the
+               manifest.json inside each zip agree on ModVersion
+    contents   every zip entry CSM/<path> matches builds/CSM-<variant>/CSM/<path> by
+               size and CRC-32 (the CRC stored in the zip's central directory against
+               one computed from the file on disk); files missing on either side fail
+    checksums  SHA-256 and size of each zip and of every file inside it
+
+The checksum manifest (CSM-<version>-checksums.json by default) is written next to the
+zips, even when a check fails, so the failure can be inspected; exit status is 1 then.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+import zipfile
+import zlib
+from pathlib import Path
+
+from _release import BASE, VARIANTS as ZIP_NAMES
+from build_cache import VARIANTS
+
+CHUNK_SIZE = 1 << 20
+
+
+def stream_digest(handle):
+    """(sha256 hex, crc32, size) of a binary stream, read CHUNK_SIZE bytes at a time."""
+    sha = hashlib.sha256()
+    crc = 0
+    size = 0
+    for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+        sha.update(chunk)
+        crc = zlib.crc32(chunk, crc)
+        size += len(chunk)
+    return sha.hexdigest(), crc, size
+
+
+def file_digest(path: Path):
+    with open(path, "rb") as handle:
+        return stream_digest(handle)
+
+
+def read_version(handle) -> str | None:
+    try:
+        return json.loads(handle.read().decode("utf-8-sig"))["ModVersion"]
+    except (ValueError, KeyError):
+        return None
+
+
+def verify_variant(root: Path, variant: str, zip_path: Path, problems: list[str], versions: dict):
+    builds = root / VARIANTS[variant]["builds"]
+    prefix = builds.name + "/"
+    on_disk = {path.relative_to(builds).as_posix(): path for path in sorted(builds.rglob("*")) if path.is_file()}
+
+    manifest = builds / "manifest.json"
+    if manifest.exists():
+        with open(manifest, "rb") as handle:
+            versions[f"{VARIANTS[variant]['builds']}/manifest.json"] = read_version(handle)
+    else:
+        problems.append(f"{variant}: {manifest.relative_to(root)} is missing")
+
+    sha, _, size = file_digest(zip_path)
+    record = {"name": zip_path.name, "variant": variant, "size": size, "sha256": sha, "entries": []}
+    with zipfile.ZipFile(zip_path) as archive:
+        seen = set()
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            with archive.open(info) as handle:
+                entry_sha, entry_crc, entry_size = stream_digest(handle)
+            record["entries"].append({
+                "name": info.filename, "size": entry_size, "crc32": f"{info.CRC:08x}", "sha256": entry_sha,
+            })
+            if info.filename.endswith("manifest.json"):
+                with archive.open(info) as handle:
+                    versions[f"{zip_path.name}:{info.filename}"] = read_version(handle)
+
+            rel = info.filename[len(prefix):] if info.filename.startswith(prefix) else None
+            disk = on_disk.get(rel) if rel is not None else None
+            if disk is None:
+                problems.append(f"{zip_path.name}: {info.filename} has no counterpart in {VARIANTS[variant]['builds']}")
+                continue
+            seen.add(rel)
+            _, disk_crc, disk_size = file_digest(disk)
+            if disk_size != info.file_size or disk_crc != info.CRC:
+                problems.append(
+                    f"{zip_path.name}: {info.filename} differs from {VARIANTS[variant]['builds']}/{rel} "
+                    f"(zip crc {info.CRC:08x} size {info.file_size}, disk crc {disk_crc:08x} size {disk_size})"
+                )
+        for rel in on_disk:
+            if rel not in seen:
+                problems.append(f"{zip_path.name}: missing {prefix}{rel} from {VARIANTS[variant]['builds']}")
+    return record
+
+
+def verify(root: Path, zip_dir: Path):
+    """(checksum manifest, problems) for every variant zip in `zip_dir`."""
+    problems: list[str] = []
+    versions: dict[str, str | None] = {}
+    with open(root / "manifest.json", "rb") as handle:
+        versions["manifest.json"] = read_version(handle)
+
+    artifacts = []
+    for variant, zip_name in ZIP_NAMES.items():
+        zip_path = zip_dir / zip_name
+        if not zip_path.exists():
+            problems.append(f"{variant}: {zip_path} is missing")
+            continue
+        try:
+            artifacts.append(verify_variant(root, variant, zip_path, problems, versions))
+        except zipfile.BadZipFile as exc:
+            problems.append(f"{zip_path.name}: {exc}")
+
+    expected = versions["manifest.json"]
+    for source, version in versions.items():
+        if version != expected:
+            problems.append(f"ModVersion mismatch: {source} has {version}, manifest.json has {expected}")
+
+    manifest = {
+        "modVersion": expected,
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "algorithm": "sha256",
+        "versions": versions,
+        "artifacts": artifacts,
+        "verified": not problems,
+        "problems": problems,
+    }
+    return manifest, problems
+
+
+def checksum_path(zip_dir: Path, version: str | None) -> Path:
+    return zip_dir / f"CSM-{version or 'unknown'}-checksums.json"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify release zips against builds/ and write checksums")
+    parser.add_argument("--root", type=Path, default=BASE, help="Repository root")
+    parser.add_argument("--zip-dir", type=Path, help="Where the release zips are (default: repository root)")
+    parser.add_argument("--output", type=Path, help="Checksum manifest path (default CSM-<version>-checksums.json)")
+    parser.add_argument("--json", action="store_true", help="Print the checksum manifest")
+    args = parser.parse_args()
+
+    root = args.root.resolve()
+    zip_dir = (args.zip_dir or root).resolve()
+    try:
+        manifest, problems = verify(root, zip_dir)
+    except OSError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    output = args.output or checksum_path(zip_dir, manifest["modVersion"])
+    output.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+    if args.json:
+        print(json.dumps(manifest, indent=2))
+    else:
+        for artifact in manifest["artifacts"]:
+            print(f"{artifact['sha256']}  {artifact['name']} ({len(artifact['entries'])} entries, {artifact['size']} bytes)")
+        for problem in problems:
+            print(f"FAIL {problem}", file=sys.stderr)
+        print(f"{'OK' if not problems else 'FAILED'}: ModVersion {manifest['modVersion']}; wrote {output.name}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())